@@ -1,65 +1,180 @@
 import hashlib
-import json
 from datetime import datetime, UTC
 
+from UniChain.blockchain.block_header import BlockHeader
+from UniChain.blockchain.encoding import encode_block, encode_block_header, has_standalone_header
+from UniChain.blockchain.transaction import Transaction
+from UniChain.structures.merkle_tree import MerkleTree
+
+
+def build_tx_tree(transactions, signed=True) -> MerkleTree:
+    """
+    Merkle Tree delle transazioni di un blocco, con foglie identificate da `transaction_hash`.
+
+    :param signed: True (blocchi correnti) per impegnare la codifica completa di ogni
+                   transazione, firma inclusa; False per lo schema dei blocchi di
+                   versione 1, con il solo `transaction_hash` (le firme sono comunque
+                   impegnate dall'hash del blocco completo)
+    """
+    if signed:
+        return MerkleTree([(tx.transaction_hash, tx.calculate_signed_hash()) for tx in transactions])
+    return MerkleTree([(tx.transaction_hash, tx.transaction_hash) for tx in transactions])
+
 
 class Block:
     def __init__(self,
                  previous_hash,
-                 transaction,
+                 transactions,
                  version,
                  block_number,
                  block_proposer,
                  signature,
                  hash_algorithm="SHA-256",
                  attributes_merkle_root=None,
-                 validator_info="Validator Info"):
+                 validator_info="Validator Info",
+                 timestamp=None,
+                 signature_suite=None,
+                 revocation_root=None):
         """
         Rappresenta un blocco della blockchain UniChain.
+        Un blocco contiene una lista di transazioni (o una singola transazione)
+        e ne impegna il contenuto tramite la Merkle Root `tx_root`.
+        Dopo la firma il blocco viene congelato con `freeze()`: da quel momento
+        è immutabile e il suo hash viene calcolato una sola volta.
+        `signature_suite` registra lo schema di firma del proponente
+        (None per i blocchi firmati con RSA prima della sua introduzione).
+        `revocation_root` è la root dello Sparse Merkle Tree delle revoche dopo
+        l'applicazione del blocco (None per i blocchi precedenti alla sua introduzione).
         """
+        object.__setattr__(self, "_frozen", False)
+        object.__setattr__(self, "_hash", None)
+
         self.version = version
         self.previous_hash = previous_hash
-        self.timestamp = datetime.now(UTC).isoformat()
+        self.timestamp = timestamp or datetime.now(UTC).isoformat()
+
+        if not isinstance(transactions, (list, tuple)):
+            transactions = [transactions]
+        if not transactions:
+            raise ValueError("Il blocco deve contenere almeno una transazione.")
+        for tx in transactions:
+            if not hasattr(tx, "transaction_type"):
+                raise ValueError("La transazione non ha un campo 'transaction_type' valido.")
+        tx_hashes = [tx.transaction_hash for tx in transactions]
+        if len(set(tx_hashes)) != len(tx_hashes):
+            raise ValueError("Il blocco contiene transazioni duplicate.")
 
-        self.transaction = transaction
-        if not hasattr(transaction, "transaction_type"):
-            raise ValueError("La transazione non ha un campo 'transaction_type' valido.")
-        self.transaction_type = transaction.transaction_type
+        self.transactions = list(transactions)
+        tx_types = {tx.transaction_type for tx in self.transactions}
+        self.transaction_type = tx_types.pop() if len(tx_types) == 1 else "MISTO"
 
+        self._tx_tree = build_tx_tree(self.transactions)
         self.tx_root = self.calculate_tx_root()
         self.hash_algorithm = hash_algorithm
         self.block_number = block_number
         self.validator_info = validator_info
         self.block_proposer = block_proposer
         self.attributes_merkle_root = attributes_merkle_root
+        self.revocation_root = revocation_root
         self.signature = signature
+        self.signature_suite = signature_suite
+
+    @property
+    def transaction(self):
+        """
+        Prima transazione del blocco (compatibilità con i blocchi a transazione singola).
+        """
+        return self.transactions[0]
 
     def calculate_tx_root(self):
         """
-        Calcola l'hash della transazione contenuta nel blocco.
+        Calcola la Merkle Root delle transazioni firmate contenute nel blocco.
+        Con una sola transazione coincide con lo SHA-256 del suo `calculate_signed_hash`.
+        """
+        return self._tx_tree.get_root()
+
+    def get_transaction_proof(self, transaction_hash):
+        """
+        Restituisce la Merkle proof di inclusione di una transazione rispetto a `tx_root`.
+
+        :param transaction_hash: hash della transazione
+        :return: lista di coppie (direzione, hash)
+        """
+        return self._tx_tree.get_proof(transaction_hash)
+
+    @staticmethod
+    def verify_transaction_proof(transaction, proof, tx_root) -> bool:
+        """
+        Verifica che la transazione, con la sua firma, sia inclusa nel blocco con la
+        `tx_root` indicata. Per i blocchi di versione 1 la foglia è il solo
+        `transaction_hash` (anche con lo schema Merkle storico): un `transaction_hash`
+        non coincide mai con la foglia di una transazione firmata, quindi una firma
+        alterata non supera la verifica rispetto a una `tx_root` corrente.
         """
-        return hashlib.sha256(self.transaction.transaction_hash.encode('utf-8')).hexdigest()
+        tx_hash = transaction.transaction_hash
+        return (MerkleTree.verify_proof(transaction.calculate_signed_hash(), proof, tx_root)
+                or MerkleTree.verify_proof(tx_hash, proof, tx_root)
+                or MerkleTree.verify_legacy_proof(tx_hash, proof, tx_root))
 
     def calculate_hash(self):
         """
-        Calcola l'hash del blocco intero a partire dai suoi attributi serializzati.
+        Calcola l'hash del blocco a partire dalla codifica binaria canonica: della sola
+        intestazione per i blocchi di versione 2 (le transazioni sono impegnate da
+        `tx_root`), del blocco intero per quelli di versione 1.
+        """
+        if has_standalone_header(self):
+            return hashlib.sha256(encode_block_header(self)).hexdigest()
+        return hashlib.sha256(encode_block(self)).hexdigest()
+
+    def has_valid_tx_root(self) -> bool:
+        """
+        Ricalcola `tx_root` dalle transazioni firmate dei blocchi di versione 2, il cui
+        hash copre solo l'intestazione. Nei blocchi di versione 1 le transazioni (firme
+        incluse) sono già impegnate dall'hash del blocco completo.
+        """
+        if not has_standalone_header(self):
+            return True
+        return build_tx_tree(self.transactions).get_root() == self.tx_root
+
+    def freeze(self):
+        """
+        Rende il blocco immutabile e memorizza il suo hash.
+        Va invocato dopo aver impostato la firma del proponente.
+        Le transazioni passano in una tupla, così che neanche la lista sia modificabile.
         """
-        block_string = json.dumps(self.to_dict(), sort_keys=True)
-        return hashlib.sha256(block_string.encode('utf-8')).hexdigest()
+        if not self._frozen:
+            object.__setattr__(self, "transactions", tuple(self.transactions))
+            object.__setattr__(self, "_hash", self.calculate_hash())
+            object.__setattr__(self, "_frozen", True)
+        return self
+
+    @property
+    def is_frozen(self):
+        return self._frozen
 
     @property
     def block_hash(self):
+        """
+        Hash del blocco: memorizzato se il blocco è congelato, ricalcolato altrimenti.
+        """
+        if self._frozen:
+            return self._hash
         return self.calculate_hash()
 
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f"Il blocco #{self.block_number} è congelato: impossibile modificare '{name}'.")
+        object.__setattr__(self, name, value)
+
     def to_dict(self):
         """
-        Serializza il blocco per export o hashing.
+        Serializza il blocco in un dizionario JSON-compatibile (vista di export).
         """
         return {
             "version": self.version,
             "previous_hash": self.previous_hash,
             "timestamp": self.timestamp,
-            "transaction": self.transaction.to_dict(),
+            "transactions": [tx.to_dict() for tx in self.transactions],
             "transaction_type": self.transaction_type,
             "tx_root": self.tx_root,
             "hash_algorithm": self.hash_algorithm,
@@ -67,29 +182,58 @@ class Block:
             "validator_info": self.validator_info,
             "block_proposer": self.block_proposer,
             "attributes_merkle_root": self.attributes_merkle_root,
+            "revocation_root": self.revocation_root,
             "signature": self.signature,
+            "signature_suite": self.signature_suite,
         }
 
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Ricostruisce (e congela) un blocco serializzato con `to_dict`.
+        """
+        block = cls(
+            previous_hash=data["previous_hash"],
+            transactions=[Transaction.from_dict(tx) for tx in data["transactions"]],
+            version=data["version"],
+            block_number=data["block_number"],
+            block_proposer=data["block_proposer"],
+            signature=data["signature"],
+            hash_algorithm=data["hash_algorithm"],
+            attributes_merkle_root=data["attributes_merkle_root"],
+            validator_info=data["validator_info"],
+            timestamp=data["timestamp"],
+            signature_suite=data.get("signature_suite"),
+            revocation_root=data.get("revocation_root")
+        )
+        if block.tx_root != data["tx_root"] and not has_standalone_header(block):
+            # Blocchi di versione 1: foglie con il solo transaction_hash, anche con lo
+            # schema Merkle storico (precedente al Merkle Tree a digest grezzi).
+            # Le intestazioni di versione 2 devono impegnare le transazioni firmate.
+            hashes = [(tx.transaction_hash, tx.transaction_hash) for tx in block.transactions]
+            for tree in (build_tx_tree(block.transactions, signed=False), MerkleTree(hashes, legacy=True)):
+                if tree.get_root() == data["tx_root"]:
+                    block._tx_tree = tree
+                    block.tx_root = data["tx_root"]
+                    break
+        if block.tx_root != data["tx_root"]:
+            raise ValueError(f"tx_root del blocco #{block.block_number} non coerente con le transazioni.")
+        return block.freeze()
+
     def get_payload_to_sign(self):
         """
         Restituisce il payload (in bytes) da firmare per generare la firma del blocco.
         La firma non deve includere se stessa.
         """
-        payload = {
-            "version": self.version,
-            "previous_hash": self.previous_hash,
-            "timestamp": self.timestamp,
-            "transaction": self.transaction.to_dict(),
-            "transaction_type": self.transaction_type,
-            "tx_root": self.tx_root,
-            "hash_algorithm": self.hash_algorithm,
-            "block_number": self.block_number,
-            "validator_info": self.validator_info,
-            "block_proposer": self.block_proposer,
-            "attributes_merkle_root": self.attributes_merkle_root
-        }
-        payload_string = json.dumps(payload, sort_keys=True)
-        return payload_string.encode("utf-8")
+        if has_standalone_header(self):
+            return encode_block_header(self, include_signature=False)
+        return encode_block(self, include_signature=False)
+
+    def get_header(self):
+        """
+        Intestazione del blocco per i light client (solo blocchi di versione 2).
+        """
+        return BlockHeader.from_block(self)
 
     def __repr__(self):
-        return f"Block({self.version}, {self.transaction}, {self.block_number}, {self.block_hash})"
+        return f"Block({self.version}, {len(self.transactions)} tx, {self.block_number}, {self.block_hash})"
@@ -0,0 +1,53 @@
+import hashlib
+
+from UniChain.blockchain.encoding import BLOCK_FIELDS_BY_VERSION, HEADER_VERSION, \
+    encode_block_header, decode_block_header
+
+HEADER_FIELDS = BLOCK_FIELDS_BY_VERSION[HEADER_VERSION] + ("signature", "signature_suite")
+
+
+class BlockHeader:
+    """
+    Intestazione di un blocco UniChain senza le transazioni: collegamento al blocco
+    precedente, numero, `tx_root`, root degli attributi, root del registro delle
+    revoche e firma del proponente. Occupa poche centinaia di byte ed è ciò che
+    un light client scarica e conserva.
+
+    Ha lo stesso hash del blocco da cui è estratta (solo blocchi di versione 2).
+    """
+
+    __slots__ = HEADER_FIELDS + ("_hash",)
+
+    def __init__(self, **fields):
+        for field in HEADER_FIELDS:
+            setattr(self, field, fields.get(field))
+        self._hash = hashlib.sha256(encode_block_header(self)).hexdigest()
+
+    @classmethod
+    def from_block(cls, block) -> "BlockHeader":
+        return cls(**{field: getattr(block, field) for field in HEADER_FIELDS})
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BlockHeader":
+        return cls(**decode_block_header(data))
+
+    def to_bytes(self) -> bytes:
+        return encode_block_header(self)
+
+    @property
+    def block_hash(self):
+        return self._hash
+
+    def get_payload_to_sign(self):
+        """
+        Payload firmato dal proponente (coincide con quello del blocco completo).
+        """
+        return encode_block_header(self, include_signature=False)
+
+    def to_dict(self):
+        data = {field: getattr(self, field) for field in HEADER_FIELDS}
+        data["block_hash"] = self._hash
+        return data
+
+    def __repr__(self):
+        return f"BlockHeader({self.block_number}, {self._hash})"
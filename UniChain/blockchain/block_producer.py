@@ -0,0 +1,155 @@
+import threading
+
+
+class BlockProducer:
+    """
+    Produttore di blocchi che svuota la mempool della blockchain.
+
+    Un blocco viene tagliato quando:
+    - la mempool contiene almeno `max_block_size` transazioni (trigger di dimensione), oppure
+    - la transazione pendente più vecchia attende da almeno `max_block_interval` secondi
+      (trigger di tempo).
+
+    Il numero di blocco è assegnato automaticamente e il proponente ruota
+    (round-robin) tra le università accreditate indicate.
+    """
+
+    def __init__(self, blockchain, proposers, max_block_size=500, max_block_interval=2.0,
+                 version="1.0", poll_interval=0.05):
+        """
+        :param blockchain: istanza di Blockchain con la mempool da svuotare
+        :param proposers: lista di oggetti University che possono proporre blocchi
+        :param max_block_size: numero massimo di transazioni per blocco
+        :param max_block_interval: attesa massima (secondi) prima di tagliare un blocco parziale
+        :param version: versione dei blocchi prodotti
+        :param poll_interval: intervallo di controllo del ciclo in background
+        """
+        if not proposers:
+            raise ValueError("[BlockProducer] Serve almeno un'università proponente.")
+        self.blockchain = blockchain
+        self.proposers = list(proposers)
+        self.max_block_size = max_block_size
+        self.max_block_interval = max_block_interval
+        self.version = version
+        self.poll_interval = poll_interval
+
+        self._next_proposer_index = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _next_proposer(self):
+        """
+        Restituisce il prossimo proponente accreditato in ordine round-robin.
+        """
+        for _ in range(len(self.proposers)):
+            proposer = self.proposers[self._next_proposer_index]
+            self._next_proposer_index = (self._next_proposer_index + 1) % len(self.proposers)
+            if not self.blockchain.mobility_ca.is_certificate_revoked(proposer.get_certificate()):
+                return proposer
+        raise Exception("[BlockProducer] Nessuna università proponente è ancora accreditata.")
+
+    def should_cut_block(self) -> bool:
+        """
+        Indica se uno dei trigger (dimensione o tempo) è scattato.
+        """
+        pending = len(self.blockchain.mempool)
+        if pending == 0:
+            return False
+        return pending >= self.max_block_size or self.blockchain.mempool.oldest_age() >= self.max_block_interval
+
+    def produce_block(self, force=False):
+        """
+        Taglia un blocco dalla mempool se un trigger è scattato (o se `force=True`).
+
+        :return: il blocco aggiunto alla catena, oppure None se non è stato prodotto
+        """
+        if not force and not self.should_cut_block():
+            return None
+
+        transactions = self.blockchain.mempool.pop_batch(self.max_block_size)
+
+        admissible = self._still_valid(transactions)
+        if not admissible:
+            return None
+
+        proposer = self._next_proposer()
+        try:
+            return self.blockchain.add_next_block(
+                transaction=admissible,
+                version=self.version,
+                block_proposer_obj=proposer
+            )
+        except Exception:
+            # Si reinseriscono solo le transazioni ancora valide: una transazione
+            # che fa fallire la validazione non deve bloccare i lotti successivi
+            self.blockchain.mempool.requeue(self._still_valid(admissible))
+            raise
+
+    def _still_valid(self, transactions):
+        """
+        Scarta le transazioni diventate non ammissibili o con firma non più valida
+        (es. emittente revocato dopo l'ingresso nella mempool), e le EMISSIONE che
+        riusano uno status_index già assegnato da una transazione precedente del lotto:
+        ammissibili singolarmente, farebbero rifiutare l'intero blocco.
+        """
+        valid = []
+        status_slots = set()
+        for tx in transactions:
+            slot = (tx.issuer_id, tx.status_index) if tx.status_index is not None else None
+            if not self.blockchain.is_transaction_admissible(tx):
+                print(f"[BlockProducer] Transazione {tx.transaction_type} per "
+                      f"{tx.credential_unique_id} non più ammissibile: scartata.")
+            elif tx.transaction_type == "EMISSIONE" and slot in status_slots:
+                print(f"[BlockProducer] EMISSIONE per {tx.credential_unique_id} con status_index "
+                      f"già assegnato nel lotto: scartata.")
+            elif not self.blockchain.is_transaction_signature_valid(tx):
+                print(f"[BlockProducer] Transazione {tx.transaction_type} per "
+                      f"{tx.credential_unique_id} con firma non valida: scartata.")
+            else:
+                valid.append(tx)
+                if tx.transaction_type == "EMISSIONE" and slot is not None:
+                    status_slots.add(slot)
+        return valid
+
+    def flush(self):
+        """
+        Produce blocchi finché la mempool non è vuota.
+        """
+        blocks = []
+        while len(self.blockchain.mempool) > 0:
+            # Ogni iterazione estrae transazioni dalla mempool, quindi il ciclo termina
+            block = self.produce_block(force=True)
+            if block is not None:
+                blocks.append(block)
+        return blocks
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.produce_block() is None:
+                    self._stop_event.wait(self.poll_interval)
+            except Exception as e:
+                print(f"[BlockProducer] Errore nella produzione del blocco: {e}")
+                self._stop_event.wait(self.poll_interval)
+
+    def start(self):
+        """
+        Avvia il ciclo di produzione dei blocchi in un thread in background.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="BlockProducer", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush=True):
+        """
+        Arresta il ciclo di produzione; con `flush=True` include nella catena
+        le transazioni ancora pendenti.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
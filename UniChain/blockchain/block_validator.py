@@ -0,0 +1,180 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from UniChain.blockchain.block import build_tx_tree
+from UniChain.utils.crypto_suite import verify_with_pem
+
+
+class BlockValidator:
+    """
+    Pipeline di validazione dei blocchi proposti, eseguita dalle repliche PBFT
+    prima di votare PREPARE.
+
+    Controlla:
+    - il collegamento `previous_hash` con la cima della catena,
+    - la coerenza di `tx_root` con le transazioni del blocco,
+    - la firma del blocco con la chiave pubblica del proponente,
+    - la firma di ogni transazione con la chiave dell'università emittente.
+
+    Le verifiche delle firme delle transazioni sono distribuite su un pool di thread.
+    Un'unica istanza è condivisa dalle repliche co-locate nello stesso processo:
+    i risultati sono memorizzati in una LRU di terne (hash, impronta della firma,
+    impronta della chiave), quindi ogni firma viene verificata una sola volta
+    indipendentemente dal numero di repliche.
+    L'impronta della firma è parte della chiave della cache: gli hash di blocchi
+    e transazioni escludono la firma, e una copia con firma contraffatta non deve
+    ereditare l'esito della firma autentica (né viceversa).
+    """
+
+    def __init__(self, max_workers=None, cache_size=4096, executor=None):
+        """
+        :param max_workers: numero di thread per le verifiche delle transazioni
+        :param cache_size: numero massimo di risultati memorizzati nella LRU
+        :param executor: executor alternativo (es. ProcessPoolExecutor già avviato)
+        """
+        self.cache_size = cache_size
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                        thread_name_prefix="BlockValidator")
+        self._verified = OrderedDict()   # (hash, impronta firma, impronta chiave) → esito
+        self._in_flight = {}             # (hash, impronta firma, impronta chiave) → evento di completamento
+        self._lock = threading.Lock()
+
+        self.verifications = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def key_fingerprint(public_key_pem: str) -> str:
+        """
+        Impronta SHA-256 della chiave pubblica in formato PEM.
+        """
+        return hashlib.sha256(public_key_pem.encode("utf-8")).hexdigest()
+
+    # --- LRU dei risultati condivisa tra le repliche ---
+
+    @staticmethod
+    def signature_fingerprint(signature) -> str:
+        """
+        Impronta SHA-256 della firma (esadecimale); None se la firma è assente.
+        """
+        if signature is None:
+            return None
+        return hashlib.sha256(str(signature).encode("utf-8")).hexdigest()
+
+    def _cached(self, digest, signature, public_key_pem, verify):
+        """
+        Restituisce l'esito di `verify()` per la terna (digest, firma, chiave), calcolandolo
+        una sola volta anche se richiesto contemporaneamente da più repliche.
+        """
+        cache_key = (digest, self.signature_fingerprint(signature), self.key_fingerprint(public_key_pem))
+
+        with self._lock:
+            if cache_key in self._verified:
+                self._verified.move_to_end(cache_key)
+                self.cache_hits += 1
+                return self._verified[cache_key]
+            waiter = self._in_flight.get(cache_key)
+            owner = waiter is None
+            if owner:
+                waiter = self._in_flight[cache_key] = threading.Event()
+
+        if not owner:
+            # L'esito è letto dall'evento: la voce potrebbe essere già uscita dalla LRU
+            waiter.wait()
+            with self._lock:
+                self.cache_hits += 1
+            return waiter.result
+
+        try:
+            result = verify()
+        except Exception as e:
+            print(f"[BlockValidator] Errore durante la verifica: {e}")
+            result = False
+
+        with self._lock:
+            self.verifications += 1
+            self._verified[cache_key] = result
+            self._verified.move_to_end(cache_key)
+            while len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+            del self._in_flight[cache_key]
+        waiter.result = result
+        waiter.set()
+        return result
+
+    # --- Verifiche crittografiche ---
+
+    @staticmethod
+    def check_block_signature(block, public_key_pem) -> bool:
+        """
+        Verifica la firma del proponente sul blocco, senza memorizzazione.
+        La suite è quella della chiave del proponente e deve coincidere con quella registrata.
+        """
+        try:
+            return verify_with_pem(public_key_pem,
+                                   bytes.fromhex(block.signature),
+                                   block.get_payload_to_sign(),
+                                   block.signature_suite)
+        except (ValueError, TypeError):
+            return False
+
+    def verify_block_signature(self, block, public_key_pem) -> bool:
+        """
+        Verifica la firma del proponente sul blocco (con memorizzazione del risultato).
+        """
+        return self._cached(block.block_hash, block.signature, public_key_pem,
+                            lambda: self.check_block_signature(block, public_key_pem))
+
+    def verify_transaction_signature(self, transaction, public_key_pem) -> bool:
+        """
+        Verifica la firma di una transazione (con memorizzazione del risultato).
+        """
+        return self._cached(transaction.transaction_hash, transaction.signature, public_key_pem,
+                            lambda: transaction.verify_signature(public_key_pem))
+
+    # --- Validazione completa del blocco ---
+
+    def validate_block(self, block, previous_hash, public_keys) -> bool:
+        """
+        Valida un blocco proposto.
+
+        :param block: blocco congelato e firmato dal proponente
+        :param previous_hash: hash dell'ultimo blocco della catena della replica
+        :param public_keys: mappa university_id → chiave pubblica PEM delle università attive
+        :return: True se tutti i controlli sono superati
+        """
+        if block.previous_hash != previous_hash:
+            print(f"[BlockValidator] Blocco #{block.block_number}: previous_hash non coerente.")
+            return False
+
+        if build_tx_tree(block.transactions).get_root() != block.tx_root:
+            print(f"[BlockValidator] Blocco #{block.block_number}: tx_root non coerente.")
+            return False
+
+        proposer_pem = public_keys.get(block.block_proposer)
+        if proposer_pem is None:
+            print(f"[BlockValidator] Proponente {block.block_proposer} non accreditato.")
+            return False
+        if not self.verify_block_signature(block, proposer_pem):
+            print(f"[BlockValidator] Blocco #{block.block_number}: firma del proponente non valida.")
+            return False
+
+        jobs = []
+        for tx in block.transactions:
+            signer_pem = public_keys.get(tx.issuer_id or block.block_proposer)
+            if signer_pem is None:
+                print(f"[BlockValidator] Emittente {tx.issuer_id} della transazione non accreditato.")
+                return False
+            jobs.append((tx, signer_pem))
+
+        if len(jobs) == 1:
+            results = [self.verify_transaction_signature(*jobs[0])]
+        else:
+            results = list(self._executor.map(lambda job: self.verify_transaction_signature(*job), jobs))
+
+        for (tx, _), valid in zip(jobs, results):
+            if not valid:
+                print(f"[BlockValidator] Firma non valida per la transazione {tx.transaction_hash[:16]}...")
+                return False
+        return True
@@ -1,5 +1,17 @@
+import threading
+
 from UniChain.blockchain.transaction import Transaction
 from UniChain.blockchain.block import Block
+from UniChain.blockchain.mempool import Mempool
+from UniChain.blockchain.pbft import PBFTEngine
+from UniChain.blockchain.block_validator import BlockValidator
+from UniChain.blockchain.chain_store import StoredChain
+from UniChain.blockchain.chain_audit import audit_chain
+from UniChain.blockchain.credential_index import CredentialRecord, block_index_entries, \
+    encode_index_entries, decode_index_entries
+from UniChain.blockchain.status_list import StatusList
+from UniChain.structures.sparse_merkle_tree import SparseMerkleTree, key_for, EMPTY_ROOT
+from UniChain.utils.listeners import weak_callback, run_fallback
 
 
 class Blockchain:
@@ -8,11 +20,44 @@ class Blockchain:
     delle transazioni di emissione e revoca dei CAD accademici.
     Ogni blocco è firmato digitalmente dall’università proponente.
     """
-    def __init__(self, mobility_ca):
-        self.chain = []
-        self.pending_transactions = []
+    def __init__(self, mobility_ca, mempool=None, consensus=None, validator=None, store=None):
+        """
+        :param store: ChainStore opzionale; se presente la catena è persistita su disco
+                      e, alla riapertura, i blocchi vengono letti solo quando richiesti
+        """
+        self.store = store
+        self.chain = StoredChain(store) if store is not None else []
+        self.mempool = mempool or Mempool()
+        # Motore PBFT a scambio di messaggi usato da add_block
+        self.consensus = consensus or PBFTEngine()
+        # Pipeline di validazione condivisa dalle repliche co-locate
+        self.validator = validator or BlockValidator()
         self.mobility_ca = mobility_ca
-        self.create_genesis_block()
+        # Serializza l'aggiunta di blocchi tra chiamanti diretti e BlockProducer
+        self._lock = threading.RLock()
+        # Indice: credential_unique_id → CredentialRecord (stato della credenziale on-chain)
+        self._credential_index = {}
+        self._index_ready = True
+        # Status list di revoca per emittente e prossimo indice libero di ciascuna
+        self._status_lists = {}
+        self._status_next_index = {}
+        self._status_owners = {}   # (emittente, status_index) → credential_unique_id
+        # Registro delle revoche: Sparse Merkle Tree con chiave SHA-256(credential_unique_id)
+        self._revocation_tree = SparseMerkleTree()
+        self._pending_revocations = []   # chiavi indicizzate ma non ancora inserite nell'albero
+        # Altezza fino alla quale la catena è già stata validata da is_chain_valid
+        self._validated_height = 0
+        # Sottoscrittori degli eventi della catena: evento → riferimenti deboli alle callback
+        self._listeners = {"block_appended": [], "credential_revoked": []}
+
+        if len(self.chain) == 0:
+            self.create_genesis_block()
+        else:
+            # Avvio a freddo: i blocchi persistiti sono stati validati prima della scrittura
+            # (is_chain_valid(full=True) li ricontrolla); l'indice è ricaricato dal giornale
+            # della ChainStore alla prima query.
+            self._validated_height = len(self.chain) - 1
+            self._index_ready = False
 
     def create_genesis_block(self):
         """
@@ -27,27 +72,397 @@ class Blockchain:
 
         genesis_block = Block(
             previous_hash="0",
-            transaction=fake_transaction,
+            transactions=[fake_transaction],
             version="1.0",
             block_number=0,
             block_proposer="Genesis Block",
-            signature="Genesis Signature"
-        )
+            signature="Genesis Signature",
+            revocation_root=EMPTY_ROOT
+        ).freeze()
 
-        self.chain.append(genesis_block)
+        self._append_block(genesis_block)
+
+    def _append_block(self, block):
+        """
+        Aggiunge un blocco alla catena e aggiorna l'indice delle credenziali.
+        Unico punto in cui `self.chain` viene esteso.
+        """
+        self.chain.append(block)
+        if self._index_ready:
+            self._index_block(len(self.chain) - 1, block)
+
+        self._notify("block_appended", block)
+        for tx in block.transactions:
+            if tx.transaction_type == "REVOCA":
+                self._notify("credential_revoked", tx.credential_unique_id, block)
+
+    # --- Eventi della catena ---
+
+    def subscribe(self, event, callback, on_error=None):
+        """
+        Registra una callback per un evento della catena:
+        - "block_appended": callback(block) per ogni blocco aggiunto,
+        - "credential_revoked": callback(credential_unique_id, block) per ogni REVOCA aggiunta.
+        I metodi sono mantenuti con riferimenti deboli: la sottoscrizione non impedisce
+        la deallocazione dell'oggetto sottoscrittore.
+
+        :param on_error: callback senza argomenti invocata se `callback` solleva
+                         un'eccezione (es. lo svuotamento completo di una cache)
+        """
+        if event not in self._listeners:
+            raise ValueError(f"Evento della blockchain sconosciuto: {event}")
+        self._listeners[event].append((weak_callback(callback), weak_callback(on_error)))
+
+    def _notify(self, event, *args):
+        listeners = self._listeners[event]
+        alive = []
+        for ref, on_error in listeners:
+            callback = ref()
+            if callback is None:
+                continue
+            alive.append((ref, on_error))
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"[Blockchain] Errore nella notifica dell'evento {event}: {e}")
+                run_fallback(on_error, "Blockchain")
+        listeners[:] = alive
+
+    def _credential_record(self, credential_unique_id):
+        """
+        Accesso all'indice delle credenziali; dopo un avvio a freddo da disco
+        l'indice viene ricostruito alla prima interrogazione.
+        """
+        self._ensure_index()
+        return self._credential_index.get(credential_unique_id)
+
+    def _ensure_index(self):
+        """
+        Ricostruisce indice delle credenziali, status list e registro delle revoche
+        dopo un avvio a freddo, dal giornale dell'indice persistito nella ChainStore:
+        nessun blocco viene decodificato. Solo i blocchi eventualmente privi di voce
+        nel giornale (archivio precedente al giornale o append interrotta) vengono
+        letti, indicizzati e aggiunti al giornale.
+        """
+        if not self._index_ready:
+            with self._lock:
+                if not self._index_ready:
+                    journal = self.store.read_index_journal()
+                    for number, data in enumerate(journal):
+                        self._apply_index_entries(number, decode_index_entries(data))
+                    for number in range(len(journal), len(self.chain)):
+                        entries = block_index_entries(self.chain[number])
+                        self._apply_index_entries(number, entries)
+                        self.store.append_index_journal(encode_index_entries(entries))
+                    self._index_ready = True
+
+    def _index_block(self, position, block):
+        """
+        Aggiorna l'indice con le transazioni del blocco appena aggiunto in posizione
+        `position` e, con una ChainStore, ne persiste le voci nel giornale dell'indice.
+        """
+        entries = block_index_entries(block)
+        self._apply_index_entries(position, entries)
+        if self.store is not None:
+            self.store.append_index_journal(encode_index_entries(entries))
+
+    def _apply_index_entries(self, block_number, entries):
+        """
+        Applica all'indice le voci (vedi `block_index_entries`) del blocco in posizione `block_number`.
+        Per ogni credential_unique_id mantiene:
+        - il primo blocco (e transazione) di EMISSIONE e la Merkle Root degli attributi ancorata,
+        - l'emittente e l'indice nella sua status list,
+        - l'ultima transazione registrata (stato corrente),
+        - l'ultimo blocco di REVOCA.
+        Le REVOCA impostano il bit della credenziale nella status list dell'emittente
+        e la inseriscono nello Sparse Merkle Tree delle revoche.
+        """
+        for position, (credential_id, transaction_type, issuer, status_index, merkle_root) in enumerate(entries):
+            record = self._credential_index.get(credential_id)
+            if record is None:
+                record = self._credential_index[credential_id] = CredentialRecord(self.chain)
+
+            if transaction_type == "EMISSIONE" and record.issuance is None:
+                record.issuance = (block_number, position)
+                record.merkle_root = merkle_root
+                record.issuer = issuer
+                if status_index is not None:
+                    record.status_index = status_index
+                    # Catene già scritte con indici duplicati: resta titolare la prima credenziale
+                    self._status_owners.setdefault((issuer, status_index), credential_id)
+                    self._status_next_index[issuer] = max(self._status_next_index.get(issuer, 0),
+                                                          status_index + 1)
+            elif transaction_type == "REVOCA":
+                record.revocation_number = block_number
+                self._pending_revocations.append(key_for(credential_id))
+                if record.status_index is not None:
+                    self._status_list(record.issuer).set_revoked(record.status_index)
+
+            record.latest = (block_number, position)
+
+    # --- API di interrogazione dell'indice delle credenziali ---
+
+    def get_credential_record(self, credential_unique_id):
+        """
+        Restituisce il record indicizzato della credenziale (None se mai registrata).
+        """
+        return self._credential_record(credential_unique_id)
+
+    def get_issuance_block(self, credential_unique_id):
+        """
+        Restituisce il blocco di EMISSIONE della credenziale, se presente.
+        """
+        record = self._credential_record(credential_unique_id)
+        return record["issuance_block"] if record else None
+
+    def get_revocation_block(self, credential_unique_id):
+        """
+        Restituisce l'ultimo blocco di REVOCA della credenziale, se presente.
+        """
+        record = self._credential_record(credential_unique_id)
+        return record["revocation_block"] if record else None
+
+    def get_anchored_merkle_root(self, credential_unique_id):
+        """
+        Restituisce la Merkle Root degli attributi ancorata al momento dell'EMISSIONE.
+        """
+        record = self._credential_record(credential_unique_id)
+        return record["merkle_root"] if record else None
+
+    def get_issuance_proof(self, credential_unique_id):
+        """
+        Restituisce la prova di inclusione della transazione di EMISSIONE
+        nel relativo blocco (Merkle proof rispetto a `tx_root`), insieme alla
+        transazione stessa: il wallet la allega alla presentazione per i
+        verificatori in modalità light client.
+        """
+        record = self._credential_record(credential_unique_id)
+        if not record or record["issuance_block"] is None:
+            return None
+        block = record["issuance_block"]
+        tx_hash = record["issuance_transaction"].transaction_hash
+        return {
+            "blockNumber": block.block_number,
+            "transactionHash": tx_hash,
+            "txRoot": block.tx_root,
+            "proof": block.get_transaction_proof(tx_hash),
+            "transaction": record["issuance_transaction"].to_dict(),
+        }
+
+    def get_latest_transaction(self, credential_unique_id):
+        """
+        Restituisce la transazione più recente registrata per la credenziale.
+        """
+        record = self._credential_record(credential_unique_id)
+        return record["latest_transaction"] if record else None
 
     def get_latest_block(self):
         return self.chain[-1]
 
-    def add_transaction(self, transaction):
+    def get_headers(self, start=0):
+        """
+        Intestazioni codificate dei blocchi a partire da `start`, per la
+        sincronizzazione dei light client.
+
+        :raises ValueError: se un blocco è di versione 1 (senza intestazione autonoma)
+        """
+        return [self.chain[number].get_header().to_bytes() for number in range(start, len(self.chain))]
+
+    # --- Registro delle revoche (Sparse Merkle Tree) ---
+
+    def _revocations(self):
+        """
+        Sparse Merkle Tree delle revoche, completato con le REVOCA indicizzate ma non
+        ancora inserite: dopo un avvio a freddo gli inserimenti (256 hash ciascuno)
+        sono eseguiti solo quando serve la root o una prova, non alla prima query.
+        """
+        self._ensure_index()
+        if self._pending_revocations:
+            with self._lock:
+                for key in self._pending_revocations:
+                    self._revocation_tree.insert(key)
+                self._pending_revocations.clear()
+        return self._revocation_tree
+
+    def get_revocation_root(self):
+        """
+        Root corrente dello Sparse Merkle Tree delle revoche.
+        """
+        return self._revocations().get_root()
+
+    def get_revocation_proof(self, credential_unique_id):
+        """
+        Prova di (non) appartenenza della credenziale al registro delle revoche,
+        rispetto alla `revocation_root` dell'ultimo blocco: il wallet la allega alla
+        presentazione e il verificatore la controlla conoscendo solo l'intestazione.
+        """
+        self._ensure_index()
+        with self._lock:
+            latest_block = self.get_latest_block()
+            return {
+                "blockNumber": latest_block.block_number,
+                "revocationRoot": latest_block.revocation_root,
+                "proof": self._revocations().get_proof(key_for(credential_unique_id)),
+            }
+
+    # --- Status list di revoca ---
+
+    def _status_list(self, issuer_id):
+        status_list = self._status_lists.get(issuer_id)
+        if status_list is None:
+            status_list = self._status_lists[issuer_id] = StatusList(issuer_id)
+        return status_list
+
+    def allocate_status_index(self, issuer_id):
+        """
+        Riserva il prossimo indice libero nella status list dell'emittente,
+        da assegnare a `Transaction.status_index` di una nuova EMISSIONE.
+        """
+        self._ensure_index()
+        with self._lock:
+            index = self._status_next_index.get(issuer_id, 0)
+            self._status_next_index[issuer_id] = index + 1
+            return index
+
+    def get_status_list(self, issuer_id):
+        """
+        Copia della status list di revoca dell'emittente, aggiornata alla cima della catena.
+        """
+        self._ensure_index()
+        with self._lock:
+            return self._status_list(issuer_id).copy()
+
+    def publish_status_list(self, university):
+        """
+        Pubblicazione compressa e firmata dall'università della propria status list.
+        """
+        self._ensure_index()
+        with self._lock:
+            return self._status_list(university.university_id).publish(university, len(self.chain) - 1)
+
+    @property
+    def pending_transactions(self):
+        """
+        Transazioni in attesa nella mempool, in ordine di priorità.
+        """
+        return self.mempool.snapshot()
+
+    def next_block_number(self):
+        """
+        Numero del prossimo blocco da aggiungere alla catena.
+        """
+        return len(self.chain)
+
+    def is_transaction_admissible(self, transaction) -> bool:
+        """
+        Controlla che la transazione sia coerente con lo stato corrente della catena:
+        - EMISSIONE: la credenziale non deve essere già stata emessa e il suo eventuale
+          status_index (che richiede issuer_id) non deve essere già assegnato;
+        - REVOCA: l'ultima transazione registrata per la credenziale deve essere un'EMISSIONE.
+        """
+        record = self._credential_record(transaction.credential_unique_id)
+        if transaction.transaction_type == "EMISSIONE":
+            if transaction.status_index is not None:
+                # L'indice nella status list non deve essere già assegnato a un'altra credenziale
+                issuer = transaction.issuer_id
+                if issuer is None or (issuer, transaction.status_index) in self._status_owners:
+                    return False
+            return record is None or record.issuance is None
+        if transaction.transaction_type == "REVOCA":
+            # Revocabile solo una credenziale emessa e non ancora revocata
+            return record is not None and record.issuance is not None and record.revocation_number is None
+        return False
+
+    def _first_inadmissible(self, transactions):
         """
-        Aggiunge una transazione alla lista pendente (non usata attualmente).
+        Prima transazione del lotto non ammissibile rispetto alla catena e alle
+        transazioni che la precedono nello stesso lotto (None se tutte ammissibili):
+        nel lotto una credenziale è emessa e revocata al più una volta e ogni
+        coppia (emittente, status_index) è assegnata a una sola credenziale.
         """
-        self.pending_transactions.append(transaction)
+        issued, revoked, status_slots = set(), set(), set()
+        for tx in transactions:
+            credential_id = tx.credential_unique_id
+            if tx.transaction_type == "EMISSIONE":
+                slot = (tx.issuer_id, tx.status_index)
+                if (credential_id in issued or (tx.status_index is not None and slot in status_slots)
+                        or not self.is_transaction_admissible(tx)):
+                    return tx
+                issued.add(credential_id)
+                if tx.status_index is not None:
+                    status_slots.add(slot)
+            elif tx.transaction_type == "REVOCA":
+                if credential_id in revoked or (credential_id not in issued and not self.is_transaction_admissible(tx)):
+                    return tx
+                revoked.add(credential_id)
+            else:
+                return tx
+        return None
+
+    def is_transaction_signature_valid(self, transaction) -> bool:
+        """
+        Controlla la firma della transazione con la chiave dell'emittente dichiarato
+        in `issuer_id`, che deve essere un'università attualmente accreditata.
+        Le transazioni senza `issuer_id` non sono verificabili prima di conoscere
+        il proponente del blocco e non sono accettate nella mempool.
+        """
+        if not transaction.signature or transaction.issuer_id is None:
+            return False
+        issuer_pem = self.mobility_ca.get_registry_snapshot().public_keys.get(transaction.issuer_id)
+        if issuer_pem is None:
+            return False
+        return self.validator.verify_transaction_signature(transaction, issuer_pem)
+
+    def add_transaction(self, transaction) -> bool:
+        """
+        Aggiunge una transazione firmata alla mempool.
+        Sarà inclusa in un blocco dal BlockProducer.
+
+        :return: True se accettata, False se duplicata
+        :raises ValueError: se la transazione non è firmata, non indica l'emittente,
+                            ha una firma non valida o non è ammissibile
+        """
+        if not transaction.signature:
+            raise ValueError("[Blockchain] La transazione deve essere firmata prima dell'invio.")
+        if transaction.issuer_id is None:
+            raise ValueError("[Blockchain] La transazione deve indicare l'università emittente (issuer_id).")
+        if not self.is_transaction_signature_valid(transaction):
+            raise ValueError(f"[Blockchain] Firma della transazione per {transaction.credential_unique_id} "
+                             f"non valida o emittente {transaction.issuer_id} non accreditato.")
+        if not self.is_transaction_admissible(transaction):
+            raise ValueError(f"[Blockchain] Transazione {transaction.transaction_type} non ammissibile "
+                             f"per {transaction.credential_unique_id}.")
+        return self.mempool.add(transaction)
 
     def add_block(self, transaction, version, block_number, block_proposer_obj, attributes_merkle_root=None):
         """
         Esegue il consenso PBFT per finalizzare e aggiungere un blocco alla blockchain.
+
+        :param transaction: singola Transaction oppure lista di Transaction da includere
+                            nello stesso blocco (firma e consenso ammortizzati sul lotto)
+        :param block_number: deve essere `next_block_number()`; per assegnarlo
+                             automaticamente usare `add_next_block`
+        :raises ValueError: se il numero del blocco non è il successivo della catena
+        """
+        with self._lock:
+            expected = self.next_block_number()
+            if block_number != expected:
+                raise ValueError(f"Numero di blocco non valido: {block_number} (atteso {expected}).")
+            return self._add_block(transaction, version, block_number, block_proposer_obj, attributes_merkle_root)
+
+    def add_next_block(self, transaction, version, block_proposer_obj, attributes_merkle_root=None):
+        """
+        Come `add_block`, ma assegna automaticamente il numero del blocco
+        in modo atomico rispetto ad altre aggiunte concorrenti.
+        """
+        with self._lock:
+            return self._add_block(transaction, version, self.next_block_number(),
+                                   block_proposer_obj, attributes_merkle_root)
+
+    def _add_block(self, transaction, version, block_number, block_proposer_obj, attributes_merkle_root):
+        """
+        Corpo di `add_block`, eseguito con il lock della blockchain acquisito.
+        Restituisce il blocco finalizzato.
         """
         # Controlla se l'università proponente è accreditata
         certificate = block_proposer_obj.get_certificate()
@@ -55,53 +470,88 @@ class Blockchain:
             raise Exception(
                 f"[Blockchain] Errore: l'università {block_proposer_obj.official_name} non è più accreditata.")
 
+        self._ensure_index()
+        transactions = transaction if isinstance(transaction, (list, tuple)) else [transaction]
+        rejected = self._first_inadmissible(transactions)
+        if rejected is not None:
+            raise Exception(f"[Blockchain] Transazione {rejected.transaction_type} non ammissibile per "
+                            f"{rejected.credential_unique_id} rispetto alla catena o al blocco proposto.")
+
         previous_block = self.get_latest_block()
         previous_hash = previous_block.block_hash
 
         # === [Fase 1] Pre-prepare: il Primary (block_proposer) costruisce il blocco ===
         temp_block = Block(
             previous_hash=previous_hash,
-            transaction=transaction,
+            transactions=transaction,
             version=version,
             block_number=block_number,
             block_proposer=block_proposer_obj.university_id,
             signature=None,
-            attributes_merkle_root=attributes_merkle_root
+            attributes_merkle_root=attributes_merkle_root,
+            signature_suite=block_proposer_obj.get_crypto_suite().name
         )
+        # Root del registro delle revoche dopo l'applicazione del blocco (256 nodi per REVOCA)
+        revocation_root = self._revocations().root_with(
+            [key_for(tx.credential_unique_id) for tx in temp_block.transactions if tx.transaction_type == "REVOCA"])
+        temp_block.revocation_root = revocation_root
 
         payload = temp_block.get_payload_to_sign()
         signature = block_proposer_obj.sign_message(payload).hex()
         temp_block.signature = signature
+        temp_block.freeze()
 
-        # === [Fase 2] Prepare: invia a tutti i Replicas per la validazione ===
-        all_unis = [u for u in self.mobility_ca.get_public_registry() if not u["revoked"]]
+        # === [Fase 2-3] Prepare e Commit: le repliche validano e votano il blocco ===
+        # Fotografia del registro: repliche attive e chiavi senza lavoro X.509 a ogni blocco
+        registry = self.mobility_ca.get_registry_snapshot()
+        all_unis = registry.active
         replicas = [u for u in all_unis if u["university_id"] != block_proposer_obj.university_id]
-        R = (len(all_unis) - 1) // 3
-        quorum = 2 * R + 1
+
+        public_keys = registry.public_keys
+
+        def validate(replica_id, block):
+            # Ogni replica controlla collegamento, tx_root, registro delle revoche e firme prima di votare
+            return (block.revocation_root == revocation_root
+                    and self.validator.validate_block(block, previous_hash, public_keys))
+
+        result = self.consensus.run(
+            replicas=list(registry.active_replicas),
+            primary_id=block_proposer_obj.university_id,
+            proposals=[(temp_block, temp_block.block_hash)],
+            validate=validate,
+            first_sequence=block_number
+        )[0]
 
         prepare_votes = 0
         for r_dict in replicas:
-            try:
-                # Simulazione: assumiamo che ogni replica accetti
+            if r_dict["university_id"] in result["pre_prepared"]:
                 prepare_votes += 1
                 print(f"[PBFT] {r_dict['official_name']} → PREPARE OK.")
-            except Exception as e:
-                print(f"[PBFT] {r_dict['official_name']} → PREPARE FAIL: {e}")
+            else:
+                print(f"[PBFT] {r_dict['official_name']} → PREPARE FAIL.")
 
-        if prepare_votes >= quorum:
+        if result["committed"]:
             print(f"[PBFT] Quorum raggiunto ({prepare_votes}/{len(replicas)}). Commit finale del blocco.")
-            self.chain.append(temp_block)
+            latency = result["phase_latency_ms"]
+            print(f"[PBFT] COMMIT da {len(result['commit_votes'])}/{len(all_unis)} repliche "
+                  f"(pre-prepare {latency['pre_prepare']:.3f} ms, prepare {latency['prepare']:.3f} ms, "
+                  f"commit {latency['commit']:.3f} ms).")
+            self._append_block(temp_block)
 
             block_proposer_obj.add_trust_point(1, reason="blocco proposto e validato")
 
             for r_dict in replicas:
-                uni_obj = block_proposer_obj.get_peer_by_id(r_dict["university_id"])  # Da implementare
+                if r_dict["university_id"] not in result["commit_votes"]:
+                    continue
+                uni_obj = block_proposer_obj.get_peer_by_id(r_dict["university_id"])
                 if uni_obj:
                     uni_obj.add_trust_point(0.5, reason="partecipazione al consenso")
 
-            print(f"[Blockchain] Blocco #{block_number} aggiunto alla blockchain.")
+            print(f"[Blockchain] Blocco #{block_number} aggiunto alla blockchain "
+                  f"({len(temp_block.transactions)} transazioni).")
             print(f"   - Proposto da: {block_proposer_obj.official_name}")
-            print(f"   - Firma SHA256-RSA: {signature[:64]}...\n")
+            print(f"   - Firma {temp_block.signature_suite}: {signature[:64]}...\n")
+            return temp_block
         else:
             print(f"[PBFT] Quorum NON raggiunto ({prepare_votes}/{len(replicas)}). Blocco SCARTATO.")
             raise Exception("[PBFT] Consenso fallito. Il blocco non è stato aggiunto.")
@@ -113,22 +563,41 @@ class Blockchain:
         proposers = {block.block_proposer for block in self.chain if block.block_proposer != "Genesis Block"}
         return [u for uid, u in self.mobility_ca.get_university_objects().items() if uid in proposers]
 
-    def is_chain_valid(self):
+    def is_chain_valid(self, full=False):
         """
         Verifica la coerenza della catena:
         - Collegamento corretto tra blocchi
         - Hash coerente
+        - `tx_root` coerente con le transazioni firmate (blocchi di versione 2)
+
+        Per default controlla solo i blocchi aggiunti dopo l'ultima validazione
+        riuscita (watermark `_validated_height`). Con `full=True` ricontrolla
+        l'intera catena, ricalcolando l'hash di ogni blocco (genesi inclusa).
         """
-        for i in range(1, len(self.chain)):
+        start = 0 if full else self._validated_height + 1
+
+        for i in range(start, len(self.chain)):
             current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
 
-            if current_block.previous_hash != previous_block.block_hash:
+            if i > 0 and current_block.previous_hash != self.chain[i - 1].block_hash:
+                self._validated_height = min(self._validated_height, i - 1)
                 return False
-            if current_block.block_hash != current_block.calculate_hash():
+            if current_block.block_hash != current_block.calculate_hash() or not current_block.has_valid_tx_root():
+                self._validated_height = min(self._validated_height, max(i - 1, 0))
                 return False
+
+        self._validated_height = len(self.chain) - 1
         return True
 
+    def audit(self, workers=None, chunk_size=None):
+        """
+        Audit completo della catena in parallelo su un pool di processi:
+        oltre ai collegamenti verifica firme dei blocchi e delle transazioni e
+        l'accreditamento del proponente all'altezza di ciascun blocco.
+        Pensato per verifiche periodiche, non per ogni aggiunta di blocco.
+        """
+        return audit_chain(self, workers=workers, chunk_size=chunk_size)
+
     def revoke_credential(self, credential_unique_id, credential_hash, student_wallet_address,
                           version, block_number, block_proposer_obj, attributes_merkle_root=None):
         """
@@ -136,17 +605,11 @@ class Blockchain:
         come blocco firmato digitalmente dall’università.
         """
         # Controlla se la credenziale esiste già ed è di tipo EMISSIONE
-        found = False
-        for block in reversed(self.chain):
-            tx = block.transaction
-            if tx.credential_unique_id == credential_unique_id:
-                if tx.transaction_type == "EMISSIONE":
-                    found = True
-                    break
-                elif tx.transaction_type == "REVOCA":
-                    raise Exception(f"La credenziale {credential_unique_id} è già stata revocata.")
-        if not found:
+        latest_tx = self.get_latest_transaction(credential_unique_id)
+        if latest_tx is None:
             raise Exception(f"Impossibile revocare: credenziale {credential_unique_id} non trovata nella blockchain.")
+        if latest_tx.transaction_type == "REVOCA":
+            raise Exception(f"La credenziale {credential_unique_id} è già stata revocata.")
 
         # Se passa il controllo, crea la transazione di revoca
         revocation_tx = Transaction(
@@ -154,9 +617,10 @@ class Blockchain:
             credential_unique_id=credential_unique_id,
             student_wallet_address=student_wallet_address,
             revocation_status=True,
-            transaction_type="REVOCA"
+            transaction_type="REVOCA",
+            issuer_id=block_proposer_obj.university_id
         )
-        revocation_tx.sign_transaction(block_proposer_obj.private_key)
+        revocation_tx.sign_transaction(block_proposer_obj.get_private_key())
 
         # Aggiungi il blocco di revoca alla catena
         self.add_block(
@@ -172,13 +636,10 @@ class Blockchain:
         Controlla se la credenziale con l’ID dato è valida (non revocata).
         Restituisce True se non è stata revocata, False se esiste una revoca.
         """
-        # Scorri la catena all’indietro per trovare la transazione più recente per quell’ID
-        for block in reversed(self.chain):
-            tx = block.transaction
-            if tx.credential_unique_id == credential_unique_id:
-                if tx.transaction_type == "REVOCA" and tx.revocation_status:
-                    return False  # È stata revocata
-                elif tx.transaction_type == "EMISSIONE":
-                    return True  # Trovata emissione senza revoca successiva
-        # Se non trovi nessuna transazione per quell’ID
-        return False
+        latest_tx = self.get_latest_transaction(credential_unique_id)
+        if latest_tx is None:
+            # Nessuna transazione registrata per quell’ID
+            return False
+        if latest_tx.transaction_type == "REVOCA" and latest_tx.revocation_status:
+            return False  # È stata revocata
+        return latest_tx.transaction_type == "EMISSIONE"
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from UniChain.blockchain import encoding
+from UniChain.blockchain.block import Block
+from UniChain.blockchain.block_header import BlockHeader
+from UniChain.blockchain.block_validator import BlockValidator
+from UniChain.blockchain.chain_store import ChainStore
+
+
+def _keys_at(accreditation, university_id, timestamp):
+    """
+    Chiavi pubbliche dei certificati dell'università validi all'istante `timestamp`
+    del blocco (rilasciati prima e non ancora revocati). Un'università riaccreditata
+    ha più certificati: ogni blocco è verificato con quelli in vigore alla sua data.
+    """
+    moment = datetime.fromisoformat(timestamp)
+    return [certificate["public_key"] for certificate in accreditation.get(university_id, ())
+            if (certificate["issued_at"] is None or datetime.fromisoformat(certificate["issued_at"]) <= moment)
+            and (certificate["revoked_at"] is None or moment < datetime.fromisoformat(certificate["revoked_at"]))]
+
+
+def _raw_block_hash(data):
+    """
+    Hash e previous_hash di un blocco che non supera la ricostruzione (es. tx_root
+    non coerente), calcolati dalla sola codifica; None se la codifica è illeggibile.
+    """
+    try:
+        values = encoding.decode_block(data)
+        if values.get("revocation_root") is not None:
+            block_hash = BlockHeader(**values).block_hash
+        else:
+            block_hash = hashlib.sha256(data).hexdigest()
+        return block_hash, values["previous_hash"]
+    except (ValueError, TypeError, KeyError, IndexError, struct.error):
+        return None
+
+
+def _audit_range(job):
+    """
+    Verifica un intervallo di blocchi in un processo worker.
+
+    :param job: dizionario con `start`, `end`, l'origine dei blocchi (`store_dir` oppure
+                `encoded` con i blocchi già codificati) e la mappa di accreditamento
+    :return: estremi dell'intervallo (per la cucitura) ed errori riscontrati
+    """
+    accreditation = job["accreditation"]
+    store = ChainStore(job["store_dir"], read_only=True) if job.get("store_dir") else None
+    errors = []
+    first_previous_hash = None
+    previous_hash = None
+
+    try:
+        for offset, number in enumerate(range(job["start"], job["end"])):
+            data = store.read(number) if store else job["encoded"][offset]
+            try:
+                # from_dict ricalcola hash delle transazioni e tx_root
+                block = Block.from_dict(encoding.decode_block(data))
+            except (ValueError, TypeError, KeyError, IndexError, struct.error) as e:
+                errors.append((number, f"blocco non decodificabile: {e}"))
+                raw = _raw_block_hash(data)
+                if raw is not None:
+                    # Il collegamento resta verificabile anche attraverso il blocco non valido
+                    block_hash, block_previous_hash = raw
+                    if first_previous_hash is None:
+                        first_previous_hash = block_previous_hash
+                    if previous_hash is not None and block_previous_hash != previous_hash:
+                        errors.append((number, "collegamento previous_hash non valido"))
+                    previous_hash = block_hash
+                # Altrimenti si mantiene l'ultimo hash valido: il blocco successivo risulterà
+                # non collegato invece di saltare il controllo
+                continue
+
+            if first_previous_hash is None:
+                first_previous_hash = block.previous_hash
+            if block.block_number != number:
+                errors.append((number, f"numero di blocco non coerente ({block.block_number})"))
+            if previous_hash is not None and block.previous_hash != previous_hash:
+                errors.append((number, "collegamento previous_hash non valido"))
+            previous_hash = block.block_hash
+
+            if number == 0:
+                if block.previous_hash != "0":
+                    errors.append((number, "blocco di genesi non valido"))
+                continue
+
+            proposer_keys = _keys_at(accreditation, block.block_proposer, block.timestamp)
+            if not proposer_keys:
+                errors.append((number, f"proponente {block.block_proposer} non accreditato a quell'altezza"))
+                continue
+            if not any(BlockValidator.check_block_signature(block, pem) for pem in proposer_keys):
+                errors.append((number, "firma del blocco non valida"))
+                continue
+
+            for tx in block.transactions:
+                signer_keys = _keys_at(accreditation, tx.issuer_id or block.block_proposer, block.timestamp)
+                if not any(tx.verify_signature(pem) for pem in signer_keys):
+                    errors.append((number, f"firma non valida per la transazione {tx.transaction_hash[:16]}..."))
+    finally:
+        if store:
+            store.close()
+
+    return {
+        "start": job["start"],
+        "end": job["end"],
+        "first_previous_hash": first_previous_hash,
+        "last_hash": previous_hash,
+        "errors": errors,
+    }
+
+
+def audit_chain(blockchain, workers=None, chunk_size=None):
+    """
+    Audit completo e parallelo della catena.
+
+    La catena viene divisa in intervalli verificati da processi worker (collegamenti,
+    firme di blocchi e transazioni, accreditamento del proponente all'altezza del blocco);
+    gli hash di confine degli intervalli sono poi ricuciti nel processo principale.
+
+    :param blockchain: istanza di Blockchain da verificare
+    :param workers: numero di processi (default: numero di CPU)
+    :param chunk_size: blocchi per intervallo (default: circa 4 intervalli per worker)
+    :return: report con esito, errori e tempi
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    total = len(blockchain.chain)
+    chunk_size = chunk_size or max(1, -(-total // (workers * 4)))
+
+    # university_id → tutti i certificati rilasciati (anche revocati), con il loro periodo di validità
+    accreditation = {}
+    for entry in blockchain.mobility_ca.get_registry_snapshot().entries:
+        accreditation.setdefault(entry["university_id"], []).append({
+            "public_key": entry["public_key"],
+            "issued_at": entry["issued_at"],
+            "revoked_at": entry["revoked_at"],
+        })
+
+    jobs = []
+    for start in range(0, total, chunk_size):
+        end = min(start + chunk_size, total)
+        job = {"start": start, "end": end, "accreditation": accreditation}
+        if blockchain.store is not None:
+            job["store_dir"] = blockchain.store.directory
+        else:
+            job["encoded"] = [encoding.encode_block(blockchain.chain[i]) for i in range(start, end)]
+        jobs.append(job)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_audit_range, jobs))
+
+    errors = [error for result in results for error in result["errors"]]
+    # Cucitura: il primo blocco di ogni intervallo deve puntare all'ultimo del precedente
+    for previous, current in zip(results, results[1:]):
+        if current["first_previous_hash"] != previous["last_hash"]:
+            errors.append((current["start"], "collegamento non valido al confine tra intervalli"))
+
+    errors.sort()
+    return {
+        "valid": not errors,
+        "blocks": total,
+        "ranges": len(jobs),
+        "workers": workers,
+        "errors": errors,
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
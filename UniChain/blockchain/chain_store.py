@@ -0,0 +1,307 @@
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+from UniChain.blockchain.block import Block
+from UniChain.blockchain import encoding
+
+
+def encode_block(block) -> bytes:
+    """
+    Codifica canonica (binaria) di un blocco per la persistenza.
+    """
+    return encoding.encode_block(block)
+
+
+def decode_block(data: bytes):
+    """
+    Decodifica un blocco persistito con `encode_block`.
+    """
+    return Block.from_dict(encoding.decode_block(data))
+
+
+class ChainStore:
+    """
+    Archivio persistente append-only dei blocchi.
+
+    - I blocchi codificati sono scritti in file di segmento (`segment-NNNNNN.dat`)
+      che ruotano al raggiungimento di `segment_size` byte.
+    - Un indice laterale (`index.dat`) contiene un record a lunghezza fissa per blocco
+      (segmento, offset, lunghezza): il blocco N si trova senza leggere i precedenti.
+    - Le letture avvengono tramite file mappati in memoria (mmap).
+    - Un giornale (`credentials.dat`) conserva, per ogni blocco, le voci dell'indice
+      delle credenziali (record con lunghezza u32): dopo un riavvio la Blockchain
+      ricostruisce l'indice senza decodificare i blocchi.
+    """
+
+    INDEX_FILE = "index.dat"
+    INDEX_RECORD = struct.Struct("<IQI")   # segmento, offset, lunghezza
+    JOURNAL_FILE = "credentials.dat"
+    JOURNAL_LENGTH = struct.Struct("<I")
+
+    def __init__(self, directory, segment_size=64 * 1024 * 1024, fsync=False, read_only=False):
+        """
+        :param directory: cartella dell'archivio (creata se non esiste)
+        :param segment_size: dimensione massima (in byte) di un file di segmento
+        :param fsync: se True forza la scrittura su disco a ogni blocco
+        :param read_only: apre l'archivio in sola lettura (es. nei processi di audit),
+                          senza recupero né scritture
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.read_only = read_only
+
+        self._lock = threading.RLock()
+        self._maps = {}   # segmento → (mmap, dimensione mappata)
+        self._index_map = None
+        self._index_mapped = 0
+        self._segment_file = None
+
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        self._journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self._journal_file = None
+        if read_only:
+            self._index_file = open(index_path, "rb")
+            self._count = os.fstat(self._index_file.fileno()).st_size // self.INDEX_RECORD.size
+            self._active_segment, self._active_size = self._last_segment()
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        self._index_file = open(index_path, "a+b")
+        self._recover()
+        self._journal_file = open(self._journal_path, "a+b")
+        if self._count == 0:
+            # Archivio vuoto: un giornale residuo non corrisponde ad alcun blocco
+            self._journal_file.truncate(0)
+
+        self._active_segment, self._active_size = self._last_segment()
+        self._discard_unindexed_tail()
+        self._segment_file = open(self._segment_path(self._active_segment), "ab")
+
+    def _discard_unindexed_tail(self):
+        """
+        Elimina i byte scritti dopo l'ultimo blocco indicizzato (append interrotta).
+        """
+        path = self._segment_path(self._active_segment)
+        if os.path.exists(path) and os.path.getsize(path) > self._active_size:
+            with open(path, "r+b") as f:
+                f.truncate(self._active_size)
+        segment = self._active_segment + 1
+        while os.path.exists(self._segment_path(segment)):
+            os.remove(self._segment_path(segment))
+            segment += 1
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f"segment-{segment:06d}.dat")
+
+    def _recover(self):
+        """
+        Scarta eventuali record di indice incompleti o che puntano a dati non scritti
+        (es. interruzione durante un'append).
+        """
+        self._index_file.seek(0, os.SEEK_END)
+        size = self._index_file.tell()
+        valid = size - size % self.INDEX_RECORD.size
+        while valid:
+            self._index_file.seek(valid - self.INDEX_RECORD.size)
+            segment, offset, length = self.INDEX_RECORD.unpack(self._index_file.read(self.INDEX_RECORD.size))
+            path = self._segment_path(segment)
+            if os.path.exists(path) and os.path.getsize(path) >= offset + length:
+                break
+            valid -= self.INDEX_RECORD.size
+        if valid != size:
+            self._index_file.truncate(valid)
+        self._count = valid // self.INDEX_RECORD.size
+
+    def _last_segment(self):
+        if self._count == 0:
+            return 0, 0
+        segment, offset, length = self._record(self._count - 1)
+        return segment, offset + length
+
+    def __len__(self):
+        return self._count
+
+    def _record(self, number):
+        record_size = self.INDEX_RECORD.size
+        end = (number + 1) * record_size
+        if self._index_map is None or self._index_mapped < end:
+            if not self.read_only:
+                self._index_file.flush()
+            if self._index_map is not None:
+                self._index_map.close()
+            self._index_mapped = self._count * record_size
+            self._index_map = mmap.mmap(self._index_file.fileno(), self._index_mapped, access=mmap.ACCESS_READ)
+        return self.INDEX_RECORD.unpack_from(self._index_map, number * record_size)
+
+    def _segment_view(self, segment, end):
+        mapped = self._maps.get(segment)
+        if mapped is None or mapped[1] < end:
+            if segment == self._active_segment and self._segment_file is not None:
+                self._segment_file.flush()
+            if mapped is not None:
+                mapped[0].close()
+            with open(self._segment_path(segment), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                mapped = (mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ), size)
+            self._maps[segment] = mapped
+        return mapped[0]
+
+    def read(self, number) -> bytes:
+        """
+        Restituisce i byte codificati del blocco `number`.
+        """
+        with self._lock:
+            if not 0 <= number < self._count:
+                raise IndexError(f"Blocco #{number} non presente nell'archivio.")
+            segment, offset, length = self._record(number)
+            return self._segment_view(segment, offset + length)[offset:offset + length]
+
+    def get_block(self, number):
+        """
+        Decodifica e restituisce il blocco `number`.
+        """
+        return decode_block(self.read(number))
+
+    def append(self, data: bytes) -> int:
+        """
+        Aggiunge in coda un blocco codificato e restituisce il suo numero.
+        """
+        with self._lock:
+            if self.read_only:
+                raise IOError("Archivio aperto in sola lettura.")
+            if self._active_size and self._active_size + len(data) > self.segment_size:
+                self._segment_file.close()
+                self._active_segment += 1
+                self._active_size = 0
+                self._segment_file = open(self._segment_path(self._active_segment), "ab")
+
+            offset = self._active_size
+            self._segment_file.write(data)
+            self._segment_file.flush()
+            if self.fsync:
+                os.fsync(self._segment_file.fileno())
+
+            # L'indice è scritto dopo i dati: un record presente punta sempre a dati completi
+            self._index_file.write(self.INDEX_RECORD.pack(self._active_segment, offset, len(data)))
+            self._index_file.flush()
+            if self.fsync:
+                os.fsync(self._index_file.fileno())
+
+            self._active_size += len(data)
+            self._count += 1
+            return self._count - 1
+
+    def append_block(self, block) -> int:
+        return self.append(encode_block(block))
+
+    # --- Giornale dell'indice delle credenziali ---
+
+    def append_index_journal(self, data: bytes):
+        """
+        Accoda le voci dell'indice del prossimo blocco privo di voce nel giornale.
+        """
+        with self._lock:
+            if self.read_only:
+                raise IOError("Archivio aperto in sola lettura.")
+            self._journal_file.write(self.JOURNAL_LENGTH.pack(len(data)) + data)
+            self._journal_file.flush()
+            if self.fsync:
+                os.fsync(self._journal_file.fileno())
+
+    def read_index_journal(self):
+        """
+        Legge le voci del giornale, una per blocco a partire dalla genesi.
+        Record incompleti o relativi a blocchi non indicizzati (append interrotta)
+        vengono scartati; i blocchi senza voce restano da indicizzare al chiamante.
+
+        :return: lista dei record (bytes), al più uno per blocco presente
+        """
+        with self._lock:
+            try:
+                with open(self._journal_path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return []
+
+            records = []
+            offset = 0
+            header = self.JOURNAL_LENGTH.size
+            while len(records) < self._count and offset + header <= len(data):
+                (length,) = self.JOURNAL_LENGTH.unpack_from(data, offset)
+                if offset + header + length > len(data):
+                    break
+                records.append(data[offset + header:offset + header + length])
+                offset += header + length
+
+            if not self.read_only and offset != len(data):
+                self._journal_file.truncate(offset)
+            return records
+
+    def close(self):
+        with self._lock:
+            for mapped, _ in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            if self._index_map is not None:
+                self._index_map.close()
+                self._index_map = None
+            if self._segment_file is not None:
+                self._segment_file.close()
+            if self._journal_file is not None:
+                self._journal_file.close()
+            self._index_file.close()
+
+
+class StoredChain:
+    """
+    Vista a sequenza di una ChainStore, usata come `Blockchain.chain`.
+    I blocchi vengono decodificati solo quando richiesti e mantenuti in una piccola LRU,
+    condivisa tra i thread (produttore di blocchi, verificatori) e protetta da un lock.
+    """
+
+    def __init__(self, store, cache_size=1024):
+        self.store = store
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        with self._lock:
+            block = self._cache.get(item)
+            if block is not None:
+                self._cache.move_to_end(item)
+                return block
+        # Decodifica fuori dal lock: letture concorrenti di blocchi diversi non si attendono
+        block = self.store.get_block(item)
+        self._remember(item, block)
+        return block
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in range(len(self) - 1, -1, -1):
+            yield self[i]
+
+    def _remember(self, number, block):
+        with self._lock:
+            self._cache[number] = block
+            self._cache.move_to_end(number)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def append(self, block):
+        number = self.store.append_block(block)
+        self._remember(number, block)
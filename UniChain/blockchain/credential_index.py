@@ -0,0 +1,104 @@
+import struct
+
+from UniChain.blockchain.encoding import encode_value, decode_value
+
+_U32 = struct.Struct("<I")
+
+# Campi di una voce dell'indice, una per transazione del blocco
+ENTRY_FIELDS = ("credential_unique_id", "transaction_type", "issuer", "status_index", "merkle_root")
+
+RECORD_KEYS = ("issuance_block", "issuance_transaction", "merkle_root", "latest_transaction",
+               "latest_block", "revocation_block", "issuer", "status_index")
+
+
+def block_index_entries(block):
+    """
+    Effetti di un blocco sull'indice delle credenziali, nell'ordine delle transazioni.
+    Sono tutto ciò che serve per ricostruire l'indice senza decodificare il blocco.
+    """
+    return [(tx.credential_unique_id,
+             tx.transaction_type,
+             tx.issuer_id or block.block_proposer,
+             tx.status_index,
+             # Nei blocchi con più transazioni la root degli attributi è nella transazione
+             tx.attributes_merkle_root or block.attributes_merkle_root)
+            for tx in block.transactions]
+
+
+def encode_index_entries(entries) -> bytes:
+    """
+    Codifica binaria delle voci di un blocco (record del giornale dell'indice in ChainStore).
+    """
+    out = bytearray(_U32.pack(len(entries)))
+    for entry in entries:
+        for value in entry:
+            encode_value(out, value)
+    return bytes(out)
+
+
+def decode_index_entries(data):
+    (count,) = _U32.unpack_from(data, 0)
+    offset = _U32.size
+    entries = []
+    for _ in range(count):
+        entry = []
+        for _ in ENTRY_FIELDS:
+            value, offset = decode_value(data, offset)
+            entry.append(value)
+        entries.append(tuple(entry))
+    return entries
+
+
+class CredentialRecord:
+    """
+    Stato on-chain di una credenziale nell'indice della Blockchain.
+
+    Blocchi e transazioni sono memorizzati come posizioni (numero di blocco, indice
+    della transazione) e risolti sulla catena solo quando letti: dopo un avvio a
+    freddo l'indice si ricostruisce dal giornale persistito senza decodificare i blocchi.
+    Si legge come un dizionario con le chiavi di `RECORD_KEYS`.
+    """
+
+    __slots__ = ("_chain", "issuance", "latest", "revocation_number", "merkle_root", "issuer", "status_index")
+
+    def __init__(self, chain):
+        self._chain = chain
+        self.issuance = None            # (numero di blocco, posizione) dell'EMISSIONE
+        self.latest = None              # (numero di blocco, posizione) dell'ultima transazione
+        self.revocation_number = None   # numero dell'ultimo blocco di REVOCA
+        self.merkle_root = None
+        self.issuer = None
+        self.status_index = None
+
+    def _block(self, number):
+        return self._chain[number] if number is not None else None
+
+    def _transaction(self, position):
+        if position is None:
+            return None
+        number, index = position
+        return self._chain[number].transactions[index]
+
+    def __getitem__(self, key):
+        if key == "issuance_block":
+            return self._block(self.issuance[0] if self.issuance else None)
+        if key == "issuance_transaction":
+            return self._transaction(self.issuance)
+        if key == "latest_transaction":
+            return self._transaction(self.latest)
+        if key == "latest_block":
+            return self._block(self.latest[0] if self.latest else None)
+        if key == "revocation_block":
+            return self._block(self.revocation_number)
+        if key in ("merkle_root", "issuer", "status_index"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"CredentialRecord(emissione={self.issuance}, ultima={self.latest}, revoca={self.revocation_number})"
@@ -0,0 +1,297 @@
+"""
+Codifica binaria canonica di transazioni e blocchi UniChain.
+
+La codifica è deterministica e viene usata per calcolare gli hash, per produrre
+il payload da firmare e per la persistenza/trasmissione. Il formato JSON resta
+disponibile solo come vista di export (`to_dict`).
+
+Ogni campo è preceduto da un tag di un byte:
+- NONE:   nessun dato
+- DIGEST: 32 byte grezzi (hash SHA-256 rappresentato in esadecimale)
+- BYTES:  lunghezza (u32) + byte grezzi (es. firme rappresentate in esadecimale)
+- TEXT:   lunghezza (u32) + stringa UTF-8
+- BOOL:   un byte (0/1)
+- INT:    intero con segno a 64 bit
+
+Le stringhe esadecimali (in minuscolo) vengono memorizzate come byte grezzi,
+dimezzandone la dimensione; in decodifica sono restituite di nuovo in esadecimale.
+
+La suite di firma (`signature_suite`) è accodata dopo la firma solo se presente:
+transazioni e blocchi firmati prima della sua introduzione (RSA) mantengono la
+stessa codifica, e quindi lo stesso hash.
+
+Allo stesso modo i campi introdotti dopo la prima versione sono codificati solo
+quando valorizzati, con un byte di versione più alto: ogni versione ha il proprio
+elenco di campi (`TRANSACTION_FIELDS_BY_VERSION`, `BLOCK_FIELDS_BY_VERSION`).
+
+Dalla versione 2 l'intestazione del blocco è codificabile da sola
+(`encode_block_header`): hash e payload firmato del blocco sono calcolati sulla
+sola intestazione, che impegna le transazioni tramite `tx_root` (le foglie sono
+gli hash delle transazioni codificate per intero, firme comprese). Un light client
+può così verificare collegamenti e firme dei proponenti senza le transazioni.
+I blocchi di versione 1 restano impegnati dalla codifica completa.
+"""
+import struct
+
+ENCODING_VERSION = 1
+
+TAG_NONE = 0
+TAG_DIGEST = 1
+TAG_BYTES = 2
+TAG_TEXT = 3
+TAG_BOOL = 4
+TAG_INT = 5
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+
+TRANSACTION_FIELDS = (
+    "transaction_type",
+    "credential_hash",
+    "credential_unique_id",
+    "student_wallet_address",
+    "revocation_status",
+    "attributes_merkle_root",
+    "issuer_id",
+)
+
+# Versione 2: transazioni con indice nella status list dell'emittente
+TRANSACTION_FIELDS_BY_VERSION = {
+    1: TRANSACTION_FIELDS,
+    2: TRANSACTION_FIELDS + ("status_index",),
+}
+
+BLOCK_FIELDS = (
+    "version",
+    "previous_hash",
+    "timestamp",
+    "transaction_type",
+    "tx_root",
+    "hash_algorithm",
+    "block_number",
+    "validator_info",
+    "block_proposer",
+    "attributes_merkle_root",
+)
+
+# Versione 2: intestazione con la root del registro delle revoche (Sparse Merkle Tree)
+BLOCK_FIELDS_BY_VERSION = {
+    1: BLOCK_FIELDS,
+    2: BLOCK_FIELDS + ("revocation_root",),
+}
+HEADER_VERSION = 2
+
+
+def _as_raw_hex(value: str):
+    """
+    Restituisce i byte grezzi di una stringa esadecimale canonica, altrimenti None.
+    """
+    if len(value) % 2:
+        return None
+    try:
+        raw = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return raw if raw.hex() == value else None
+
+
+def encode_value(out: bytearray, value):
+    """
+    Aggiunge a `out` la codifica con tag di un singolo valore.
+    """
+    if value is None:
+        out.append(TAG_NONE)
+    elif isinstance(value, bool):
+        out.append(TAG_BOOL)
+        out.append(1 if value else 0)
+    elif isinstance(value, int):
+        out.append(TAG_INT)
+        out += _I64.pack(value)
+    elif isinstance(value, str):
+        raw = _as_raw_hex(value) if value else None
+        if raw is not None and len(raw) == 32:
+            out.append(TAG_DIGEST)
+            out += raw
+        elif raw is not None:
+            out.append(TAG_BYTES)
+            out += _U32.pack(len(raw))
+            out += raw
+        else:
+            data = value.encode("utf-8")
+            out.append(TAG_TEXT)
+            out += _U32.pack(len(data))
+            out += data
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(TAG_BYTES)
+        out += _U32.pack(len(value))
+        out += value
+    else:
+        raise TypeError(f"Tipo non codificabile: {type(value).__name__}")
+
+
+def decode_value(data, offset):
+    """
+    Decodifica un valore a partire da `offset`.
+
+    :return: (valore, nuovo offset)
+    """
+    tag = data[offset]
+    offset += 1
+    if tag == TAG_NONE:
+        return None, offset
+    if tag == TAG_BOOL:
+        return data[offset] == 1, offset + 1
+    if tag == TAG_INT:
+        return _I64.unpack_from(data, offset)[0], offset + _I64.size
+    if tag == TAG_DIGEST:
+        return bytes(data[offset:offset + 32]).hex(), offset + 32
+    if tag in (TAG_BYTES, TAG_TEXT):
+        (length,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        raw = bytes(data[offset:offset + length])
+        return (raw.hex() if tag == TAG_BYTES else raw.decode("utf-8")), offset + length
+    raise ValueError(f"Tag di codifica sconosciuto: {tag}")
+
+
+def _encode_fields(out, source, fields):
+    for field in fields:
+        encode_value(out, getattr(source, field))
+
+
+def _decode_fields(data, offset, fields):
+    values = {}
+    for field in fields:
+        values[field], offset = decode_value(data, offset)
+    return values, offset
+
+
+def _encode_suite(out, source):
+    suite = getattr(source, "signature_suite", None)
+    if suite is not None:
+        encode_value(out, suite)
+
+
+def _decode_suite(data, offset, end):
+    """
+    Legge la suite di firma opzionale accodata dopo la firma.
+    """
+    if offset >= end:
+        return None, offset
+    return decode_value(data, offset)
+
+
+# --- Transazioni ---
+
+def encode_transaction(transaction, include_hash=True, include_signature=True) -> bytes:
+    """
+    Codifica canonica di una transazione.
+    Senza hash e firma è il contenuto su cui si calcola `transaction_hash`.
+    """
+    version = 2 if getattr(transaction, "status_index", None) is not None else ENCODING_VERSION
+    out = bytearray([version])
+    _encode_fields(out, transaction, TRANSACTION_FIELDS_BY_VERSION[version])
+    if include_hash:
+        encode_value(out, transaction.transaction_hash)
+    if include_signature:
+        encode_value(out, transaction.signature)
+        _encode_suite(out, transaction)
+    return bytes(out)
+
+
+def decode_transaction(data, offset=0):
+    """
+    Decodifica una transazione completa (con hash e firma).
+
+    :return: (dizionario nel formato di Transaction.to_dict, nuovo offset)
+    """
+    fields = TRANSACTION_FIELDS_BY_VERSION.get(data[offset])
+    if fields is None:
+        raise ValueError(f"Versione di codifica non supportata: {data[offset]}")
+    values, offset = _decode_fields(data, offset + 1, fields)
+    values["transaction_hash"], offset = decode_value(data, offset)
+    values["signature"], offset = decode_value(data, offset)
+    values["signature_suite"], offset = _decode_suite(data, offset, len(data))
+    return values, offset
+
+
+# --- Blocchi ---
+
+def has_standalone_header(block) -> bool:
+    """
+    True se il blocco (o l'intestazione) usa la codifica di versione 2,
+    con hash e firma calcolati sulla sola intestazione.
+    """
+    return getattr(block, "revocation_root", None) is not None
+
+
+def encode_block_header(block, include_signature=True) -> bytes:
+    """
+    Codifica canonica dell'intestazione di un blocco di versione 2 (senza transazioni).
+    Senza firma è il payload firmato dal proponente.
+    """
+    if not has_standalone_header(block):
+        raise ValueError(f"Il blocco #{block.block_number} non ha un'intestazione autonoma (versione 1).")
+    out = bytearray([HEADER_VERSION])
+    _encode_fields(out, block, BLOCK_FIELDS_BY_VERSION[HEADER_VERSION])
+    if include_signature:
+        encode_value(out, block.signature)
+        _encode_suite(out, block)
+    return bytes(out)
+
+
+def decode_block_header(data):
+    """
+    Decodifica un'intestazione prodotta da `encode_block_header`.
+
+    :return: dizionario con i campi dell'intestazione, firma e suite
+    """
+    if data[0] != HEADER_VERSION:
+        raise ValueError(f"Versione di intestazione non supportata: {data[0]}")
+    values, offset = _decode_fields(data, 1, BLOCK_FIELDS_BY_VERSION[HEADER_VERSION])
+    values["signature"], offset = decode_value(data, offset)
+    values["signature_suite"], offset = _decode_suite(data, offset, len(data))
+    return values
+
+
+def encode_block(block, include_signature=True) -> bytes:
+    """
+    Codifica canonica di un blocco con tutte le sue transazioni (persistenza e trasmissione).
+    Per i blocchi di versione 1, senza firma è il payload firmato dal proponente.
+    """
+    version = HEADER_VERSION if has_standalone_header(block) else ENCODING_VERSION
+    out = bytearray([version])
+    _encode_fields(out, block, BLOCK_FIELDS_BY_VERSION[version])
+    out += _U32.pack(len(block.transactions))
+    for tx in block.transactions:
+        encoded = encode_transaction(tx)
+        out += _U32.pack(len(encoded))
+        out += encoded
+    if include_signature:
+        encode_value(out, block.signature)
+        _encode_suite(out, block)
+    return bytes(out)
+
+
+def decode_block(data):
+    """
+    Decodifica un blocco completo.
+
+    :return: dizionario nel formato di Block.to_dict
+    """
+    fields = BLOCK_FIELDS_BY_VERSION.get(data[0])
+    if fields is None:
+        raise ValueError(f"Versione di codifica non supportata: {data[0]}")
+    values, offset = _decode_fields(data, 1, fields)
+    (count,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    transactions = []
+    for _ in range(count):
+        (length,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        tx, _ = decode_transaction(data[offset:offset + length])
+        transactions.append(tx)
+        offset += length
+    values["transactions"] = transactions
+    values["signature"], offset = decode_value(data, offset)
+    values["signature_suite"], offset = _decode_suite(data, offset, len(data))
+    return values
@@ -0,0 +1,180 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class Mempool:
+    """
+    Pool delle transazioni in attesa di essere incluse in un blocco.
+
+    Caratteristiche:
+    - deduplicazione per hash della transazione e per credential_unique_id
+      (al più una transazione pendente per credenziale);
+    - priorità delle REVOCA rispetto alle EMISSIONE, FIFO a parità di tipo;
+    - limite di dimensione: a pool piena una REVOCA sostituisce l'EMISSIONE più recente;
+    - limite di età: le transazioni più vecchie di `max_age` secondi vengono scartate;
+      le transazioni reinserite con `requeue` conservano l'istante di arrivo originale.
+    """
+
+    PRIORITY = {"REVOCA": 0, "EMISSIONE": 1}
+
+    def __init__(self, max_size=10000, max_age=3600.0):
+        """
+        :param max_size: numero massimo di transazioni pendenti
+        :param max_age: età massima (in secondi) di una transazione pendente
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+
+        self._heap = []             # (priorità, sequenza, entry)
+        self._age_heap = []         # (istante di arrivo, sequenza, entry)
+        self._taken = {}            # transaction_hash → (arrivo, estrazione) delle transazioni estratte
+        self._by_hash = {}          # transaction_hash → entry
+        self._by_credential = {}    # credential_unique_id → entry
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._by_hash)
+
+    def __contains__(self, transaction_hash):
+        with self._lock:
+            return transaction_hash in self._by_hash
+
+    def add(self, transaction, received_at=None) -> bool:
+        """
+        Inserisce una transazione nella pool.
+
+        :param received_at: istante di arrivo (time.monotonic) da conservare, per le reinserzioni
+        :return: True se inserita, False se duplicata o già scaduta
+        :raises ValueError: se la pool è piena e la transazione non può sostituirne un'altra
+        """
+        with self._lock:
+            self._expire()
+
+            if received_at is not None and self.max_age is not None \
+                    and received_at < time.monotonic() - self.max_age:
+                print(f"[Mempool] Transazione per {transaction.credential_unique_id} scaduta.")
+                return False
+
+            if transaction.transaction_hash in self._by_hash:
+                print(f"[Mempool] Transazione {transaction.transaction_hash[:16]}... già presente.")
+                return False
+            if transaction.credential_unique_id in self._by_credential:
+                print(f"[Mempool] Esiste già una transazione pendente per {transaction.credential_unique_id}.")
+                return False
+
+            if len(self._by_hash) >= self.max_size:
+                if transaction.transaction_type != "REVOCA" or not self._evict_newest_issuance():
+                    raise ValueError("[Mempool] Pool piena: transazione rifiutata.")
+
+            entry = {
+                "transaction": transaction,
+                "received_at": received_at if received_at is not None else time.monotonic(),
+                "removed": False,
+            }
+            if len(self._heap) > 2 * len(self._by_hash) + 64:
+                # Compattazione delle voci rimosse in modo lazy
+                self._heap = [item for item in self._heap if not item[2]["removed"]]
+                heapq.heapify(self._heap)
+                self._age_heap = [item for item in self._age_heap if not item[2]["removed"]]
+                heapq.heapify(self._age_heap)
+
+            priority = self.PRIORITY.get(transaction.transaction_type, len(self.PRIORITY))
+            sequence = next(self._sequence)
+            heapq.heappush(self._heap, (priority, sequence, entry))
+            heapq.heappush(self._age_heap, (entry["received_at"], sequence, entry))
+            self._by_hash[transaction.transaction_hash] = entry
+            self._by_credential[transaction.credential_unique_id] = entry
+            return True
+
+    def pop_batch(self, max_count):
+        """
+        Estrae fino a `max_count` transazioni in ordine di priorità.
+        """
+        batch = []
+        with self._lock:
+            self._expire()
+            while self._heap and len(batch) < max_count:
+                _, _, entry = heapq.heappop(self._heap)
+                if entry["removed"]:
+                    continue
+                self._discard(entry)
+                if self.max_age is not None:
+                    self._taken[entry["transaction"].transaction_hash] = (entry["received_at"], time.monotonic())
+                batch.append(entry["transaction"])
+        return batch
+
+    def requeue(self, transactions):
+        """
+        Reinserisce transazioni estratte ma non finalizzate (es. consenso fallito),
+        con l'istante di arrivo originale: continuano a scadere dopo `max_age`.
+        """
+        for tx in transactions:
+            with self._lock:
+                received_at, _ = self._taken.pop(tx.transaction_hash, (None, None))
+            try:
+                self.add(tx, received_at=received_at)
+            except ValueError as e:
+                print(e)
+
+    def oldest_age(self) -> float:
+        """
+        Età in secondi della transazione pendente più vecchia (0 se la pool è vuota).
+        """
+        with self._lock:
+            while self._age_heap and self._age_heap[0][2]["removed"]:
+                heapq.heappop(self._age_heap)
+            if not self._age_heap:
+                return 0.0
+            return time.monotonic() - self._age_heap[0][0]
+
+    def snapshot(self):
+        """
+        Restituisce la lista delle transazioni pendenti in ordine di priorità.
+        """
+        with self._lock:
+            return [entry["transaction"] for _, _, entry in sorted(self._heap, key=lambda item: item[:2])
+                    if not entry["removed"]]
+
+    def _discard(self, entry):
+        entry["removed"] = True
+        tx = entry["transaction"]
+        self._by_hash.pop(tx.transaction_hash, None)
+        self._by_credential.pop(tx.credential_unique_id, None)
+
+    def _expire(self):
+        """
+        Scarta le transazioni più vecchie di `max_age` secondi.
+        """
+        if self.max_age is None:
+            return
+        deadline = time.monotonic() - self.max_age
+        while self._age_heap and self._age_heap[0][0] < deadline:
+            _, _, entry = heapq.heappop(self._age_heap)
+            if entry["removed"]:
+                continue
+            print(f"[Mempool] Transazione per {entry['transaction'].credential_unique_id} scaduta.")
+            self._discard(entry)
+        # Gli istanti delle transazioni estratte servono solo finché non scadrebbero:
+        # sono in ordine di estrazione e l'arrivo precede sempre l'estrazione
+        while self._taken:
+            tx_hash, (_, taken_at) = next(iter(self._taken.items()))
+            if taken_at >= deadline:
+                break
+            del self._taken[tx_hash]
+
+    def _evict_newest_issuance(self) -> bool:
+        """
+        Libera un posto scartando l'EMISSIONE pendente ricevuta più di recente.
+        """
+        issuances = [entry for entry in self._by_hash.values()
+                     if entry["transaction"].transaction_type == "EMISSIONE"]
+        if not issuances:
+            return False
+        newest = max(issuances, key=lambda entry: entry["received_at"])
+        print(f"[Mempool] Pool piena: EMISSIONE per {newest['transaction'].credential_unique_id} scartata.")
+        self._discard(newest)
+        return True
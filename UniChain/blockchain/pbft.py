@@ -0,0 +1,351 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PBFTMessage:
+    """
+    Messaggio scambiato tra le repliche PBFT (PRE-PREPARE, PREPARE o COMMIT).
+    """
+    __slots__ = ("phase", "sequence", "digest", "sender", "proposal")
+
+    def __init__(self, phase, sequence, digest, sender, proposal=None):
+        self.phase = phase
+        self.sequence = sequence
+        self.digest = digest
+        self.sender = sender
+        self.proposal = proposal
+
+    def __repr__(self):
+        return f"PBFTMessage({self.phase}, seq={self.sequence}, from={self.sender})"
+
+
+class PBFTReplica:
+    """
+    Replica PBFT eseguita come task asyncio.
+    Riceve i messaggi dalla propria coda, valida la proposta del Primary e
+    avanza le fasi Pre-prepare → Prepare → Commit per ogni numero di sequenza.
+    """
+
+    def __init__(self, replica_id, official_name, engine, validate=None):
+        """
+        :param replica_id: university_id della replica
+        :param official_name: nome ufficiale (per i log)
+        :param engine: PBFTEngine che instrada i messaggi
+        :param validate: funzione (replica_id, proposal) → bool usata in fase Pre-prepare
+        """
+        self.replica_id = replica_id
+        self.official_name = official_name
+        self.engine = engine
+        self.validate = validate
+        self.inbox = asyncio.Queue()
+        self._state = {}
+
+    def _sequence_state(self, sequence):
+        return self._state.setdefault(sequence, {
+            "digest": None,
+            "prepares": {},     # digest → mittenti dei PREPARE
+            "commits": {},      # digest → mittenti dei COMMIT
+            "prepared": False,
+            "committed": False,
+        })
+
+    async def run(self):
+        while True:
+            message = await self.inbox.get()
+            await self.handle(message)
+
+    async def handle(self, message):
+        state = self._sequence_state(message.sequence)
+
+        if message.phase == "PRE-PREPARE":
+            if state["digest"] is not None:
+                return
+            try:
+                accepted = self.validate(self.replica_id, message.proposal) if self.validate else True
+            except Exception as e:
+                print(f"[PBFT] {self.official_name} → validazione fallita: {e}")
+                accepted = False
+            if not accepted:
+                self.engine.report_reject(message.sequence, self.replica_id)
+                return
+            state["digest"] = message.digest
+            self.engine.report_pre_prepared(message.sequence, self.replica_id)
+            # Il Primary non invia PREPARE: il suo PRE-PREPARE vale come voto
+            if message.sender != self.replica_id:
+                self.engine.broadcast(PBFTMessage("PREPARE", message.sequence, message.digest, self.replica_id))
+
+        elif message.phase == "PREPARE":
+            state["prepares"].setdefault(message.digest, set()).add(message.sender)
+        elif message.phase == "COMMIT":
+            state["commits"].setdefault(message.digest, set()).add(message.sender)
+
+        self._advance(message.sequence, state)
+
+    def _advance(self, sequence, state):
+        digest = state["digest"]
+        if digest is None:
+            return
+
+        quorum = self.engine.quorum
+        if not state["prepared"]:
+            prepares = len(state["prepares"].get(digest, ()))
+            # 2f PREPARE concordi + il PRE-PREPARE del Primary
+            if prepares >= quorum - 1:
+                state["prepared"] = True
+                self.engine.report_prepared(sequence, self.replica_id)
+                self.engine.broadcast(PBFTMessage("COMMIT", sequence, digest, self.replica_id))
+
+        if state["prepared"] and not state["committed"]:
+            commits = len(state["commits"].get(digest, ()))
+            if commits >= quorum:
+                state["committed"] = True
+                self.engine.report_committed(sequence, self.replica_id)
+
+
+class PBFTEngine:
+    """
+    Motore di consenso PBFT asincrono basato su scambio di messaggi.
+
+    Ogni università accreditata esegue una replica come task asyncio; i messaggi
+    viaggiano su code in-process con una latenza di collegamento simulabile.
+    Più numeri di sequenza possono essere in volo contemporaneamente (pipelining),
+    fino a `max_in_flight`, quando le proposte sono indipendenti (es. `benchmark`):
+    `Blockchain.add_block` finalizza invece un blocco per round, perché ogni blocco
+    è collegato all'hash del precedente. Per ogni sequenza vengono misurate le
+    latenze delle fasi Pre-prepare, Prepare e Commit.
+    """
+
+    def __init__(self, link_latency=0.0, latency_jitter=0.0, max_in_flight=4, timeout=10.0):
+        """
+        :param link_latency: latenza simulata (secondi) di ogni messaggio
+        :param latency_jitter: variazione casuale massima (secondi) aggiunta alla latenza
+        :param max_in_flight: numero massimo di sequenze in consenso contemporaneamente
+        :param timeout: tempo massimo (secondi) per finalizzare una sequenza
+        """
+        self.link_latency = link_latency
+        self.latency_jitter = latency_jitter
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+
+        self.replicas = {}
+        self.quorum = 0
+        self.faulty = 0
+        self.messages_sent = 0
+        self._pending_deliveries = 0
+        self._rounds = {}
+        self._loop = None
+
+    @staticmethod
+    def quorum_size(n):
+        """
+        Restituisce (f, quorum) per n repliche: f = ⌊(n-1)/3⌋, quorum = 2f+1.
+        """
+        f = (n - 1) // 3
+        return f, 2 * f + 1
+
+    # --- Instradamento dei messaggi ---
+
+    def _deliver(self, replica, message):
+        delay = self.link_latency
+        if self.latency_jitter:
+            delay += random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            self._pending_deliveries += 1
+            self._loop.call_later(delay, self._delivered, replica, message)
+        else:
+            replica.inbox.put_nowait(message)
+
+    def _delivered(self, replica, message):
+        self._pending_deliveries -= 1
+        replica.inbox.put_nowait(message)
+
+    def broadcast(self, message):
+        """
+        Invia il messaggio a tutte le repliche (mittente incluso).
+        """
+        for replica in self.replicas.values():
+            self.messages_sent += 1
+            if replica.replica_id == message.sender:
+                replica.inbox.put_nowait(message)
+            else:
+                self._deliver(replica, message)
+
+    # --- Notifiche di avanzamento delle repliche ---
+
+    def _now(self):
+        return time.perf_counter()
+
+    def report_pre_prepared(self, sequence, replica_id):
+        round_state = self._rounds[sequence]
+        round_state["pre_prepared"].add(replica_id)
+        if len(round_state["pre_prepared"]) == self.quorum:
+            round_state["t_pre_prepare"] = self._now()
+
+    def report_prepared(self, sequence, replica_id):
+        round_state = self._rounds[sequence]
+        round_state["prepared"].add(replica_id)
+        if len(round_state["prepared"]) == self.quorum:
+            round_state["t_prepare"] = self._now()
+
+    def report_committed(self, sequence, replica_id):
+        round_state = self._rounds[sequence]
+        round_state["committed"].add(replica_id)
+        if len(round_state["committed"]) == self.quorum:
+            round_state["t_commit"] = self._now()
+            if not round_state["done"].done():
+                round_state["done"].set_result(True)
+
+    def report_reject(self, sequence, replica_id):
+        round_state = self._rounds[sequence]
+        round_state["rejected"].add(replica_id)
+        # Il quorum non è più raggiungibile
+        if len(self.replicas) - len(round_state["rejected"]) < self.quorum and not round_state["done"].done():
+            round_state["done"].set_result(False)
+
+    # --- Esecuzione del consenso ---
+
+    async def _run_sequence(self, sequence, primary_id, proposal, digest, semaphore):
+        async with semaphore:
+            round_state = {
+                "pre_prepared": set(),
+                "prepared": set(),
+                "committed": set(),
+                "rejected": set(),
+                "done": self._loop.create_future(),
+                "digest": digest,
+                "t_start": self._now(),
+            }
+            self._rounds[sequence] = round_state
+
+            self.broadcast(PBFTMessage("PRE-PREPARE", sequence, digest, primary_id, proposal))
+            try:
+                committed = await asyncio.wait_for(asyncio.shield(round_state["done"]), self.timeout)
+            except asyncio.TimeoutError:
+                committed = False
+
+            round_state["committed_quorum"] = committed
+
+    def _round_result(self, sequence):
+        round_state = self._rounds[sequence]
+        t_start = round_state["t_start"]
+        t_pre = round_state.get("t_pre_prepare")
+        t_prep = round_state.get("t_prepare")
+        t_comm = round_state.get("t_commit")
+        return {
+            "sequence": sequence,
+            "digest": round_state["digest"],
+            "committed": round_state["committed_quorum"],
+            "pre_prepared": set(round_state["pre_prepared"]),
+            "prepared": set(round_state["prepared"]),
+            "commit_votes": set(round_state["committed"]),
+            "rejected": set(round_state["rejected"]),
+            "phase_latency_ms": {
+                "pre_prepare": (t_pre - t_start) * 1000 if t_pre else None,
+                "prepare": (t_prep - t_pre) * 1000 if t_prep and t_pre else None,
+                "commit": (t_comm - t_prep) * 1000 if t_comm and t_prep else None,
+            },
+            "total_ms": (t_comm - t_start) * 1000 if t_comm else None,
+            "started_at": t_start,
+            "committed_at": t_comm,
+        }
+
+    async def _drain(self):
+        """
+        Attende la consegna dei messaggi ancora in viaggio, così che i voti
+        riportati includano anche le repliche arrivate dopo il quorum.
+        """
+        deadline = self._now() + self.timeout
+        while self._now() < deadline and (
+                self._pending_deliveries or any(not r.inbox.empty() for r in self.replicas.values())):
+            await asyncio.sleep(self.link_latency)
+
+    async def run_async(self, replicas, primary_id, proposals, validate=None, first_sequence=0):
+        """
+        Esegue il consenso su una o più proposte, in pipeline.
+
+        :param replicas: lista di coppie (university_id, official_name) delle repliche attive
+        :param primary_id: university_id del Primary (proponente)
+        :param proposals: lista di coppie (proposta, digest)
+        :param validate: funzione (replica_id, proposta) → bool eseguita da ogni replica
+        :param first_sequence: numero di sequenza della prima proposta
+        :return: lista dei risultati per sequenza, nello stesso ordine delle proposte
+        """
+        self._loop = asyncio.get_running_loop()
+        self.replicas = {rid: PBFTReplica(rid, name, self, validate) for rid, name in replicas}
+        if primary_id not in self.replicas:
+            raise ValueError(f"[PBFT] Il Primary {primary_id} non è tra le repliche attive.")
+        self.faulty, self.quorum = self.quorum_size(len(self.replicas))
+        self._rounds = {}
+        self.messages_sent = 0
+        self._pending_deliveries = 0
+
+        tasks = [asyncio.create_task(replica.run()) for replica in self.replicas.values()]
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        try:
+            await asyncio.gather(*[
+                self._run_sequence(first_sequence + i, primary_id, proposal, digest, semaphore)
+                for i, (proposal, digest) in enumerate(proposals)
+            ])
+            await self._drain()
+            return [self._round_result(first_sequence + i) for i in range(len(proposals))]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self, replicas, primary_id, proposals, validate=None, first_sequence=0):
+        """
+        Versione sincrona di `run_async` (usata da `Blockchain.add_block`).
+
+        Se il thread chiamante sta già eseguendo un event loop (es. add_block invocato
+        da codice asyncio) il consenso gira su un loop dedicato in un thread separato
+        e il chiamante resta bloccato fino all'esito: dal codice asincrono è preferibile
+        attendere direttamente `run_async`.
+        """
+        consensus = self.run_async(replicas, primary_id, proposals, validate, first_sequence)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(consensus)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, consensus).result()
+
+    # --- Misure di prestazione ---
+
+    @classmethod
+    def benchmark(cls, replica_counts=(4, 10, 25, 50, 100), sequences=10, link_latency=0.001,
+                  latency_jitter=0.0005, max_in_flight=4):
+        """
+        Misura latenza per fase e throughput del consenso al variare del numero di repliche.
+
+        :return: lista di dizionari, uno per ciascun valore di N
+        """
+        report = []
+        for n in replica_counts:
+            engine = cls(link_latency=link_latency, latency_jitter=latency_jitter, max_in_flight=max_in_flight)
+            replicas = [(f"replica-{i}", f"Replica {i}") for i in range(n)]
+            proposals = [(None, f"digest-{seq}") for seq in range(sequences)]
+
+            results = engine.run(replicas, replicas[0][0], proposals)
+            committed = [r for r in results if r["committed"]]
+            elapsed = (max(r["committed_at"] for r in committed) - min(r["started_at"] for r in results)
+                       if committed else 0)
+
+            def average(phase):
+                values = [r["phase_latency_ms"][phase] for r in committed]
+                return sum(values) / len(values) if values else None
+
+            report.append({
+                "replicas": n,
+                "faulty": engine.faulty,
+                "quorum": engine.quorum,
+                "committed": len(committed),
+                "pre_prepare_ms": average("pre_prepare"),
+                "prepare_ms": average("prepare"),
+                "commit_ms": average("commit"),
+                "throughput": len(committed) / elapsed if elapsed else None,
+                "messages": engine.messages_sent,
+            })
+        return report
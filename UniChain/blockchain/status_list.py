@@ -0,0 +1,130 @@
+import base64
+import gzip
+import json
+from datetime import datetime, UTC
+
+from UniChain.utils.crypto_suite import verify_with_pem
+
+# 16 KiB non compressi (131.072 credenziali): dimensione minima raccomandata da
+# W3C StatusList per non rendere riconoscibile il singolo titolare
+DEFAULT_SIZE = 131072
+
+
+class StatusList:
+    """
+    Status list di revoca di un'università emittente, nello stile W3C StatusList:
+    una stringa di bit in cui il bit `i` vale 1 se la credenziale con
+    `status_index == i` è stata revocata. Il bit 0 è il più significativo del primo byte.
+
+    La lista viene pubblicata compressa (gzip + base64) e firmata dall'emittente:
+    un verificatore offline controlla la revoca con la lettura di un solo bit.
+    """
+
+    def __init__(self, issuer_id: str, size: int = DEFAULT_SIZE, bits: bytes = None):
+        """
+        :param issuer_id: university_id dell'emittente
+        :param size: numero di bit (multiplo di 8, anche 0); la lista cresce se necessario
+        :param bits: contenuto iniziale (es. lista decodificata da una pubblicazione)
+        """
+        if size < 0 or size % 8:
+            raise ValueError("La dimensione della status list deve essere un multiplo non negativo di 8.")
+        self.issuer_id = issuer_id
+        self._bits = bytearray(bits) if bits is not None else bytearray(size // 8)
+
+    @property
+    def size(self) -> int:
+        return len(self._bits) * 8
+
+    def _check_index(self, index: int):
+        if not isinstance(index, int) or index < 0:
+            raise ValueError(f"Indice di status list non valido: {index}")
+
+    def set_revoked(self, index: int, revoked: bool = True):
+        """
+        Imposta il bit della credenziale; se l'indice eccede la dimensione la lista
+        raddoppia (o cresce fino all'indice, se non basta o se è vuota).
+        """
+        self._check_index(index)
+        if index >= self.size:
+            needed = index // 8 + 1 - len(self._bits)
+            self._bits.extend(bytes(max(needed, len(self._bits))))
+        mask = 0x80 >> (index % 8)
+        if revoked:
+            self._bits[index // 8] |= mask
+        else:
+            self._bits[index // 8] &= ~mask
+
+    def is_revoked(self, index: int) -> bool:
+        self._check_index(index)
+        if index >= self.size:
+            return False
+        return bool(self._bits[index // 8] & (0x80 >> (index % 8)))
+
+    def encode(self) -> str:
+        """
+        Lista compressa: base64 (URL-safe, senza padding) del gzip della stringa di bit.
+        """
+        compressed = gzip.compress(bytes(self._bits), compresslevel=9, mtime=0)
+        return base64.urlsafe_b64encode(compressed).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, issuer_id: str, encoded_list: str) -> "StatusList":
+        padding = "=" * (-len(encoded_list) % 4)
+        bits = gzip.decompress(base64.urlsafe_b64decode(encoded_list + padding))
+        return cls(issuer_id, size=len(bits) * 8, bits=bits)
+
+    def copy(self) -> "StatusList":
+        return StatusList(self.issuer_id, size=self.size, bits=self._bits)
+
+    # --- Pubblicazione firmata ---
+
+    @staticmethod
+    def _payload(publication: dict) -> bytes:
+        """
+        Contenuto firmato: JSON canonico della pubblicazione senza firma.
+        """
+        unsigned = {k: v for k, v in publication.items() if k not in ("signature", "signatureSuite")}
+        return json.dumps(unsigned, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def publish(self, university, block_number: int) -> dict:
+        """
+        Produce la pubblicazione firmata dall'università emittente.
+
+        :param university: oggetto University dell'emittente (firma con la propria suite)
+        :param block_number: altezza della catena a cui la lista è aggiornata
+        :return: dizionario JSON-serializzabile (pochi KiB anche con centinaia di migliaia di bit)
+        """
+        if university.university_id != self.issuer_id:
+            raise ValueError("La status list deve essere firmata dall'università emittente.")
+        publication = {
+            "type": "StatusList",
+            "statusPurpose": "revocation",
+            "issuer": self.issuer_id,
+            "blockNumber": block_number,
+            "validFrom": datetime.now(UTC).isoformat(),
+            "size": self.size,
+            "encodedList": self.encode(),
+        }
+        publication["signature"] = university.sign_message(self._payload(publication)).hex()
+        publication["signatureSuite"] = university.get_crypto_suite().name
+        return publication
+
+    @staticmethod
+    def verify_publication(publication: dict, issuer_public_key_pem: str) -> bool:
+        """
+        Verifica la firma dell'emittente su una status list pubblicata.
+        """
+        try:
+            return verify_with_pem(issuer_public_key_pem,
+                                   bytes.fromhex(publication["signature"]),
+                                   StatusList._payload(publication),
+                                   publication.get("signatureSuite"))
+        except (KeyError, ValueError, TypeError):
+            return False
+
+    @classmethod
+    def from_publication(cls, publication: dict) -> "StatusList":
+        return cls.decode(publication["issuer"], publication["encodedList"])
+
+    def __repr__(self):
+        return f"StatusList({self.issuer_id}, size={self.size})"
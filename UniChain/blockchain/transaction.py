@@ -1,8 +1,7 @@
 import hashlib
-import json
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.exceptions import InvalidSignature
+
+from UniChain.blockchain.encoding import encode_transaction
+from UniChain.utils.crypto_suite import suite_for_key, verify_with_pem
 
 class Transaction:
     """
@@ -17,14 +16,19 @@ class Transaction:
     - un identificativo univoco della credenziale (credential_unique_id),
     - l’indirizzo del wallet dello studente (hash della chiave pubblica),
     - lo stato di revoca (revocation_status),
+    - la Merkle Root degli attributi del CAD (attributes_merkle_root, opzionale),
+    - l'identificativo dell'università firmataria (issuer_id, opzionale),
+    - l'indice nella status list di revoca dell'emittente (status_index, opzionale),
     - un hash identificativo della transazione stessa (transaction_hash),
-    - una firma digitale RSA (signature) calcolata sull’hash della transazione.
+    - una firma digitale (signature) calcolata sull’hash della transazione,
+    - la suite crittografica usata per la firma (signature_suite).
 
     La firma può essere verificata tramite la chiave pubblica dell’ente firmatario.
     """
 
     def __init__(self, credential_hash, credential_unique_id, student_wallet_address,
-                 revocation_status=False, transaction_type="EMISSIONE"):
+                 revocation_status=False, transaction_type="EMISSIONE", attributes_merkle_root=None,
+                 issuer_id=None, status_index=None):
         """
         Inizializza una transazione per l’emissione o la revoca di una credenziale.
 
@@ -33,41 +37,60 @@ class Transaction:
         :param student_wallet_address: indirizzo hashato del wallet dello studente
         :param revocation_status: True se è una revoca, False se è un’emissione
         :param transaction_type: "EMISSIONE" o "REVOCA"
+        :param attributes_merkle_root: Merkle Root degli attributi del CAD, necessaria
+                                       quando più transazioni condividono lo stesso blocco
+        :param issuer_id: university_id dell'università che firma la transazione; se assente
+                          la firma è verificata con la chiave del proponente del blocco
+        :param status_index: posizione della credenziale nella status list di revoca
+                             dell'emittente (opzionale, vedi `Blockchain.allocate_status_index`)
         """
         self.transaction_type = transaction_type
         self.credential_hash = credential_hash
         self.credential_unique_id = credential_unique_id
         self.student_wallet_address = student_wallet_address
         self.revocation_status = revocation_status
+        self.attributes_merkle_root = attributes_merkle_root
+        self.issuer_id = issuer_id
+        self.status_index = status_index
 
-        self.signature = None  # Firma RSA in esadecimale
+        self.signature = None  # Firma in esadecimale
+        self.signature_suite = None  # Nome della suite di firma (None = RSA storico)
         self.transaction_hash = None
         self.calculate_transaction_hash()
 
     def calculate_transaction_hash(self):
         """
-        Calcola l'hash della transazione a partire dai suoi attributi.
+        Calcola l'hash della transazione a partire dalla sua codifica binaria canonica.
         Esclude la firma. Usato anche per la firma digitale.
         """
-        transaction_string = json.dumps(self.to_dict(include_signature=False), sort_keys=True)
-        self.transaction_hash = hashlib.sha256(transaction_string.encode('utf-8')).hexdigest()
+        payload = encode_transaction(self, include_hash=False, include_signature=False)
+        self.transaction_hash = hashlib.sha256(payload).hexdigest()
+
+    def calculate_signed_hash(self) -> str:
+        """
+        Hash della codifica completa della transazione, inclusi firma e suite.
+        È la foglia impegnata da `tx_root` nei blocchi di versione 2: l'intestazione
+        impegna così anche le firme, escluse da `transaction_hash`.
+        """
+        return hashlib.sha256(encode_transaction(self)).hexdigest()
 
     def sign_transaction(self, private_key):
         """
-        Firma realmente la transazione con una chiave privata RSA.
+        Firma la transazione con la chiave privata dell'emittente.
+        La suite (RSA, Ed25519, ECDSA P-256) è dedotta dal tipo di chiave e registrata.
 
-        :param private_key: oggetto RSAPrivateKey (già caricato)
+        :param private_key: chiave privata già caricata
         """
-        payload = self.transaction_hash.encode("utf-8")
-        self.signature = private_key.sign(
-            payload,
-            padding.PKCS1v15(),
-            hashes.SHA256()
-        ).hex()
+        suite = suite_for_key(private_key)
+        # Si firma il digest grezzo (32 byte) della transazione
+        payload = bytes.fromhex(self.transaction_hash)
+        self.signature = suite.sign(private_key, payload).hex()
+        self.signature_suite = suite.name
 
     def verify_signature(self, public_key_pem) -> bool:
         """
-        Verifica che la firma RSA sia valida rispetto all’hash della transazione.
+        Verifica che la firma sia valida rispetto all’hash della transazione,
+        usando la suite della chiave pubblica (che deve coincidere con quella registrata).
 
         :param public_key_pem: chiave pubblica dell’università in formato PEM
         :return: True se valida, False altrimenti
@@ -76,16 +99,10 @@ class Transaction:
             return False
 
         try:
-            public_key = serialization.load_pem_public_key(public_key_pem.encode("utf-8"))
-            public_key.verify(
-                bytes.fromhex(self.signature),
-                self.transaction_hash.encode("utf-8"),
-                padding.PKCS1v15(),
-                hashes.SHA256()
-            )
-            return True
-        except InvalidSignature:
-            return False
+            return verify_with_pem(public_key_pem,
+                                   bytes.fromhex(self.signature),
+                                   bytes.fromhex(self.transaction_hash),
+                                   self.signature_suite)
         except Exception as e:
             print("Errore nella verifica firma:", e)
             return False
@@ -103,12 +120,37 @@ class Transaction:
             "credential_unique_id": self.credential_unique_id,
             "student_wallet_address": self.student_wallet_address,
             "revocation_status": self.revocation_status,
+            "attributes_merkle_root": self.attributes_merkle_root,
+            "issuer_id": self.issuer_id,
+            "status_index": self.status_index,
             "transaction_hash": self.transaction_hash,
         }
         if include_signature:
             data["signature"] = self.signature
+            data["signature_suite"] = self.signature_suite
         return data
 
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Ricostruisce una transazione serializzata con `to_dict`.
+        """
+        tx = cls(
+            credential_hash=data["credential_hash"],
+            credential_unique_id=data["credential_unique_id"],
+            student_wallet_address=data["student_wallet_address"],
+            revocation_status=data["revocation_status"],
+            transaction_type=data["transaction_type"],
+            attributes_merkle_root=data.get("attributes_merkle_root"),
+            issuer_id=data.get("issuer_id"),
+            status_index=data.get("status_index")
+        )
+        if tx.transaction_hash != data["transaction_hash"]:
+            raise ValueError("Hash della transazione non coerente con il contenuto serializzato.")
+        tx.signature = data.get("signature")
+        tx.signature_suite = data.get("signature_suite")
+        return tx
+
     def __repr__(self):
         """
         Rappresentazione leggibile della transazione.
@@ -1,3 +1,4 @@
+from UniChain.structures.credential_status import CredentialStatus
 from UniChain.structures.credential_subject import CredentialSubject
 from UniChain.structures.degree import Degree
 from UniChain.structures.enrollment import Enrollment
@@ -22,13 +23,15 @@ class AcademicCredential:
     - Esami sostenuti (exams)
     - Attività opzionali (optionalActivities)
     - Firma digitale (proof)
+    - Stato di revoca nella status list dell'emittente (credentialStatus, opzionale)
     """
 
     def __init__(self, subject: CredentialSubject, degree: Degree,
                  enrollment: Enrollment, validity: ValidityPeriod,
                  issuer: Issuer, exams: list[ExamRecord],
                  optional_activities: list[OptionalActivity] = None,
-                 proof: Proof = None):
+                 proof: Proof = None,
+                 credential_status: CredentialStatus = None):
         self.credentialSubject = subject
         self.degree = degree
         self.enrollment = enrollment
@@ -37,6 +40,7 @@ class AcademicCredential:
         self.exams = exams
         self.optionalActivities = optional_activities or []
         self.proof = proof
+        self.credentialStatus = credential_status
 
     def set_proof(self, proof: Proof):
         """
@@ -51,7 +55,7 @@ class AcademicCredential:
         Questo formato è utile per il calcolo dell’hash, per il Merkle Tree,
         e per l’invio verso il wallet o il sistema di verifica.
         """
-        return {
+        data = {
             "credentialSubject": self.credentialSubject.to_dict(),
             "degree": self.degree.to_dict(),
             "enrollment": self.enrollment.to_dict(),
@@ -61,3 +65,7 @@ class AcademicCredential:
             "optionalActivities": [activity.to_dict() for activity in self.optionalActivities],
             "proof": self.proof.to_dict() if self.proof else None
         }
+        # Incluso solo se presente, così le credenziali senza status list non cambiano Merkle Root
+        if self.credentialStatus:
+            data["credentialStatus"] = self.credentialStatus.to_dict()
+        return data
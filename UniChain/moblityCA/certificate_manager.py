@@ -1,11 +1,82 @@
 import datetime
-from typing import List
+import json
+import os
+import threading
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
 from cryptography import x509
-from cryptography.x509.oid import NameOID
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
-
+from cryptography.x509.oid import NameOID
+from UniChain.moblityCA.registry_snapshot import RegistrySnapshot
+from UniChain.utils.crypto_suite import CryptoSuite, suite_for_key
 from UniChain.utils.validator import Validator
+from UniChain.utils.key_cache import public_key_cache
+from UniChain.utils.listeners import weak_callback, run_fallback
+
+
+def _build_certificate(ca_private_key, root_cert, public_key, official_name, university_code, location):
+    """
+    Costruisce e firma il certificato X.509 di un'università con la chiave della Root CA.
+    """
+    subject = x509.Name([
+        x509.NameAttribute(NameOID.COUNTRY_NAME, "IT"),
+        x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Italia"),
+        x509.NameAttribute(NameOID.LOCALITY_NAME, location),
+        x509.NameAttribute(NameOID.ORGANIZATION_NAME, official_name),
+        x509.NameAttribute(NameOID.COMMON_NAME, university_code),
+    ])
+
+    return (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(root_cert.subject)
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(datetime.datetime.now())
+        .not_valid_after(datetime.datetime.now() + datetime.timedelta(days=365))  # 1 anno
+        .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+        .add_extension(x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False)
+        .add_extension(
+            x509.AuthorityKeyIdentifier.from_issuer_public_key(root_cert.public_key()),
+            critical=False
+        )
+        .sign(ca_private_key, suite_for_key(ca_private_key).certificate_hash_algorithm())
+    )
+
+
+# Chiave della CA e certificato root del processo worker (impostati da `_init_signing_worker`)
+_worker_ca = None
+
+
+def _init_signing_worker(ca_key_pem, root_cert_der):
+    """
+    Inizializzatore dei worker di `issue_certificates_batch`: la chiave della CA
+    arriva una sola volta per processo, non con ogni gruppo di certificati.
+    """
+    global _worker_ca
+    _worker_ca = (serialization.load_pem_private_key(ca_key_pem, password=None),
+                  x509.load_der_x509_certificate(root_cert_der))
+
+
+def _sign_certificates_chunk(requests):
+    """
+    Worker di `issue_certificates_batch`: firma un gruppo di certificati con la
+    chiave della CA caricata dall'inizializzatore del processo.
+
+    :return: lista di (certificato DER, None) oppure (None, messaggio di errore)
+    """
+    ca_private_key, root_cert = _worker_ca
+    results = []
+    for request in requests:
+        try:
+            cert = _build_certificate(ca_private_key, root_cert,
+                                      serialization.load_pem_public_key(request["public_key_pem"]),
+                                      request["official_name"], request["university_code"], request["location"])
+            results.append((cert.public_bytes(serialization.Encoding.DER), None))
+        except Exception as e:
+            results.append((None, f"Firma del certificato fallita: {e}"))
+    return results
 
 
 class CertificateManager:
@@ -18,17 +89,47 @@ class CertificateManager:
     - mantiene il registro pubblico dei certificati
     - supporta la revoca dei certificati
     - verifica firme tramite certificati X.509
+
+    Il registro è indicizzato per university_id, impronta SHA-256 e numero di serie
+    dei certificati, con l'insieme delle impronte revocate: i controlli di
+    accreditamento eseguiti a ogni blocco costano O(1) anche con migliaia di università.
+    Il registro pubblico è esposto come `RegistrySnapshot` immutabile, ricostruito
+    alla prima lettura successiva a un rilascio o a una revoca: una serie di
+    accreditamenti consecutivi non ricostruisce la fotografia a ogni certificato.
+
+    Le revoche sono pubblicate anche in una CRL X.509 firmata, con numero di CRL
+    crescente, rigenerata a ogni revoca (le voci già revocate sono riusate) o alla
+    scadenza; le risposte di stato firmate per il `StatusResponder` sono prodotte da
+    `build_status_response`, l'unico altro punto che usa la chiave privata.
     """
 
+    # Validità della CRL e, per default, delle risposte di stato
+    CRL_VALIDITY = datetime.timedelta(hours=24)
+
     def __init__(self, private_key, public_key):
         """
         Inizializza la MobilityCA con chiavi e un certificato root autofirmato.
         """
         self._private_key = private_key
         self._public_key = public_key
-        self._certificati_uni: List[dict] = []  # Elenco certificati rilasciati
+        self._suite = suite_for_key(private_key)
+        self._certificati_uni: List[dict] = []  # Elenco certificati rilasciati (ordine di rilascio)
+        self._by_university: Dict[str, List[dict]] = {}  # university_id → voci in ordine di rilascio
+        self._by_fingerprint: Dict[bytes, dict] = {}     # impronta SHA-256 del certificato → voce
+        self._by_serial: Dict[int, dict] = {}            # numero di serie → voce
+        self._revoked = set()                            # impronte dei certificati revocati
+        self._snapshot = RegistrySnapshot(0, [])
+        self._snapshot_stale = False   # registro modificato dopo l'ultima fotografia
+        # CRL: voci X.509 delle revoche (costruite una sola volta), numero e CRL corrente
+        self._crl_entries: List[x509.RevokedCertificate] = []
+        self._crl_number = 0
+        self._crl = None
+        self._revocation_listeners = []  # Riferimenti deboli alle callback(university_id)
+        # Rende atomiche rispetto ai lettori le modifiche del registro (rilascio singolo, batch, revoca)
+        self._lock = threading.RLock()
         self._generate_root_cert()
         self._validator = Validator()
+        self._regenerate_crl()
 
     def _generate_root_cert(self):
         """
@@ -49,9 +150,63 @@ class CertificateManager:
             .not_valid_before(datetime.datetime.now())
             .not_valid_after(datetime.datetime.now() + datetime.timedelta(days=3650))  # 10 anni
             .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
-            .sign(self._private_key, hashes.SHA256())
+            .sign(self._private_key, self._suite.certificate_hash_algorithm())
         )
 
+    @staticmethod
+    def _fingerprint(certificate) -> bytes:
+        """
+        Impronta SHA-256 della codifica DER del certificato (chiave degli indici).
+        """
+        return certificate.fingerprint(hashes.SHA256())
+
+    def _register(self, entries: List[dict]):
+        """
+        Aggiunge voci al registro e ai suoi indici, pubblicando un'unica nuova fotografia.
+        """
+        with self._lock:
+            for entry in entries:
+                certificate = entry["certificate"]
+                self._certificati_uni.append(entry)
+                self._by_university.setdefault(entry["id_university"], []).append(entry)
+                self._by_fingerprint[self._fingerprint(certificate)] = entry
+                self._by_serial[certificate.serial_number] = entry
+            self._snapshot_stale = True
+
+    def _public_entry(self, entry: dict) -> MappingProxyType:
+        """
+        Voce del registro pubblico, in sola lettura. È costruita una sola volta per
+        certificato e riusata dalle fotografie successive finché la voce non cambia
+        (la revoca la invalida).
+        """
+        public_entry = entry.get("public_entry")
+        if public_entry is None:
+            if "public_key_pem" not in entry:
+                entry["public_key_pem"] = CryptoSuite.serialize_public_key(entry["certificate"].public_key())
+            public_entry = entry["public_entry"] = MappingProxyType({
+                "university_id": entry["id_university"],
+                "official_name": entry["official_name"],
+                "issued_at": entry["issued_at"],
+                "revoked": entry["revoked"],
+                "revoked_at": entry["revoked_at"],
+                "signature_suite": entry["signature_suite"],
+                "public_key": entry["public_key_pem"]
+            })
+        return public_entry
+
+    def get_registry_snapshot(self) -> RegistrySnapshot:
+        """
+        Versione corrente del registro pubblico (immutabile), ricostruita qui
+        se il registro è cambiato dopo l'ultima fotografia pubblicata.
+        """
+        if self._snapshot_stale:
+            with self._lock:
+                if self._snapshot_stale:
+                    self._snapshot = RegistrySnapshot(self._snapshot.version + 1,
+                                                      [self._public_entry(entry) for entry in self._certificati_uni])
+                    self._snapshot_stale = False
+        return self._snapshot
+
     def get_root_cert(self):
         """
         Restituisce il certificato Root CA.
@@ -68,47 +223,158 @@ class CertificateManager:
         :param university_code: codice breve dell’università
         :param location: città/località
         :return: (certificato rilasciato, root_cert)
+        :raises ValueError: se l'università ha già un certificato attivo
         """
         # Validazione input
         self._validator.validate_string(university_id, "university_id")
         self._validator.validate_only_char(official_name, "official_name")
         self._validator.validate_string(university_code, "university_code")
         self._validator.validate_only_char(location, "location")
+        if self._has_active_certificate(university_id):
+            raise ValueError(f"Università già accreditata: {university_id}")
 
-        subject = x509.Name([
-            x509.NameAttribute(NameOID.COUNTRY_NAME, "IT"),
-            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Italia"),
-            x509.NameAttribute(NameOID.LOCALITY_NAME, location),
-            x509.NameAttribute(NameOID.ORGANIZATION_NAME, official_name),
-            x509.NameAttribute(NameOID.COMMON_NAME, university_code),
-        ])
-
-        cert = (
-            x509.CertificateBuilder()
-            .subject_name(subject)
-            .issuer_name(self.root_cert.subject)
-            .public_key(public_key)
-            .serial_number(x509.random_serial_number())
-            .not_valid_before(datetime.datetime.now())
-            .not_valid_after(datetime.datetime.now() + datetime.timedelta(days=365))  # 1 anno
-            .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
-            .add_extension(x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False)
-            .add_extension(
-                x509.AuthorityKeyIdentifier.from_issuer_public_key(self._public_key),
-                critical=False
-            )
-            .sign(self._private_key, hashes.SHA256())
-        )
+        cert = _build_certificate(self._private_key, self.root_cert, public_key,
+                                  official_name, university_code, location)
 
-        self._certificati_uni.append({
-            "id_university": university_id,
-            "official_name": official_name,
-            "certificate": cert,
-            "revoked": None
-        })
+        with self._lock:
+            # Nuovo controllo al momento della registrazione, come in `issue_certificates_batch`
+            if self._has_active_certificate(university_id):
+                raise ValueError(f"Università già accreditata: {university_id}")
+            self._register([{
+                "id_university": university_id,
+                "official_name": official_name,
+                "certificate": cert,
+                "issued_at": datetime.datetime.now(datetime.UTC).isoformat(),
+                "revoked": None,
+                "revoked_at": None,
+                "signature_suite": suite_for_key(public_key).name
+            }])
 
         return cert, self.root_cert
 
+    def _validate_request(self, request: dict):
+        """
+        Validazione di una richiesta del batch (stessi controlli di `issue_certificate`).
+
+        :return: suite della chiave pubblica dell'università
+        :raises ValueError: se la richiesta non è valida
+        """
+        if not isinstance(request, dict):
+            raise ValueError("La richiesta di accreditamento deve essere un dizionario.")
+        for field in ("public_key", "university_id", "official_name", "university_code", "location"):
+            if field not in request:
+                raise ValueError(f"Campo mancante nella richiesta: {field}")
+        self._validator.validate_string(request["university_id"], "university_id")
+        self._validator.validate_only_char(request["official_name"], "official_name")
+        self._validator.validate_string(request["university_code"], "university_code")
+        self._validator.validate_only_char(request["location"], "location")
+        try:
+            return suite_for_key(request["public_key"])
+        except Exception as e:
+            raise ValueError(f"Chiave pubblica non supportata: {e}")
+
+    def issue_certificates_batch(self, requests: List[dict], workers: int = None) -> List[dict]:
+        """
+        Accredita più università in un'unica operazione.
+
+        Tutte le richieste sono validate prima di firmare: sono rifiutati anche gli
+        university_id ripetuti nel batch o già accreditati con un certificato attivo.
+        I certificati validi sono firmati in un pool di processi (la chiave della CA
+        è passata in PEM, in memoria, una sola volta a ciascun worker) e registrati
+        tutti insieme, con un'unica nuova fotografia del registro.
+        Una richiesta non valida non interrompe il batch.
+
+        :param requests: dizionari con public_key, university_id, official_name,
+                         university_code e location
+        :param workers: numero di processi (default: numero di CPU; 1 = firma nel processo corrente)
+        :return: per ogni richiesta, nello stesso ordine, {"university_id", "certificate", "error"}
+        """
+        results = []
+        pending = []   # (posizione, richiesta, suite)
+        seen = set()
+        for position, request in enumerate(requests):
+            university_id = request.get("university_id") if isinstance(request, dict) else None
+            results.append({"university_id": university_id, "certificate": None, "error": None})
+            try:
+                suite = self._validate_request(request)
+                if university_id in seen:
+                    raise ValueError(f"university_id duplicato nel batch: {university_id}")
+                if self._has_active_certificate(university_id):
+                    raise ValueError(f"Università già accreditata: {university_id}")
+                seen.add(university_id)
+                pending.append((position, request, suite))
+            except ValueError as e:
+                results[position]["error"] = str(e)
+
+        workers = workers or os.cpu_count() or 1
+        signed = self._sign_batch([request for _, request, _ in pending], workers)
+
+        entries = []
+        with self._lock:
+            for (position, request, suite), (cert, error) in zip(pending, signed):
+                # Nuovo controllo al momento della registrazione: un accreditamento
+                # concorrente può essere avvenuto durante la firma
+                if error is None and self._has_active_certificate(request["university_id"]):
+                    error = f"Università già accreditata: {request['university_id']}"
+                if error is not None:
+                    results[position]["error"] = error
+                    continue
+                results[position]["certificate"] = cert
+                entries.append({
+                    "id_university": request["university_id"],
+                    "official_name": request["official_name"],
+                    "certificate": cert,
+                    "issued_at": datetime.datetime.now(datetime.UTC).isoformat(),
+                    "revoked": None,
+                    "revoked_at": None,
+                    "signature_suite": suite.name
+                })
+            if entries:
+                self._register(entries)
+
+        print(f"[MobilityCA] Accreditamento batch: {len(entries)} certificati rilasciati, "
+              f"{len(requests) - len(entries)} richieste rifiutate.")
+        return results
+
+    def _sign_batch(self, requests: List[dict], workers: int):
+        """
+        Firma i certificati delle richieste già validate.
+
+        :return: lista di (certificato, None) oppure (None, messaggio di errore)
+        """
+        if workers <= 1 or len(requests) < 2 * workers:
+            signed = []
+            for request in requests:
+                try:
+                    signed.append((_build_certificate(self._private_key, self.root_cert, request["public_key"],
+                                                      request["official_name"], request["university_code"],
+                                                      request["location"]), None))
+                except Exception as e:
+                    signed.append((None, f"Firma del certificato fallita: {e}"))
+            return signed
+
+        ca_key_pem = self._private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+        root_cert_der = self.root_cert.public_bytes(serialization.Encoding.DER)
+        chunk_size = -(-len(requests) // workers)
+        jobs = [[{
+            "public_key_pem": CryptoSuite.serialize_public_key(request["public_key"]).encode(),
+            "official_name": request["official_name"],
+            "university_code": request["university_code"],
+            "location": request["location"],
+        } for request in requests[start:start + chunk_size]]
+            for start in range(0, len(requests), chunk_size)]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_signing_worker,
+                                 initargs=(ca_key_pem, root_cert_der)) as executor:
+            chunks = list(executor.map(_sign_certificates_chunk, jobs))
+        return [(x509.load_der_x509_certificate(der) if der is not None else None, error)
+                for chunk in chunks for der, error in chunk]
+
+    def _has_active_certificate(self, university_id: str) -> bool:
+        with self._lock:
+            return any(entry["revoked"] is None for entry in self._by_university.get(university_id, ()))
+
     def revoke_certificate(self, university_id: str) -> bool:
         """
         Revoca un certificato già rilasciato a un'università.
@@ -118,21 +384,141 @@ class CertificateManager:
         """
         self._validator.validate_string(university_id, "university_id")
 
-        for entry in self._certificati_uni:
-            if entry["id_university"] == university_id and entry["revoked"] is None:
+        with self._lock:
+            entry = next((e for e in self._by_university.get(university_id, ()) if e["revoked"] is None), None)
+            if entry is not None:
                 entry["revoked"] = datetime.date.today().isoformat()
-                print(f"\n\t[MobilityCA] Certificato revocato per {university_id}")
-                return True
+                # Istante esatto (UTC) della revoca, confrontabile con il timestamp dei blocchi
+                revoked_at = datetime.datetime.now(datetime.UTC)
+                entry["revoked_at"] = revoked_at.isoformat()
+                self._revoked.add(self._fingerprint(entry["certificate"]))
+                entry.pop("public_entry", None)
+                self._snapshot_stale = True
+                self._crl_entries.append(
+                    x509.RevokedCertificateBuilder()
+                    .serial_number(entry["certificate"].serial_number)
+                    .revocation_date(revoked_at)
+                    .build()
+                )
+                self._regenerate_crl()
+
+        if entry is None:
+            print(f"\n\t[MobilityCA] Nessun certificato attivo per {university_id}")
+            return False
+
+        print(f"\n\t[MobilityCA] Certificato revocato per {university_id}")
+        self._notify_revocation(university_id)
+        return True
+
+    # --- CRL e risposte di stato ---
+
+    def _regenerate_crl(self):
+        """
+        Firma una nuova CRL con tutte le voci revocate e numero di CRL incrementato.
+        """
+        now = datetime.datetime.now(datetime.UTC)
+        self._crl_number += 1
+        builder = (
+            x509.CertificateRevocationListBuilder()
+            .issuer_name(self.root_cert.subject)
+            .last_update(now)
+            .next_update(now + self.CRL_VALIDITY)
+            .add_extension(x509.CRLNumber(self._crl_number), critical=False)
+            .add_extension(x509.AuthorityKeyIdentifier.from_issuer_public_key(self._public_key), critical=False)
+        )
+        for revoked in self._crl_entries:
+            builder = builder.add_revoked_certificate(revoked)
+        self._crl = builder.sign(self._private_key, self._suite.certificate_hash_algorithm())
+
+    def get_crl(self) -> x509.CertificateRevocationList:
+        """
+        Restituisce la CRL corrente, rigenerandola se è scaduta.
+        """
+        with self._lock:
+            if self._crl.next_update_utc <= datetime.datetime.now(datetime.UTC):
+                self._regenerate_crl()
+            return self._crl
 
-        print(f"\n\t[MobilityCA] Nessun certificato attivo per {university_id}")
-        return False
+    def get_crl_number(self) -> int:
+        with self._lock:
+            return self._crl_number
+
+    def get_crl_pem(self) -> bytes:
+        return self.get_crl().public_bytes(serialization.Encoding.PEM)
+
+    def get_certificate_status(self, serial_number: int) -> Optional[dict]:
+        """
+        Stato del certificato con il numero di serie indicato (None se sconosciuto).
+        """
+        entry = self._by_serial.get(serial_number)
+        if entry is None:
+            return None
+        return {
+            "university_id": entry["id_university"],
+            "status": "revoked" if entry["revoked"] is not None else "good",
+            "revoked_at": entry["revoked_at"],
+        }
+
+    @staticmethod
+    def status_payload(response: dict) -> bytes:
+        """
+        Contenuto firmato di una risposta di stato: JSON canonico senza la firma.
+        """
+        unsigned = {k: v for k, v in response.items() if k not in ("signature", "signatureSuite")}
+        return json.dumps(unsigned, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def build_status_response(self, serial_number: int, validity: datetime.timedelta = None) -> dict:
+        """
+        Risposta di stato firmata dalla Root CA per un certificato, nello stile OCSP:
+        stato (good/revoked/unknown), thisUpdate e nextUpdate, numero della CRL corrente.
+
+        :param serial_number: numero di serie del certificato
+        :param validity: intervallo tra thisUpdate e nextUpdate (default: validità della CRL)
+        """
+        now = datetime.datetime.now(datetime.UTC)
+        status = self.get_certificate_status(serial_number)
+        response = {
+            "type": "CertificateStatus",
+            "serialNumber": format(serial_number, "x"),
+            "universityId": status["university_id"] if status else None,
+            "status": status["status"] if status else "unknown",
+            "revokedAt": status["revoked_at"] if status else None,
+            "crlNumber": self._crl_number,
+            "thisUpdate": now.isoformat(),
+            "nextUpdate": (now + (validity or self.CRL_VALIDITY)).isoformat(),
+        }
+        response["signature"] = self._suite.sign(self._private_key, self.status_payload(response)).hex()
+        response["signatureSuite"] = self._suite.name
+        return response
+
+    def add_revocation_listener(self, callback, on_error=None):
+        """
+        Registra una callback(university_id) invocata a ogni revoca di certificato.
+        I metodi sono mantenuti con riferimenti deboli.
+
+        :param on_error: callback senza argomenti invocata se `callback` solleva un'eccezione
+        """
+        self._revocation_listeners.append((weak_callback(callback), weak_callback(on_error)))
+
+    def _notify_revocation(self, university_id: str):
+        alive = []
+        for ref, on_error in self._revocation_listeners:
+            callback = ref()
+            if callback is None:
+                continue
+            alive.append((ref, on_error))
+            try:
+                callback(university_id)
+            except Exception as e:
+                print(f"[MobilityCA] Errore nella notifica di revoca: {e}")
+                run_fallback(on_error, "MobilityCA")
+        self._revocation_listeners = alive
 
     def is_certificate_revoked(self, certificate) -> bool:
         """
         Verifica se un certificato è stato revocato.
         """
-        return any(entry["certificate"] == certificate and entry["revoked"] is not None
-                   for entry in self._certificati_uni)
+        return self._fingerprint(certificate) in self._revoked
 
     def is_revoked_by_university(self, university_id: str) -> bool:
         """
@@ -142,48 +528,50 @@ class CertificateManager:
         :return: True se revocato, False altrimenti
         """
         self._validator.validate_string(university_id, "university_id")
-        return any(entry["id_university"] == university_id and entry["revoked"] is not None
-                   for entry in self._certificati_uni)
+        return any(entry["revoked"] is not None for entry in self._by_university.get(university_id, ()))
 
     def find_university_id(self, certificate) -> str:
         """
         Restituisce l'ID dell’università associato a un certificato.
         """
-        for entry in self._certificati_uni:
-            if entry["certificate"] == certificate:
-                return entry["id_university"]
-        raise ValueError("Certificato non trovato per questa università.")
+        entry = self._by_fingerprint.get(self._fingerprint(certificate))
+        if entry is None:
+            raise ValueError("Certificato non trovato per questa università.")
+        return entry["id_university"]
 
     def certificate_matches(self, certificate) -> bool:
         """
         Verifica se un certificato esiste nel registro MobilityCA.
         """
-        return any(entry["certificate"] == certificate for entry in self._certificati_uni)
+        return self._fingerprint(certificate) in self._by_fingerprint
+
+    def get_certificate(self, university_id: str) -> Optional[x509.Certificate]:
+        """
+        Restituisce il certificato corrente dell'università, cioè l'ultimo rilasciato
+        (None se assente). Dopo una revoca e un nuovo accreditamento è quello nuovo.
+        """
+        entries = self._by_university.get(university_id)
+        return entries[-1]["certificate"] if entries else None
+
+    def get_certificate_by_serial(self, serial_number: int) -> Optional[x509.Certificate]:
+        """
+        Restituisce il certificato con il numero di serie indicato (None se assente).
+        """
+        entry = self._by_serial.get(serial_number)
+        return entry["certificate"] if entry else None
 
     def get_public_registry(self) -> List[dict]:
         """
         Restituisce il registro pubblico delle università accreditate.
-        Include: ID, stato revoca e chiave pubblica (PEM).
+        Include: ID, istante di rilascio (UTC), stato revoca (data e istante UTC), suite di firma e chiave pubblica (PEM).
         """
-        registry = []
-        for entry in self._certificati_uni:
-            cert = entry["certificate"]
-            info = {
-                "university_id": entry["id_university"],
-                "official_name": entry["official_name"],
-                "revoked": entry["revoked"],
-                "public_key": cert.public_key().public_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PublicFormat.SubjectPublicKeyInfo
-                ).decode()
-            }
-            registry.append(info)
-        return registry
+        return self.get_registry_snapshot().to_list()
 
     @staticmethod
     def verify_signature(message: bytes, signature: bytes, certificate) -> bool:
         """
-        Verifica una firma digitale usando la chiave pubblica di un certificato X.509.
+        Verifica una firma digitale usando la chiave pubblica di un certificato X.509,
+        con la suite crittografica corrispondente al tipo di chiave.
 
         :param message: messaggio originale firmato
         :param signature: firma digitale
@@ -191,13 +579,11 @@ class CertificateManager:
         :return: True se valida, False altrimenti
         """
         try:
-            certificate.public_key().verify(
-                signature,
-                message,
-                padding=padding.PKCS1v15(),
-                algorithm=hashes.SHA256()
-            )
-            return True
+            public_key = public_key_cache.from_certificate(certificate)
+            if suite_for_key(public_key).verify(public_key, signature, message):
+                return True
+            print("[MobilityCA] Firma non valida.")
+            return False
         except Exception as e:
             print(f"[MobilityCA] Firma non valida: {e}")
             return False
@@ -1,5 +1,6 @@
-from cryptography.hazmat.primitives.asymmetric import rsa
 from UniChain.moblityCA.certificate_manager import CertificateManager
+from UniChain.utils.crypto_suite import get_suite
+from UniChain.utils.key_provider import get_default_key_provider
 from UniChain.utils.validator import Validator
 
 
@@ -16,8 +17,14 @@ class MobilityCA:
     - Esporre un registro pubblico delle università accreditate
     """
 
-    def __init__(self):
+    def __init__(self, crypto_suite=None, key_provider=None):
+        """
+        :param crypto_suite: suite crittografica della Root CA (default RSA-2048-PKCS1v15-SHA256)
+        :param key_provider: KeyProvider da cui ottenere la chiave privata (default: provider globale)
+        """
         # Generazione della coppia di chiavi della Root CA MobilityCA
+        self._crypto_suite = get_suite(crypto_suite)
+        self._key_provider = key_provider or get_default_key_provider()
         self._private_key = self._generate_private_key()
         self._public_key = self._private_key.public_key()
 
@@ -36,12 +43,11 @@ class MobilityCA:
     def get_university_objects(self):
         return self._university_objects
 
-    @staticmethod
-    def _generate_private_key():
+    def _generate_private_key(self):
         """
-        Genera una chiave privata RSA (2048 bit) per la Root CA.
+        Ottiene dal KeyProvider la chiave privata della Root CA secondo la suite scelta.
         """
-        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return self._key_provider.get_private_key(self._crypto_suite, label="mobilityca")
 
     # --- API per le Università ---
 
@@ -49,16 +55,15 @@ class MobilityCA:
         """
         Rilascia un certificato digitale a una università accreditata.
         Verifica la correttezza dei parametri prima di invocare il CertificateManager.
+
+        :raises ValueError: se l'università ha già un certificato attivo
         """
         self._validator.validate_string(university_id, "university_id")
         self._validator.validate_only_char(official_name, "official_name")
         self._validator.validate_string(university_code, "university_code")
         self._validator.validate_only_char(location, "location")
 
-        if university_obj:
-            self._university_objects[university_id] = university_obj
-
-        return self._certificate_manager.issue_certificate(
+        result = self._certificate_manager.issue_certificate(
             public_key=public_key,
             university_id=university_id,
             official_name=official_name,
@@ -66,6 +71,25 @@ class MobilityCA:
             location=location
         )
 
+        if university_obj:
+            self._university_objects[university_id] = university_obj
+        return result
+
+    def issue_certificates_batch(self, requests, workers=None):
+        """
+        Accredita più università in un'unica operazione (vedi `CertificateManager.issue_certificates_batch`).
+
+        :param requests: dizionari con public_key, university_id, official_name, university_code,
+                         location e, opzionale, university_obj
+        :param workers: numero di processi per la firma dei certificati
+        :return: esito per ogni richiesta, con certificato o messaggio di errore
+        """
+        results = self._certificate_manager.issue_certificates_batch(requests, workers)
+        for request, result in zip(requests, results):
+            if result["certificate"] is not None and isinstance(request, dict) and request.get("university_obj"):
+                self._university_objects[result["university_id"]] = request["university_obj"]
+        return results
+
     def revoke_certificate(self, university_id):
         """
         Revoca un certificato già rilasciato a un’università.
@@ -86,11 +110,8 @@ class MobilityCA:
         self._validator.validate_string(university_id, "university_id")
 
         # Cerca il certificato associato all'università
-        for entry in self._certificate_manager._certificati_uni:
-            if entry["id_university"] == university_id:
-                certificate = entry["certificate"]
-                break
-        else:
+        certificate = self._certificate_manager.get_certificate(university_id)
+        if certificate is None:
             print(f"[MobilityCA] Nessun certificato trovato per {university_id}")
             return False
 
@@ -102,12 +123,37 @@ class MobilityCA:
             print(f"[MobilityCA] Firma NON valida. Revoca rifiutata per {university_id}.")
             return False
 
+    def add_revocation_listener(self, callback, on_error=None):
+        """
+        Registra una callback(university_id) invocata quando un certificato universitario viene revocato.
+        `on_error` è invocata senza argomenti se la callback fallisce.
+        """
+        self._certificate_manager.add_revocation_listener(callback, on_error)
+
     def is_certificate_revoked(self, certificate):
         """
         Controlla se un certificato è stato revocato.
         """
         return self._certificate_manager.is_certificate_revoked(certificate)
 
+    def get_certificate(self, university_id):
+        """
+        Restituisce il certificato corrente (l'ultimo rilasciato) dell'università (None se non accreditata).
+        """
+        return self._certificate_manager.get_certificate(university_id)
+
+    def get_crl(self):
+        """
+        Restituisce la CRL X.509 firmata con i certificati universitari revocati.
+        """
+        return self._certificate_manager.get_crl()
+
+    def build_status_response(self, serial_number: int, validity=None) -> dict:
+        """
+        Produce una risposta di stato firmata per il certificato (usata dallo StatusResponder).
+        """
+        return self._certificate_manager.build_status_response(serial_number, validity)
+
     def get_root_certificate(self):
         """
         Restituisce il certificato della Root CA MobilityCA.
@@ -120,6 +166,13 @@ class MobilityCA:
         """
         return self._certificate_manager.get_public_registry()
 
+    def get_registry_snapshot(self):
+        """
+        Restituisce la fotografia immutabile e versionata del registro pubblico,
+        con repliche attive e quorum del consenso.
+        """
+        return self._certificate_manager.get_registry_snapshot()
+
     def verify_signature(self, message: bytes, signature: bytes, certificate) -> bool:
         """
         Verifica una firma digitale utilizzando il certificato fornito.
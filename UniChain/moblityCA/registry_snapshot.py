@@ -0,0 +1,58 @@
+from types import MappingProxyType
+
+from UniChain.blockchain.pbft import PBFTEngine
+
+
+class RegistrySnapshot:
+    """
+    Fotografia immutabile e versionata del registro pubblico della MobilityCA.
+
+    Viene ricostruita dal CertificateManager solo dopo un cambiamento del registro
+    (rilascio o revoca di un certificato), con `version` crescente; chi la legge
+    (consenso, validazione, verificatori) non ripete estrazione della chiave
+    pubblica e serializzazione PEM a ogni blocco. Le voci sono viste in sola lettura.
+    """
+
+    __slots__ = ("version", "entries", "active", "active_replicas", "public_keys", "keys_by_university",
+                 "accreditation", "faulty", "quorum")
+
+    def __init__(self, version: int, entries):
+        """
+        :param version: versione del registro (incrementata a ogni nuova fotografia)
+        :param entries: voci del registro pubblico nell'ordine di rilascio
+                        (le voci già in sola lettura sono condivise, non copiate)
+        """
+        self.version = version
+        self.entries = tuple(entry if isinstance(entry, MappingProxyType) else MappingProxyType(dict(entry))
+                             for entry in entries)
+        self.active = tuple(entry for entry in self.entries if not entry["revoked"])
+        # Coppie (university_id, official_name) delle repliche del consenso
+        self.active_replicas = tuple(dict.fromkeys((entry["university_id"], entry["official_name"])
+                                                   for entry in self.active))
+
+        keys_by_university = {}
+        accreditation = {}
+        current = {}
+        for entry in self.entries:
+            university_id = entry["university_id"]
+            keys_by_university.setdefault(university_id, []).append(entry["public_key"])
+            accreditation[university_id] = accreditation.get(university_id, False) or entry["revoked"] is None
+            current[university_id] = entry
+
+        # Chiave del certificato corrente (l'ultimo rilasciato, come in `get_certificate`), se non revocato
+        self.public_keys = MappingProxyType({university_id: entry["public_key"]
+                                             for university_id, entry in current.items() if not entry["revoked"]})
+        # Chiavi di tutti i certificati rilasciati, anche revocati (firme di blocchi già accettati)
+        self.keys_by_university = MappingProxyType({uid: tuple(keys) for uid, keys in keys_by_university.items()})
+        self.accreditation = MappingProxyType(accreditation)
+        self.faulty, self.quorum = PBFTEngine.quorum_size(len(self.active_replicas)) \
+            if self.active_replicas else (0, 0)
+
+    def to_list(self):
+        """
+        Copia modificabile delle voci (formato di `get_public_registry`).
+        """
+        return [dict(entry) for entry in self.entries]
+
+    def __repr__(self):
+        return f"RegistrySnapshot(v{self.version}, {len(self.active)}/{len(self.entries)} attive, quorum {self.quorum})"
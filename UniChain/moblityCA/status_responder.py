@@ -0,0 +1,249 @@
+"""
+Responder locale dello stato dei certificati universitari, nello stile OCSP.
+
+Le risposte sono firmate dalla Root CA una sola volta per certificato e servite
+dalla cache fino a `nextUpdate` (o fino alla revoca del certificato): migliaia di
+verificatori, anche in altri processi, controllano l'accreditamento
+dell'emittente senza che ogni richiesta usi la chiave privata della CA.
+
+Endpoint HTTP (GET):
+- /status/<serial esadecimale>   risposta JSON firmata per il certificato
+- /university/<university_id>    risposta per il certificato dell'università
+- /crl                           CRL X.509 corrente (PEM)
+"""
+import datetime
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from cryptography.hazmat.primitives.serialization import Encoding
+from UniChain.moblityCA.certificate_manager import CertificateManager
+from UniChain.utils.crypto_suite import CryptoSuite, verify_with_pem
+
+DEFAULT_VALIDITY = datetime.timedelta(hours=1)
+
+
+class StatusResponder:
+    """
+    Cache di risposte di stato pre-firmate con server HTTP opzionale.
+    """
+
+    def __init__(self, mobility_ca, validity: datetime.timedelta = DEFAULT_VALIDITY):
+        """
+        :param mobility_ca: MobilityCA che firma le risposte
+        :param validity: intervallo tra thisUpdate e nextUpdate di ogni risposta
+        """
+        self.mobility_ca = mobility_ca
+        self.validity = validity
+        self._responses = {}        # serial → (scadenza, corpo JSON, risposta)
+        self._unknown_version = None
+        self._generation = 0        # incrementato a ogni invalidazione della cache
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.signed = 0
+        self.served = 0
+        mobility_ca.add_revocation_listener(self._on_revocation, on_error=self._clear_responses)
+
+    # --- Cache delle risposte ---
+
+    def _on_revocation(self, university_id):
+        """
+        Scarta le risposte dei certificati dell'università revocata: la prossima
+        richiesta riceve una risposta "revoked" appena firmata.
+        """
+        with self._lock:
+            for serial in [s for s, (_, _, r) in self._responses.items() if r["universityId"] == university_id]:
+                del self._responses[serial]
+            self._generation += 1
+
+    def _clear_responses(self):
+        """
+        Scarta tutte le risposte in cache (ripiego se `_on_revocation` fallisce).
+        """
+        with self._lock:
+            self._responses.clear()
+            self._generation += 1
+
+    def _lookup(self, serial_number: int, now):
+        """
+        Risposta valida in cache (None se assente o scaduta) e generazione corrente.
+        Da chiamare con il lock acquisito.
+        """
+        # Un nuovo rilascio può rendere noto un serial prima "unknown"
+        version = self.mobility_ca.get_registry_snapshot().version
+        if version != self._unknown_version:
+            for serial in [s for s, (_, _, r) in self._responses.items() if r["status"] == "unknown"]:
+                del self._responses[serial]
+            self._unknown_version = version
+            self._generation += 1
+        cached = self._responses.get(serial_number)
+        return (cached if cached is not None and cached[0] > now else None), self._generation
+
+    def _cached_response(self, serial_number: int):
+        """
+        La firma avviene fuori dal lock: le richieste servite dalla cache non attendono
+        quelle che firmano. La risposta è inserita solo se nessuna revoca o nuovo
+        rilascio ha invalidato la cache durante la firma; altrimenti viene rifirmata.
+        """
+        while True:
+            now = datetime.datetime.now(datetime.UTC)
+            with self._lock:
+                cached, generation = self._lookup(serial_number, now)
+                if cached is not None:
+                    self.served += 1
+                    return cached
+
+            response = self.mobility_ca.build_status_response(serial_number, self.validity)
+            body = json.dumps(response, sort_keys=True).encode("utf-8")
+            signed = (datetime.datetime.fromisoformat(response["nextUpdate"]), body, response)
+
+            with self._lock:
+                self.signed += 1
+                cached, current = self._lookup(serial_number, now)
+                if cached is None and current == generation:
+                    self._responses[serial_number] = cached = signed
+                if cached is not None:
+                    self.served += 1
+                    return cached
+
+    def get_status(self, serial_number: int) -> dict:
+        """
+        Risposta di stato firmata (dalla cache se ancora valida).
+        """
+        return self._cached_response(serial_number)[2]
+
+    def get_university_status(self, university_id: str):
+        """
+        Risposta di stato per il certificato dell'università (None se non accreditata).
+        """
+        certificate = self.mobility_ca.get_certificate(university_id)
+        return self.get_status(certificate.serial_number) if certificate is not None else None
+
+    # --- Server HTTP ---
+
+    def _make_handler(self):
+        responder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = [unquote(p) for p in self.path.split("?")[0].strip("/").split("/")]
+                try:
+                    if parts == ["crl"]:
+                        crl = responder.mobility_ca.get_crl()
+                        max_age = (crl.next_update_utc - datetime.datetime.now(datetime.UTC)).total_seconds()
+                        self._send(200, crl.public_bytes(Encoding.PEM), "application/pkix-crl", max_age)
+                        return
+                    if len(parts) == 2 and parts[0] == "status":
+                        serial_number = int(parts[1], 16)
+                    elif len(parts) == 2 and parts[0] == "university":
+                        certificate = responder.mobility_ca.get_certificate(parts[1])
+                        if certificate is None:
+                            self._send(404, b'{"error": "universita non accreditata"}', "application/json", 0)
+                            return
+                        serial_number = certificate.serial_number
+                    else:
+                        self._send(404, b'{"error": "risorsa non trovata"}', "application/json", 0)
+                        return
+                except ValueError:
+                    self._send(400, b'{"error": "richiesta non valida"}', "application/json", 0)
+                    return
+
+                expires, body, _ = responder._cached_response(serial_number)
+                max_age = (expires - datetime.datetime.now(datetime.UTC)).total_seconds()
+                self._send(200, body, "application/json", max_age)
+
+            def _send(self, code, body, content_type, max_age):
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", f"public, max-age={max(0, int(max_age))}")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Nessun log per richiesta
+
+        return Handler
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Avvia il server HTTP in un thread in background.
+
+        :param port: porta di ascolto (0 = porta libera scelta dal sistema)
+        :return: URL base del responder
+        """
+        if self._server is not None:
+            raise Exception("[StatusResponder] Il server è già avviato.")
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="StatusResponder", daemon=True)
+        self._thread.start()
+        print(f"[StatusResponder] In ascolto su {self.url}")
+        return self.url
+
+    @property
+    def url(self):
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+
+# --- Lato client (verificatori) ---
+
+def verify_status_response(response: dict, root_certificate, now: datetime.datetime = None) -> bool:
+    """
+    Verifica firma della Root CA e finestra di validità (thisUpdate ≤ now < nextUpdate).
+    """
+    now = now or datetime.datetime.now(datetime.UTC)
+    try:
+        root_pem = CryptoSuite.serialize_public_key(root_certificate.public_key())
+        if not verify_with_pem(root_pem, bytes.fromhex(response["signature"]),
+                               CertificateManager.status_payload(response), response.get("signatureSuite")):
+            return False
+        this_update = datetime.datetime.fromisoformat(response["thisUpdate"])
+        next_update = datetime.datetime.fromisoformat(response["nextUpdate"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return this_update <= now < next_update
+
+
+def fetch_status(base_url: str, serial_number: int = None, university_id: str = None, timeout: float = 5.0):
+    """
+    Richiede al responder lo stato di un certificato (per numero di serie o università).
+
+    :return: risposta di stato (dizionario) oppure None se non disponibile
+    """
+    if serial_number is not None:
+        path = f"/status/{serial_number:x}"
+    elif university_id is not None:
+        path = f"/university/{urllib.request.quote(university_id, safe='')}"
+    else:
+        raise ValueError("Indicare serial_number oppure university_id.")
+    try:
+        with urllib.request.urlopen(base_url + path, timeout=timeout) as reply:
+            return json.loads(reply.read())
+    except urllib.error.URLError:
+        return None
+
+
+def is_issuer_accredited(base_url: str, university_id: str, root_certificate) -> bool:
+    """
+    True se il responder attesta, con risposta firmata e non scaduta, che il
+    certificato dell'università non è revocato.
+    """
+    response = fetch_status(base_url, university_id=university_id)
+    return (response is not None and verify_status_response(response, root_certificate)
+            and response["status"] == "good" and response["universityId"] == university_id)
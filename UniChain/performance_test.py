@@ -2,6 +2,7 @@ import time
 import hashlib
 import sys
 import json
+import tempfile
 from UniChain.moblityCA.mobilityCA import MobilityCA
 from UniChain.university.university import University
 from UniChain.wallet.student_wallet import StudentWallet
@@ -16,6 +17,15 @@ from UniChain.structures.proof import Proof
 from UniChain.structures.merkle_tree import MerkleTree
 from UniChain.blockchain.transaction import Transaction
 from UniChain.blockchain.blockchain import Blockchain
+from UniChain.blockchain.pbft import PBFTEngine
+from UniChain.blockchain.encoding import encode_block
+from UniChain.blockchain.status_list import StatusList
+from UniChain.structures.sparse_merkle_tree import SparseMerkleTree, key_for
+from UniChain.university.verifier import Verifier
+from UniChain.university.light_client import LightClient
+from UniChain.utils.key_cache import public_key_cache
+from UniChain.utils.crypto_suite import SUITES
+from UniChain.utils.key_provider import KeyProvider
 
 
 # ============ SETUP ============
@@ -193,6 +203,40 @@ blockchain.add_block(
 end = time.perf_counter()
 pbft_time_ms = (end - start) * 1000
 
+# 8. Blocco con un lotto di transazioni (firma e consenso ammortizzati)
+BATCH_SIZE = 100
+batch_txs = []
+for i in range(BATCH_SIZE):
+    batch_tx = Transaction(
+        credential_hash=hashlib.sha256(f"{cred_hash}-{i}".encode()).hexdigest(),
+        credential_unique_id=f"CAD-BATCH-{i:04d}",
+        student_wallet_address=alice_wallet.get_wallet_address(),
+        attributes_merkle_root=merkle_root
+    )
+    batch_tx.sign_transaction(u_rennes.get_private_key())
+    batch_txs.append(batch_tx)
+
+start = time.perf_counter()
+blockchain.add_block(
+    transaction=batch_txs,
+    version="1.0",
+    block_number=len(blockchain.chain),
+    block_proposer_obj=u_rennes
+)
+end = time.perf_counter()
+batch_block_time_ms = (end - start) * 1000
+
+# 9. Dimensione del blocco: export JSON vs codifica binaria canonica
+batch_block = blockchain.get_latest_block()
+json_block_size = len(json.dumps(batch_block.to_dict(), sort_keys=True).encode("utf-8"))
+binary_block_size = len(encode_block(batch_block))
+
+start = time.perf_counter()
+for _ in range(100):
+    batch_block.calculate_hash()
+end = time.perf_counter()
+block_hash_time_ms = (end - start) * 1000 / 100
+
 # ====== STAMPA RISULTATI ======
 
 print(f"\n Dimensione Credenziale (serializzata): {cred_size / 1024:.2f} KiB")
@@ -206,12 +250,87 @@ print(f" - Calcolo Merkle Root: {merkle_root_time_ms:.3f} ms")
 print(f" - Verifica Merkle Proof: {verify_merkle_time_ms:.3f} ms")
 print(f" - Verifica revoca certificato: {revocation_check_time_ms:.3f} ms")
 print(f" - Verifica accreditamento universitario: {accreditation_check_time_ms:.3f} ms")
-print(f" - Simulazione consenso PBFT (Prepare + Commit): {pbft_time_ms:.3f} ms\n")
+print(f" - Simulazione consenso PBFT (Prepare + Commit): {pbft_time_ms:.3f} ms")
+print(f" - Blocco con {BATCH_SIZE} transazioni: {batch_block_time_ms:.3f} ms "
+      f"({batch_block_time_ms / BATCH_SIZE:.3f} ms per transazione)")
+print(f" - Hash del blocco da {BATCH_SIZE} transazioni (codifica binaria): {block_hash_time_ms:.3f} ms")
+cache_stats = public_key_cache.stats()
+print(f" - Cache chiavi pubbliche: {cache_stats['hits']} hit, {cache_stats['misses']} miss, "
+      f"{cache_stats['size']} chiavi")
+print(f" - Dimensione blocco: JSON {json_block_size / 1024:.2f} KiB, "
+      f"binario {binary_block_size / 1024:.2f} KiB\n")
+
+# ====== TEST: SCALABILITÀ DEL CONSENSO PBFT ======
+print("\n=== TEST SCALABILITÀ CONSENSO PBFT (latenza link simulata 1 ms) ===")
+print("Latenza media per fase e throughput al variare del numero di università (repliche).\n")
+for row in PBFTEngine.benchmark(replica_counts=(4, 10, 25, 50, 100), sequences=10):
+    print(f"• N={row['replicas']:>3} (f={row['faulty']}, quorum={row['quorum']}) → "
+          f"pre-prepare {row['pre_prepare_ms']:.2f} ms, prepare {row['prepare_ms']:.2f} ms, "
+          f"commit {row['commit_ms']:.2f} ms, throughput {row['throughput']:.1f} blocchi/s, "
+          f"{row['messages']} messaggi")
+
+# ====== TEST: CONFRONTO SUITE CRITTOGRAFICHE ======
+print("\n=== TEST SUITE CRITTOGRAFICHE ===")
+print("Generazione chiavi, firma e verifica del digest di una transazione per ciascuna suite.\n")
+suite_payload = bytes.fromhex(tx.transaction_hash)
+for suite in SUITES.values():
+    start = time.perf_counter()
+    suite_key = suite.generate_private_key()
+    keygen_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(100):
+        suite_signature = suite.sign(suite_key, suite_payload)
+    suite_sign_ms = (time.perf_counter() - start) * 1000 / 100
+
+    suite_public_key = suite_key.public_key()
+    start = time.perf_counter()
+    for _ in range(100):
+        suite.verify(suite_public_key, suite_signature, suite_payload)
+    suite_verify_ms = (time.perf_counter() - start) * 1000 / 100
+
+    print(f"• {suite.name:<25} → chiave {keygen_ms:.3f} ms, firma {suite_sign_ms:.3f} ms, "
+          f"verifica {suite_verify_ms:.3f} ms, firma {len(suite_signature)} byte")
+
+# ====== TEST: STATUS LIST DI REVOCA ======
+print("\n=== TEST STATUS LIST DI REVOCA ===")
+STATUS_CREDENTIALS = 100000
+status_list = StatusList(u_rennes.university_id)
+for index in range(0, STATUS_CREDENTIALS, 100):  # 1% di credenziali revocate
+    status_list.set_revoked(index)
+publication = status_list.publish(u_rennes, block_number=len(blockchain.chain) - 1)
+publication_size = len(json.dumps(publication).encode("utf-8"))
+
+start = time.perf_counter()
+status_valid = Verifier.check_status_list(publication, 4242, u_rennes.get_serialized_public_key())
+status_check_ms = (time.perf_counter() - start) * 1000
+print(f"• {STATUS_CREDENTIALS} credenziali (1% revocate) → pubblicazione firmata {publication_size / 1024:.2f} KiB")
+print(f"• Verifica firma + lettura del bit: {status_check_ms:.3f} ms (credenziale valida: {status_valid})")
+
+# ====== TEST: REGISTRO DELLE REVOCHE (SPARSE MERKLE TREE) ======
+print("\n=== TEST REGISTRO DELLE REVOCHE (SPARSE MERKLE TREE) ===")
+SMT_REVOCATIONS = 1000
+revocation_tree = SparseMerkleTree()
+start = time.perf_counter()
+for index in range(SMT_REVOCATIONS):
+    revocation_tree.insert(key_for(f"CAD-REVOCATA-{index}"))
+smt_insert_ms = (time.perf_counter() - start) * 1000 / SMT_REVOCATIONS
+revocation_root = revocation_tree.get_root()
+valid_key = key_for("CAD-ALICE-ERASMUS-FR001")
+non_membership = revocation_tree.get_proof(valid_key)
+
+start = time.perf_counter()
+smt_valid = SparseMerkleTree.verify_non_membership(valid_key, non_membership, revocation_root)
+smt_verify_ms = (time.perf_counter() - start) * 1000
+print(f"• {SMT_REVOCATIONS} revoche → inserimento medio {smt_insert_ms:.3f} ms (256 nodi per revoca)")
+print(f"• Prova di non revoca: {len(non_membership['siblings'])} hash, "
+      f"{len(json.dumps(non_membership).encode('utf-8'))} byte, verifica {smt_verify_ms:.3f} ms "
+      f"(credenziale valida: {smt_valid})")
 
 # ====== TEST: DIMENSIONI DELLE PRESENTAZIONI SELETTIVE ======
 def presentation_sizes(student_wallet: StudentWallet, credential_id: str, attribute_labels: list):
     print("\n=== TEST DIMENSIONE PRESENTAZIONI SELETTIVE ===")
-    print("Misuro la dimensione (in KiB) delle presentazioni JSON serializzate, generate con Merkle Proof.\n")
+    print("Misuro la dimensione (in KiB) delle presentazioni JSON serializzate, generate con Merkle Multiproof.\n")
 
     for n in [1, 3, 6, 10]:
         if n > len(attribute_labels):
@@ -219,12 +338,16 @@ def presentation_sizes(student_wallet: StudentWallet, credential_id: str, attrib
 
         fields_to_reveal = attribute_labels[:n]
         presentation = student_wallet.generate_presentation_proof(credential_id, fields_to_reveal)
+        paths_presentation = student_wallet.generate_presentation_proof(credential_id, fields_to_reveal,
+                                                                        proof_format="paths")
 
         # Serializza la presentazione in JSON
         serialized = json.dumps(presentation, indent=2).encode("utf-8")
         size_kib = len(serialized) / 1024
+        paths_size_kib = len(json.dumps(paths_presentation, indent=2).encode("utf-8")) / 1024
 
-        print(f"• {n} attributi rivelati → dimensione: {size_kib:.2f} KiB")
+        print(f"• {n} attributi rivelati → dimensione: {size_kib:.2f} KiB "
+              f"(una proof per attributo: {paths_size_kib:.2f} KiB)")
 
 # Etichette che corrispondono ai campi rivelabili dal wallet
 revealable_fields = [
@@ -239,4 +362,60 @@ alice_wallet.store_credential(credential_id, cred)
 # Esegui test delle dimensioni
 presentation_sizes(alice_wallet, credential_id, revealable_fields)
 
+# ====== TEST: VERIFICA DELLE PRESENTAZIONI (SINGOLA E BATCH) ======
+print("\n=== TEST VERIFICA PRESENTAZIONI ===")
+PRESENTATIONS = 200
+presentations = [
+    alice_wallet.generate_presentation_proof(credential_id, revealable_fields[:1 + i % len(revealable_fields)])
+    for i in range(PRESENTATIONS)
+]
+verifier = Verifier(blockchain, cache_size=0)
+
+start = time.perf_counter()
+single_verdicts = [verifier.verify_presentation(p) for p in presentations]
+single_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+batch_verdicts = verifier.verify_batch(presentations)
+batch_ms = (time.perf_counter() - start) * 1000
+
+cached_verifier = Verifier(blockchain)
+cached_verifier.verify_batch(presentations)
+start = time.perf_counter()
+cached_verdicts = [cached_verifier.verify_presentation(p) for p in presentations]
+cached_ms = (time.perf_counter() - start) * 1000
+
+print(f"• {PRESENTATIONS} presentazioni, una alla volta: {single_ms:.2f} ms "
+      f"({sum(v['valid'] for v in single_verdicts)} valide)")
+print(f"• {PRESENTATIONS} presentazioni con verify_batch: {batch_ms:.2f} ms "
+      f"({sum(v['valid'] for v in batch_verdicts)} valide)")
+print(f"• {PRESENTATIONS} presentazioni già verificate (cache): {cached_ms:.2f} ms "
+      f"({cached_verifier.cache.stats()['hits']} hit)\n")
+
+# ====== TEST: LIGHT CLIENT (SOLO INTESTAZIONI) ======
+print("=== TEST LIGHT CLIENT ===")
+full_chain_size = sum(len(encode_block(block)) for block in blockchain.chain)
+light_client = LightClient(mobility_ca, trusted_genesis_hash=blockchain.chain[0].block_hash)
+start = time.perf_counter()
+light_client.sync(blockchain)
+sync_ms = (time.perf_counter() - start) * 1000
+print(f"• {len(blockchain.chain)} blocchi: catena completa {full_chain_size / 1024:.2f} KiB, "
+      f"intestazioni {light_client.storage_size() / 1024:.2f} KiB "
+      f"({light_client.storage_size() / len(light_client.headers):.0f} byte per blocco)")
+print(f"• Sincronizzazione e verifica delle intestazioni: {sync_ms:.2f} ms\n")
+
+# ====== TEST: KEY PROVIDER (CACHE DELLE CHIAVI SU DISCO) ======
+print("=== TEST KEY PROVIDER ===")
+KEY_COUNT = 10
+with tempfile.TemporaryDirectory() as key_dir:
+    timings = []
+    for _ in range(2):
+        provider = KeyProvider(cache_dir=key_dir)
+        start = time.perf_counter()
+        for i in range(KEY_COUNT):
+            provider.get_private_key(label=f"wallet:studente-{i}")
+        timings.append((time.perf_counter() - start) * 1000)
+print(f"• {KEY_COUNT} chiavi RSA-2048 generate: {timings[0]:.2f} ms, "
+      f"lette dalla cache su disco: {timings[1]:.2f} ms\n")
+
 print(" Test completato con successo.\n")
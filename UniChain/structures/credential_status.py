@@ -0,0 +1,34 @@
+from UniChain.utils.validator import Validator
+
+
+class CredentialStatus:
+    """
+    Riferimento allo stato di revoca della credenziale nella status list
+    pubblicata dall'università emittente (stile W3C StatusList).
+    """
+
+    def __init__(self, status_list_index: int, status_list_issuer: str, status_purpose: str = "revocation"):
+        """
+        :param status_list_index: posizione della credenziale nella status list (Transaction.status_index)
+        :param status_list_issuer: university_id dell'emittente che pubblica la lista
+        :param status_purpose: scopo della lista (default "revocation")
+        """
+        if not isinstance(status_list_index, int) or status_list_index < 0:
+            raise ValueError("statusListIndex deve essere un intero non negativo.")
+        self.status_list_index = status_list_index
+        self.status_list_issuer = Validator.validate_string(status_list_issuer, "statusListCredential")
+        self.status_purpose = status_purpose
+
+    def to_dict(self) -> dict:
+        """
+        Serializza lo stato in un dizionario JSON-compatibile.
+        """
+        return {
+            "type": "StatusListEntry",
+            "statusPurpose": self.status_purpose,
+            "statusListIndex": str(self.status_list_index),
+            "statusListCredential": self.status_list_issuer
+        }
+
+    def __repr__(self):
+        return f"CredentialStatus({self.status_list_issuer}, {self.status_list_index})"
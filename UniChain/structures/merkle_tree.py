@@ -1,6 +1,8 @@
 import hashlib
 from typing import List, Tuple
 
+DIGEST_SIZE = 32
+
 
 def sha256(data: bytes) -> str:
     """
@@ -9,46 +11,104 @@ def sha256(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def _combine(left: bytes, right: bytes) -> bytes:
+    """
+    Nodo interno: SHA-256 della concatenazione dei due digest grezzi (64 byte).
+    """
+    return hashlib.sha256(left + right).digest()
+
+
+def _combine_legacy(left: bytes, right: bytes) -> bytes:
+    """
+    Nodo interno nello schema storico: SHA-256 della concatenazione delle due
+    stringhe esadecimali (128 caratteri). Usato solo per le root già ancorate on-chain.
+    """
+    return hashlib.sha256((left.hex() + right.hex()).encode()).digest()
+
+
 class MerkleTree:
     """
     Implementazione di un Merkle Tree basato su hash SHA-256.
     Permette di:
     - costruire l'albero da coppie (label, valore)
     - ottenere la root dell'albero
-    - generare una proof per un campo specifico
-    - verificare l'inclusione con `verify_proof`
+    - generare una proof per un campo specifico, o una multiproof per più campi
+    - verificare l'inclusione con `verify_proof` / `verify_multiproof`
+
+    I nodi sono digest grezzi da 32 byte memorizzati in un unico buffer contiguo,
+    livello per livello (foglie prima, root per ultima); l'esadecimale compare solo
+    nei valori restituiti (root e proof). Un indice label → posizione rende la
+    ricerca della foglia O(1).
+
+    Con `legacy=True` i nodi interni sono calcolati con lo schema storico
+    (concatenazione esadecimale), per ricostruire root già ancorate on-chain.
     """
 
-    def __init__(self, leaves: List[Tuple[str, str]]):
+    def __init__(self, leaves: List[Tuple[str, str]], legacy: bool = False):
         """
         :param leaves: lista di tuple (label, value) in chiaro
+        :param legacy: True per usare lo schema storico di combinazione dei nodi
         """
-        self.leaves = [(label, sha256(value.encode())) for label, value in leaves]
-        self.tree = []
-        self._build_tree()
+        self.legacy = legacy
+        self._labels = [label for label, _ in leaves]
+        self._index = {}  # label → indice della prima foglia con quella label
+        for i, label in enumerate(self._labels):
+            self._index.setdefault(label, i)
+
+        self._nodes = bytearray()      # tutti i livelli, contigui
+        self._level_offsets = []       # indice (in nodi) del primo nodo di ogni livello
+        self._level_sizes = []         # numero di nodi per livello
+        self._build_tree([hashlib.sha256(value.encode()).digest() for _, value in leaves])
 
-    def _build_tree(self):
+    def _build_tree(self, level: List[bytes]):
         """
         Costruisce il Merkle Tree dal basso verso l'alto.
         """
-        level = [leaf_hash for _, leaf_hash in self.leaves]
-        self.tree.append(level)
+        combine = _combine_legacy if self.legacy else _combine
+        offset = 0
+        while True:
+            self._level_offsets.append(offset)
+            self._level_sizes.append(len(level))
+            self._nodes += b"".join(level)
+            offset += len(level)
+            if len(level) <= 1:
+                break
+            level = [combine(level[i], level[i + 1] if i + 1 < len(level) else level[i])
+                     for i in range(0, len(level), 2)]
 
-        while len(level) > 1:
-            new_level = []
-            for i in range(0, len(level), 2):
-                left = level[i]
-                right = level[i + 1] if i + 1 < len(level) else left
-                combined = sha256((left + right).encode())
-                new_level.append(combined)
-            level = new_level
-            self.tree.append(level)
+    def _node(self, depth: int, index: int) -> bytes:
+        """
+        Digest grezzo del nodo `index` al livello `depth` (0 = foglie).
+        """
+        start = (self._level_offsets[depth] + index) * DIGEST_SIZE
+        return bytes(self._nodes[start:start + DIGEST_SIZE])
+
+    @property
+    def leaves(self) -> List[Tuple[str, str]]:
+        """
+        Coppie (label, hash esadecimale della foglia).
+        """
+        return [(label, self._node(0, i).hex()) for i, label in enumerate(self._labels)]
+
+    def __len__(self):
+        return len(self._labels)
+
+    def index_of(self, label: str) -> int:
+        """
+        Posizione della foglia identificata da `label`.
+        """
+        index = self._index.get(label)
+        if index is None:
+            raise ValueError("Campo non trovato tra le foglie.")
+        return index
 
     def get_root(self) -> str:
         """
         Restituisce la Merkle Root dell'albero.
         """
-        return self.tree[-1][0] if self.tree else None
+        if not self._labels:
+            return None
+        return self._node(len(self._level_sizes) - 1, 0).hex()
 
     def get_proof(self, label: str) -> List[Tuple[str, str]]:
         """
@@ -56,35 +116,131 @@ class MerkleTree:
         :param label: nome dell'attributo
         :return: lista di coppie (direzione, hash) dove direzione è 'left' o 'right'
         """
-        index = next((i for i, (l, _) in enumerate(self.leaves) if l == label), None)
-        if index is None:
-            raise ValueError("Campo non trovato tra le foglie.")
+        index = self.index_of(label)
 
         proof = []
-        for level in self.tree[:-1]:  # tutte le righe tranne la root
+        for depth in range(len(self._level_sizes) - 1):  # tutti i livelli tranne la root
             sibling_index = index ^ 1
-            if sibling_index < len(level):
+            if sibling_index < self._level_sizes[depth]:
                 direction = "left" if sibling_index < index else "right"
-                proof.append((direction, level[sibling_index]))
+                proof.append((direction, self._node(depth, sibling_index).hex()))
+            else:
+                # Livello dispari: l'ultimo nodo viene combinato con se stesso
+                proof.append(("right", self._node(depth, index).hex()))
             index //= 2
         return proof
 
+    def get_multiproof(self, labels: List[str]) -> dict:
+        """
+        Genera una multiproof compatta per più foglie: un unico insieme deduplicato
+        di hash fratelli, sufficiente a ricostruire la root partendo dalle foglie indicate.
+        I nodi ricavabili dalle foglie rivelate (o da altri nodi già calcolati) non
+        vengono inclusi, quindi la dimensione cresce con l'unione dei percorsi.
+
+        :param labels: nomi degli attributi da includere
+        :return: dizionario con `leafCount`, `leafIndices` (allineati a `labels`)
+                 e `hashes` (fratelli in esadecimale, livello per livello, per indice crescente)
+        """
+        leaf_indices = [self.index_of(label) for label in labels]
+
+        hashes = []
+        known = sorted(set(leaf_indices))
+        for depth in range(len(self._level_sizes) - 1):
+            known_set = set(known)
+            for index in known:
+                sibling_index = index ^ 1
+                if sibling_index in known_set or sibling_index >= self._level_sizes[depth]:
+                    # Fratello già noto, oppure ultimo nodo di un livello dispari (duplicato)
+                    continue
+                hashes.append(self._node(depth, sibling_index).hex())
+            known = sorted({index // 2 for index in known})
+
+        return {"leafCount": len(self._labels), "leafIndices": leaf_indices, "hashes": hashes}
+
     @staticmethod
-    def verify_proof(leaf_value: str, proof: List[Tuple[str, str]], root: str) -> bool:
+    def verify_multiproof(leaf_values: List[str], multiproof: dict, root: str, legacy: bool = False) -> bool:
+        """
+        Verifica una multiproof in un'unica passata dal basso verso l'alto:
+        ogni nodo interno dell'unione dei percorsi viene calcolato una sola volta.
+
+        :param leaf_values: valori in chiaro, allineati a `multiproof["leafIndices"]`
+        :param multiproof: dizionario prodotto da `get_multiproof`
+        :param root: Merkle root attesa
+        :param legacy: True per verificare con lo schema storico di combinazione
+        :return: True se tutte le foglie sono incluse nella root
+        """
+        combine = _combine_legacy if legacy else _combine
+        try:
+            size = multiproof["leafCount"]
+            leaf_indices = multiproof["leafIndices"]
+            hashes = iter(bytes.fromhex(h) for h in multiproof["hashes"])
+            if len(leaf_indices) != len(leaf_values) or not leaf_indices:
+                return False
+
+            current = {}
+            for index, value in zip(leaf_indices, leaf_values):
+                if not 0 <= index < size:
+                    return False
+                digest = hashlib.sha256(value.encode()).digest()
+                if current.setdefault(index, digest) != digest:
+                    return False  # stessa foglia con valori diversi
+
+            while size > 1:
+                parents = {}
+                for index in sorted(current):
+                    parent = index // 2
+                    if parent in parents:
+                        continue  # già combinato insieme al fratello sinistro
+                    sibling_index = index ^ 1
+                    if sibling_index in current:
+                        sibling = current[sibling_index]
+                    elif sibling_index >= size:
+                        sibling = current[index]
+                    else:
+                        sibling = next(hashes)
+                    if index % 2:
+                        parents[parent] = combine(sibling, current[index])
+                    else:
+                        parents[parent] = combine(current[index], sibling)
+                current = parents
+                size = (size + 1) // 2
+
+            if next(hashes, None) is not None:
+                return False  # hash in eccesso: proof non canonica
+        except (KeyError, ValueError, TypeError, StopIteration):
+            return False
+        return current[0].hex() == root
+
+    @staticmethod
+    def verify_proof(leaf_value: str, proof: List[Tuple[str, str]], root: str, legacy: bool = False) -> bool:
         """
         Verifica che il valore fornito sia incluso nella Merkle root, tramite la proof.
         :param leaf_value: valore originale dell'attributo (non hashato)
         :param proof: lista di (direzione, hash)
         :param root: Merkle root attesa
+        :param legacy: True per verificare con lo schema storico di combinazione
         :return: True se il valore è valido rispetto alla root
         """
-        current_hash = sha256(leaf_value.encode())
-        for direction, sibling_hash in proof:
-            if direction == "left":
-                current_hash = sha256((sibling_hash + current_hash).encode())
-            else:
-                current_hash = sha256((current_hash + sibling_hash).encode())
-        return current_hash == root
+        combine = _combine_legacy if legacy else _combine
+        try:
+            current = hashlib.sha256(leaf_value.encode()).digest()
+            for direction, sibling_hash in proof:
+                sibling = bytes.fromhex(sibling_hash)
+                if direction == "left":
+                    current = combine(sibling, current)
+                else:
+                    current = combine(current, sibling)
+        except (ValueError, TypeError):
+            return False
+        return current.hex() == root
+
+    @staticmethod
+    def verify_legacy_proof(leaf_value: str, proof: List[Tuple[str, str]], root: str) -> bool:
+        """
+        Verifica di compatibilità per proof e root prodotte con lo schema storico
+        (nodi interni calcolati sulla concatenazione esadecimale).
+        """
+        return MerkleTree.verify_proof(leaf_value, proof, root, legacy=True)
 
     def __repr__(self):
         return f"MerkleTree(root={self.get_root()})"
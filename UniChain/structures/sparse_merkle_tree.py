@@ -0,0 +1,163 @@
+import hashlib
+
+DEPTH = 256
+EMPTY_LEAF = bytes(32)
+
+
+def _hash(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def key_for(identifier: str) -> bytes:
+    """
+    Chiave dell'albero: SHA-256 dell'identificativo (es. credential_unique_id).
+    """
+    return _hash(identifier.encode("utf-8"))
+
+
+def _leaf_hash(key: bytes) -> bytes:
+    # Prefisso 0x00: la preimmagine di una foglia (33 byte) non è confondibile con un nodo interno (64 byte)
+    return _hash(b"\x00" + key)
+
+
+def _default_hashes():
+    """
+    Hash dei sotto-alberi vuoti per ogni profondità (DEPTH = foglia vuota).
+    """
+    defaults = [EMPTY_LEAF] * (DEPTH + 1)
+    for depth in range(DEPTH - 1, -1, -1):
+        defaults[depth] = _hash(defaults[depth + 1] + defaults[depth + 1])
+    return defaults
+
+
+DEFAULT_HASHES = _default_hashes()
+EMPTY_ROOT = DEFAULT_HASHES[0].hex()
+
+
+class SparseMerkleTree:
+    """
+    Sparse Merkle Tree di profondità 256 usato come registro delle revoche.
+
+    Ogni credenziale occupa la foglia in posizione SHA-256(credential_unique_id):
+    la foglia vale H(0x00 || chiave) se la credenziale è revocata, altrimenti è vuota.
+    Sono memorizzati solo i nodi diversi dal valore di default del loro livello, per
+    cui un inserimento aggiorna esattamente 256 nodi e le proof contengono solo i
+    fratelli non vuoti (una bitmap indica quali livelli sono presenti).
+
+    Lo stesso formato di proof dimostra sia l'appartenenza (credenziale revocata)
+    sia la non appartenenza (credenziale NON revocata).
+    """
+
+    def __init__(self):
+        self._nodes = {}   # (profondità, prefisso della chiave) → hash, solo nodi non di default
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _node(self, depth: int, prefix: int, overlay=None) -> bytes:
+        if overlay is not None and (depth, prefix) in overlay:
+            return overlay[(depth, prefix)]
+        return self._nodes.get((depth, prefix), DEFAULT_HASHES[depth])
+
+    def _updates(self, keys, overlay):
+        """
+        Calcola in `overlay` i nodi modificati dall'inserimento delle chiavi.
+        """
+        for key in keys:
+            key_int = int.from_bytes(key, "big")
+            if self._node(DEPTH, key_int, overlay) != EMPTY_LEAF:
+                continue  # già presente
+            current = _leaf_hash(key)
+            overlay[(DEPTH, key_int)] = current
+            prefix = key_int
+            for depth in range(DEPTH, 0, -1):
+                sibling = self._node(depth, prefix ^ 1, overlay)
+                current = _hash(sibling + current) if prefix & 1 else _hash(current + sibling)
+                prefix >>= 1
+                overlay[(depth - 1, prefix)] = current
+        return overlay
+
+    def get_root(self) -> str:
+        return self._node(0, 0).hex()
+
+    def root_with(self, keys) -> str:
+        """
+        Root che si otterrebbe inserendo le chiavi, senza modificare l'albero.
+        """
+        overlay = self._updates(keys, {})
+        return self._node(0, 0, overlay).hex()
+
+    def insert(self, key: bytes):
+        """
+        Inserisce una chiave (revoca): aggiorna i 256 nodi del percorso verso la root.
+        """
+        overlay = self._updates([key], {})
+        for position, value in overlay.items():
+            if value == DEFAULT_HASHES[position[0]]:
+                self._nodes.pop(position, None)
+            else:
+                self._nodes[position] = value
+        if overlay:
+            self._size += 1
+
+    def contains(self, key: bytes) -> bool:
+        return (DEPTH, int.from_bytes(key, "big")) in self._nodes
+
+    def get_proof(self, key: bytes) -> dict:
+        """
+        Proof compressa di appartenenza o non appartenenza della chiave.
+
+        :return: dizionario con `key`, `member`, `bitmap` (bit i = fratello non vuoto
+                 alla profondità i+1) e `siblings` (solo i fratelli non vuoti, dalla root verso la foglia)
+        """
+        key_int = int.from_bytes(key, "big")
+        bitmap = 0
+        siblings = []
+        for depth in range(1, DEPTH + 1):
+            prefix = key_int >> (DEPTH - depth)
+            sibling = self._node(depth, prefix ^ 1)
+            if sibling != DEFAULT_HASHES[depth]:
+                bitmap |= 1 << (depth - 1)
+                siblings.append(sibling.hex())
+        return {
+            "key": key.hex(),
+            "member": self.contains(key),
+            "bitmap": bitmap.to_bytes(DEPTH // 8, "big").hex(),
+            "siblings": siblings,
+        }
+
+    @staticmethod
+    def verify_proof(key: bytes, proof: dict, root: str) -> bool:
+        """
+        Verifica una proof rispetto alla root; l'esito dipende da `proof["member"]`
+        (True: la chiave è presente, False: la chiave è assente).
+        """
+        try:
+            if bytes.fromhex(proof["key"]) != key:
+                return False
+            bitmap = int.from_bytes(bytes.fromhex(proof["bitmap"]), "big")
+            siblings = [bytes.fromhex(s) for s in proof["siblings"]]
+            if len(siblings) != bin(bitmap).count("1"):
+                return False
+
+            key_int = int.from_bytes(key, "big")
+            current = _leaf_hash(key) if proof["member"] else EMPTY_LEAF
+            remaining = iter(reversed(siblings))
+            for depth in range(DEPTH, 0, -1):
+                prefix = key_int >> (DEPTH - depth)
+                sibling = next(remaining) if bitmap >> (depth - 1) & 1 else DEFAULT_HASHES[depth]
+                current = _hash(sibling + current) if prefix & 1 else _hash(current + sibling)
+        except (KeyError, ValueError, TypeError):
+            return False
+        return current.hex() == root
+
+    @staticmethod
+    def verify_non_membership(key: bytes, proof: dict, root: str) -> bool:
+        """
+        True se la proof dimostra che la chiave NON è presente nell'albero.
+        """
+        return proof.get("member") is False and SparseMerkleTree.verify_proof(key, proof, root)
+
+    def __repr__(self):
+        return f"SparseMerkleTree(size={self._size}, root={self.get_root()[:16]}...)"
@@ -0,0 +1,171 @@
+import threading
+
+from UniChain.blockchain.block import Block
+from UniChain.blockchain.block_header import BlockHeader
+from UniChain.utils.crypto_suite import verify_with_pem
+from UniChain.utils.listeners import weak_callback, run_fallback
+
+
+class LightClient:
+    """
+    Light client della blockchain UniChain per i verificatori.
+
+    Conserva solo la catena delle intestazioni (poche centinaia di byte per blocco),
+    scaricata da un nodo completo con `sync`. Ogni intestazione è accettata solo se
+    è collegata alla precedente e firmata da un'università presente nel registro
+    della MobilityCA; le transazioni sono poi verificate tramite Merkle proof di
+    inclusione rispetto al `tx_root` dell'intestazione.
+    """
+
+    def __init__(self, mobility_ca, trusted_genesis_hash=None):
+        """
+        :param mobility_ca: MobilityCA da cui leggere le chiavi pubbliche dei proponenti
+        :param trusted_genesis_hash: hash atteso del blocco di genesi (opzionale);
+                                     se assente si accetta quello del primo nodo contattato
+        """
+        self.mobility_ca = mobility_ca
+        self.trusted_genesis_hash = trusted_genesis_hash
+        self.headers = []
+        self._lock = threading.Lock()
+        # Sottoscrittori: evento → riferimenti deboli alle callback
+        self._listeners = {"header_appended": [], "revocations_updated": []}
+
+    # --- Eventi ---
+
+    def subscribe(self, event, callback, on_error=None):
+        """
+        Registra una callback per un evento del light client:
+        - "header_appended": callback(header) per ogni intestazione accettata,
+        - "revocations_updated": callback(header) quando cambia la `revocation_root`.
+        I metodi sono mantenuti con riferimenti deboli e `on_error` ha lo stesso
+        significato che in `Blockchain.subscribe`.
+        """
+        if event not in self._listeners:
+            raise ValueError(f"Evento del light client sconosciuto: {event}")
+        self._listeners[event].append((weak_callback(callback), weak_callback(on_error)))
+
+    def _notify(self, event, *args):
+        listeners = self._listeners[event]
+        alive = []
+        for ref, on_error in listeners:
+            callback = ref()
+            if callback is None:
+                continue
+            alive.append((ref, on_error))
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"[LightClient] Errore nella notifica dell'evento {event}: {e}")
+                run_fallback(on_error, "LightClient")
+        listeners[:] = alive
+
+    # --- Sincronizzazione ---
+
+    def _proposer_keys(self) -> dict:
+        """
+        university_id → chiavi pubbliche PEM di tutti i certificati emessi.
+        Un blocco resta valido anche se il proponente è stato revocato in seguito.
+        """
+        return self.mobility_ca.get_registry_snapshot().keys_by_university
+
+    def _check_header(self, header: BlockHeader, proposer_keys: dict):
+        """
+        Controlla numero, collegamento e firma dell'intestazione rispetto alla cima locale.
+
+        :raises ValueError: se l'intestazione non è valida
+        """
+        expected_number = len(self.headers)
+        if header.block_number != expected_number:
+            raise ValueError(f"Intestazione #{header.block_number} fuori sequenza (attesa #{expected_number}).")
+
+        if expected_number == 0:
+            if header.previous_hash != "0":
+                raise ValueError("Il blocco di genesi deve avere previous_hash '0'.")
+            if self.trusted_genesis_hash is not None and header.block_hash != self.trusted_genesis_hash:
+                raise ValueError("Il blocco di genesi non corrisponde a quello atteso.")
+            return
+
+        if header.previous_hash != self.headers[-1].block_hash:
+            raise ValueError(f"Intestazione #{header.block_number}: previous_hash non coerente.")
+
+        payload = header.get_payload_to_sign()
+        try:
+            signature = bytes.fromhex(header.signature)
+        except (TypeError, ValueError):
+            signature = None
+        if signature is None or not any(verify_with_pem(pem, signature, payload, header.signature_suite)
+                                        for pem in proposer_keys.get(header.block_proposer, ())):
+            raise ValueError(f"Intestazione #{header.block_number}: firma del proponente "
+                             f"{header.block_proposer} non valida.")
+
+    def append_headers(self, encoded_headers) -> int:
+        """
+        Verifica e aggiunge intestazioni codificate (`BlockHeader.to_bytes`).
+        Le intestazioni sono accettate fino alla prima non valida.
+
+        :return: numero di intestazioni aggiunte
+        :raises ValueError: se un'intestazione non è valida (le precedenti restano accettate)
+        """
+        proposer_keys = None
+        added = 0
+        with self._lock:
+            for data in encoded_headers:
+                header = BlockHeader.from_bytes(data)
+                if header.block_number > 0 and proposer_keys is None:
+                    proposer_keys = self._proposer_keys()
+                self._check_header(header, proposer_keys)
+
+                previous_root = self.headers[-1].revocation_root if self.headers else None
+                self.headers.append(header)
+                added += 1
+                self._notify("header_appended", header)
+                if header.revocation_root != previous_root:
+                    self._notify("revocations_updated", header)
+        return added
+
+    def sync(self, full_node) -> int:
+        """
+        Scarica e verifica le intestazioni mancanti da un nodo completo.
+
+        :param full_node: oggetto che espone `get_headers(start)` (es. Blockchain)
+        :return: numero di nuove intestazioni
+        """
+        added = self.append_headers(full_node.get_headers(len(self.headers)))
+        print(f"[LightClient] Sincronizzate {added} intestazioni (altezza {self.height}).")
+        return added
+
+    # --- Interrogazione ---
+
+    @property
+    def height(self) -> int:
+        return len(self.headers) - 1
+
+    def get_header(self, block_number):
+        if isinstance(block_number, int) and 0 <= block_number < len(self.headers):
+            return self.headers[block_number]
+        return None
+
+    def get_latest_header(self):
+        return self.headers[-1] if self.headers else None
+
+    def verify_inclusion(self, transaction, proof, block_number: int) -> bool:
+        """
+        Verifica che la transazione, firma inclusa, sia contenuta nel blocco indicato,
+        tramite la Merkle proof rispetto al `tx_root` dell'intestazione.
+        """
+        header = self.get_header(block_number)
+        if header is None:
+            return False
+        try:
+            return Block.verify_transaction_proof(transaction, proof, header.tx_root)
+        except (TypeError, ValueError):
+            return False
+
+    def storage_size(self) -> int:
+        """
+        Byte occupati dalle intestazioni nella loro codifica binaria.
+        """
+        return sum(len(header.to_bytes()) for header in self.headers)
+
+    def __repr__(self):
+        return f"LightClient(altezza={self.height})"
@@ -1,6 +1,6 @@
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.hazmat.primitives import serialization
+from UniChain.structures.credential_status import CredentialStatus
+from UniChain.utils.crypto_suite import get_suite
+from UniChain.utils.key_provider import get_default_key_provider
 
 
 class University:
@@ -10,14 +10,22 @@ class University:
     Inoltre, contribuisce alla rete blockchain permissioned guadagnando Mobility Trust Points (MTP).
     """
 
-    def __init__(self, university_id, official_name, university_code, location, mobility_ca):
+    def __init__(self, university_id, official_name, university_code, location, mobility_ca,
+                 crypto_suite=None, key_provider=None):
+        """
+        :param crypto_suite: nome della suite di firma (default RSA-2048-PKCS1v15-SHA256);
+                             Ed25519 ed ECDSA-P256-SHA256 riducono il costo di firma e verifica
+        :param key_provider: KeyProvider da cui ottenere la chiave privata (default: provider globale)
+        """
         self.university_id = university_id
         self.official_name = official_name
         self.university_code = university_code
         self.location = location
         self.mobility_ca = mobility_ca
 
-        # Chiave RSA privata/pubblica
+        # Suite crittografica e coppia di chiavi privata/pubblica
+        self._crypto_suite = get_suite(crypto_suite)
+        self._key_provider = key_provider or get_default_key_provider()
         self._private_key = self._generate_private_key()
         self._public_key = self._private_key.public_key()
 
@@ -34,12 +42,14 @@ class University:
     def get_private_key(self):
         return self._private_key
 
-    @staticmethod
-    def _generate_private_key():
+    def get_crypto_suite(self):
+        return self._crypto_suite
+
+    def _generate_private_key(self):
         """
-        Genera una chiave privata RSA a 2048 bit.
+        Ottiene dal KeyProvider una chiave privata secondo la suite crittografica dell'università.
         """
-        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return self._key_provider.get_private_key(self._crypto_suite, label=f"university:{self.university_id}")
 
     def request_accreditation(self):
         """
@@ -55,15 +65,53 @@ class University:
         )
         print(f"[University] Certificato ricevuto per {self.university_id}")
 
+    @staticmethod
+    def request_accreditation_batch(universities, workers=None):
+        """
+        Richiede in un'unica operazione l'accreditamento di più università presso la
+        stessa MobilityCA; le università rifiutate restano senza certificato.
+
+        :return: esiti della MobilityCA, nello stesso ordine di `universities`
+        """
+        if not universities:
+            return []
+        mobility_ca = universities[0].mobility_ca
+        if any(u.mobility_ca is not mobility_ca for u in universities):
+            raise ValueError("Le università del batch devono riferirsi alla stessa MobilityCA.")
+
+        results = mobility_ca.issue_certificates_batch([{
+            "public_key": u._public_key,
+            "university_id": u.university_id,
+            "official_name": u.official_name,
+            "university_code": u.university_code,
+            "location": u.location,
+            "university_obj": u,
+        } for u in universities], workers)
+
+        root_cert = mobility_ca.get_root_certificate()
+        for university, result in zip(universities, results):
+            if result["certificate"] is not None:
+                university._certificate, university._root_cert = result["certificate"], root_cert
+                print(f"[University] Certificato ricevuto per {university.university_id}")
+            else:
+                print(f"[University] Accreditamento rifiutato per {university.university_id}: {result['error']}")
+        return results
+
     def sign_message(self, message: bytes) -> bytes:
         """
         Firma un messaggio arbitrario usando la chiave privata dell’università.
         """
-        return self._private_key.sign(
-            message,
-            padding=padding.PKCS1v15(),
-            algorithm=hashes.SHA256()
-        )
+        return self._crypto_suite.sign(self._private_key, message)
+
+    def allocate_credential_status(self, blockchain) -> CredentialStatus:
+        """
+        Riserva sulla catena il prossimo indice della propria status list di revoca
+        per una nuova credenziale. Il risultato va impostato nella credenziale
+        (`credentialStatus`) e, come `status_index`, nella transazione di EMISSIONE.
+        """
+        index = blockchain.allocate_status_index(self.university_id)
+        print(f"[University] {self.official_name}: indice {index} riservato nella status list di revoca.")
+        return CredentialStatus(index, self.university_id)
 
     def get_certificate(self):
         return self._certificate
@@ -75,10 +123,7 @@ class University:
         """
         Restituisce la chiave pubblica in formato PEM serializzato.
         """
-        return self._public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        ).decode()
+        return self._crypto_suite.serialize_public_key(self._public_key)
 
     def add_trust_point(self, points=1, reason="partecipazione valida"):
         """
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerificationCache:
+    """
+    Cache limitata (LRU) e con scadenza (TTL) degli esiti positivi di verifica
+    delle presentazioni.
+
+    Ogni voce è indicizzata anche per credenziale e per università emittente, così
+    che una REVOCA della credenziale o la revoca del certificato dell'emittente
+    invalidino esattamente le voci interessate. Un contatore di epoca evita che un
+    esito calcolato prima di una revoca venga memorizzato dopo di essa.
+    """
+
+    def __init__(self, maxsize=4096, ttl=300.0):
+        """
+        :param maxsize: numero massimo di esiti memorizzati
+        :param ttl: durata massima (secondi) di un esito in cache
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()   # chiave → (scadenza, esito, credential_id, emittente)
+        self._by_credential = {}        # credential_id → chiavi
+        self._by_issuer = {}            # university_id → chiavi
+        self._lock = threading.Lock()
+        self.epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """
+        Restituisce l'esito memorizzato per la chiave, se presente e non scaduto.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, verdict, credential_id, issuer, epoch):
+        """
+        Memorizza un esito positivo.
+
+        :param epoch: valore di `self.epoch` letto prima di iniziare la verifica; se nel
+                      frattempo c'è stata un'invalidazione l'esito non viene memorizzato
+        """
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, verdict, credential_id, issuer)
+            self._by_credential.setdefault(credential_id, set()).add(key)
+            self._by_issuer.setdefault(issuer, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key):
+        _, _, credential_id, issuer = self._entries.pop(key)
+        for index, owner in ((self._by_credential, credential_id), (self._by_issuer, issuer)):
+            keys = index.get(owner)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[owner]
+
+    def _invalidate(self, index, owner):
+        with self._lock:
+            self.epoch += 1
+            for key in list(index.get(owner, ())):
+                self._discard(key)
+                self.invalidations += 1
+
+    def invalidate_credential(self, credential_id, *_):
+        """
+        Rimuove gli esiti della credenziale (callback per l'evento "credential_revoked").
+        """
+        self._invalidate(self._by_credential, credential_id)
+
+    def invalidate_issuer(self, university_id):
+        """
+        Rimuove gli esiti delle credenziali emesse dall'università (callback di revoca del certificato).
+        """
+        self._invalidate(self._by_issuer, university_id)
+
+    def clear(self):
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self._by_credential.clear()
+            self._by_issuer.clear()
+
+    def stats(self) -> dict:
+        """
+        Contatori di utilizzo della cache.
+        """
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "invalidations": self.invalidations}
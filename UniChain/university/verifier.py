@@ -1,35 +1,87 @@
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+import copy
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from UniChain.blockchain.status_list import StatusList
+from UniChain.blockchain.transaction import Transaction
 from UniChain.structures.merkle_tree import MerkleTree
+from UniChain.structures.sparse_merkle_tree import SparseMerkleTree, key_for
+from UniChain.university.verification_cache import VerificationCache
+from UniChain.utils.crypto_suite import verify_with_pem
 
 
 class Verifier:
     """
     Verifica una credenziale accademica confrontando dati e firma con quelli registrati on-chain.
     Include verifica firma, Merkle proof, integrità e stato di revoca.
+
+    `verify_presentation` esegue tutti i controlli su una Presentation Proof e
+    restituisce un esito strutturato; `verify_batch` fa lo stesso su molte
+    presentazioni, condividendo le letture della catena e del registro e
+    distribuendo le verifiche di firma su un pool di thread.
+
+    Gli esiti positivi sono memorizzati in una `VerificationCache`, invalidata
+    dalla REVOCA della credenziale sulla catena e dalla revoca del certificato
+    dell'università emittente.
+
+    In modalità light client (`light_client` al posto di `blockchain`) il
+    verificatore conosce solo le intestazioni dei blocchi: la presentazione deve
+    allegare la transazione di EMISSIONE con la sua prova di inclusione
+    (`issuanceProof`) e la prova di non revoca (`revocationProof`).
     """
 
-    def __init__(self, blockchain):
+    def __init__(self, blockchain=None, max_workers=None, cache_size=4096, cache_ttl=300.0, light_client=None):
+        """
+        :param blockchain: istanza di Blockchain (nodo completo)
+        :param max_workers: numero di thread per le verifiche di firma di `verify_batch`
+        :param cache_size: numero massimo di esiti positivi memorizzati (0 per disattivare la cache)
+        :param cache_ttl: durata massima (secondi) di un esito in cache
+        :param light_client: LightClient sincronizzato, alternativo a `blockchain`
+        """
+        if (blockchain is None) == (light_client is None):
+            raise ValueError("Il Verifier richiede una Blockchain oppure un LightClient.")
         self.blockchain = blockchain  # Istanza di Blockchain
+        self.light_client = light_client
+        self.mobility_ca = blockchain.mobility_ca if blockchain is not None else light_client.mobility_ca
+        self.max_workers = max_workers
+        self._executor = None
+
+        self.cache = VerificationCache(cache_size, cache_ttl) if cache_size else None
+        if self.cache is not None:
+            # Se un'invalidazione puntuale fallisce la cache viene svuotata per intero:
+            # meglio perdere gli esiti memorizzati che servirne uno revocato
+            if blockchain is not None:
+                blockchain.subscribe("credential_revoked", self.cache.invalidate_credential,
+                                     on_error=self.cache.clear)
+            else:
+                # Il light client vede solo la nuova root delle revoche, non le credenziali revocate
+                light_client.subscribe("revocations_updated", self._on_revocations_updated,
+                                       on_error=self.cache.clear)
+            self.mobility_ca.add_revocation_listener(self.cache.invalidate_issuer, on_error=self.cache.clear)
+
+    @property
+    def is_light(self) -> bool:
+        return self.light_client is not None
+
+    def _on_revocations_updated(self, header):
+        self.cache.clear()
 
     @staticmethod
-    def verify_student_signature(merkle_root: str, signature_hex: str, public_key_pem: str) -> bool:
+    def verify_student_signature(merkle_root: str, signature_hex: str, public_key_pem: str,
+                                 signature_suite: str = None) -> bool:
         """
         Verifica che la firma dello studente sulla Merkle Root sia valida.
         :param merkle_root: stringa della root
         :param signature_hex: firma digitale in esadecimale
         :param public_key_pem: chiave pubblica dello studente in PEM
+        :param signature_suite: suite dichiarata nella presentazione (opzionale)
         """
         try:
-            public_key = serialization.load_pem_public_key(public_key_pem.encode())
             signature = bytes.fromhex(signature_hex)
-            public_key.verify(
-                signature,
-                merkle_root.encode(),
-                padding.PKCS1v15(),
-                hashes.SHA256()
-            )
-            return True
+            if verify_with_pem(public_key_pem, signature, merkle_root.encode(), signature_suite):
+                return True
+            print("[Verifier] Firma studente non valida.")
+            return False
         except Exception as e:
             print("[Verifier] Firma studente non valida:", e)
             return False
@@ -38,26 +90,345 @@ class Verifier:
     def verify_merkle_proof(revealed_value: str, proof: list, merkle_root: str) -> bool:
         """
         Verifica la Merkle Proof per un attributo rivelato.
+        Le root ancorate on-chain con lo schema storico restano verificabili.
         """
-        return MerkleTree.verify_proof(revealed_value, proof, merkle_root)
+        return (MerkleTree.verify_proof(revealed_value, proof, merkle_root)
+                or MerkleTree.verify_legacy_proof(revealed_value, proof, merkle_root))
 
-    def check_merkle_root_on_chain(self, credential_id: str, claimed_merkle_root: str) -> bool:
+    @staticmethod
+    def verify_merkle_multiproof(revealed_attributes: dict, multiproof: dict, merkle_root: str) -> bool:
+        """
+        Verifica in un'unica passata la multiproof di tutti gli attributi rivelati.
+
+        :param revealed_attributes: mappa label → valore dichiarato
+        :param multiproof: `merkleMultiproof` della presentazione (labels, leafIndices, leafCount, hashes)
+        :param merkle_root: Merkle Root firmata dallo studente
+        """
+        labels = multiproof.get("labels", [])
+        if sorted(labels) != sorted(revealed_attributes):
+            print("[Verifier] La multiproof non copre esattamente gli attributi rivelati.")
+            return False
+        values = [revealed_attributes[label] for label in labels]
+        return (MerkleTree.verify_multiproof(values, multiproof, merkle_root)
+                or MerkleTree.verify_multiproof(values, multiproof, merkle_root, legacy=True))
+
+    def check_merkle_root_on_chain(self, credential_id: str, claimed_merkle_root: str,
+                                   issuance_proof: dict = None) -> bool:
         """
         Verifica che la Merkle Root fornita corrisponda a quella salvata on-chain per EMISSIONE.
+
+        :param issuance_proof: `issuanceProof` della presentazione; obbligatoria in modalità
+                               light client, dove la root si legge dalla transazione provata
         """
-        for block in self.blockchain.chain:
-            tx = block.transaction
-            if tx.credential_unique_id == credential_id and block.transaction_type == "EMISSIONE":
-                return block.attributes_merkle_root == claimed_merkle_root
-        return False
+        if self.is_light:
+            credential = self._lookup_light({"credentialId": credential_id, "issuanceProof": issuance_proof})
+            return credential is not None and credential["merkle_root"] == claimed_merkle_root
+        record = self.blockchain.get_credential_record(credential_id)
+        if record is None or record["issuance_block"] is None:
+            return False
+        return record["merkle_root"] == claimed_merkle_root
 
-    def check_revocation_status(self, credential_id: str) -> bool:
+    def check_revocation_status(self, credential_id: str, revocation_proof: dict = None) -> bool:
         """
         Controlla se la credenziale è stata revocata.
         Ritorna True se la credenziale è ancora valida (NON revocata).
+
+        :param revocation_proof: `revocationProof` della presentazione; obbligatoria in modalità
+                                 light client (vedi `check_revocation_proof`)
+        """
+        if self.is_light:
+            return self.check_revocation_proof(credential_id, revocation_proof)
+        latest_tx = self.blockchain.get_latest_transaction(credential_id)
+        if latest_tx is None:
+            return False  # Non trovata → trattare come non valida
+        return not latest_tx.revocation_status
+
+    @staticmethod
+    def check_status_list(publication: dict, status_index: int, issuer_public_key_pem: str) -> bool:
+        """
+        Controllo di revoca offline tramite la status list pubblicata dall'emittente:
+        verifica la firma della pubblicazione e legge il bit della credenziale.
+        Ritorna True se la credenziale è ancora valida (NON revocata).
+        """
+        if not StatusList.verify_publication(publication, issuer_public_key_pem):
+            print("[Verifier] Firma della status list non valida.")
+            return False
+        return not StatusList.from_publication(publication).is_revoked(int(status_index))
+
+    def check_revocation_proof(self, credential_id: str, revocation_proof: dict, block_header=None) -> bool:
+        """
+        Controllo di revoca tramite la prova di non appartenenza allegata dal wallet:
+        basta la `revocation_root` dell'intestazione di blocco più recente.
+        Ritorna True se la credenziale è ancora valida (NON revocata).
+
+        :param block_header: blocco (o intestazione) di riferimento; default l'ultimo della catena
+        """
+        header = block_header if block_header is not None else self._latest_header()
+        if header is None or header.revocation_root is None or revocation_proof is None:
+            return False
+        return SparseMerkleTree.verify_non_membership(
+            key_for(credential_id), revocation_proof.get("proof", {}), header.revocation_root)
+
+    def _latest_header(self):
+        if self.is_light:
+            return self.light_client.get_latest_header()
+        return self.blockchain.get_latest_block()
+
+    # --- Verifica completa delle presentazioni ---
+
+    def _lookup_credential(self, credential_id: str):
+        """
+        Stato on-chain della credenziale: root ancorata, revoca, emittente e wallet.
+        """
+        record = self.blockchain.get_credential_record(credential_id)
+        if record is None or record["issuance_block"] is None:
+            return None
+        issuance_tx = record["issuance_transaction"]
+        return {
+            "merkle_root": record["merkle_root"],
+            "revoked": record["latest_transaction"].revocation_status,
+            "issuer": issuance_tx.issuer_id or record["issuance_block"].block_proposer,
+            "wallet_address": issuance_tx.student_wallet_address,
+        }
+
+    def _lookup_light(self, proof: dict):
+        """
+        Stato della credenziale ricostruito dalle prove allegate alla presentazione
+        (modalità light client): transazione di EMISSIONE inclusa in un'intestazione
+        sincronizzata e firmata dall'emittente, prova di non revoca sull'ultima intestazione.
+        """
+        credential_id = proof.get("credentialId")
+        issuance = proof.get("issuanceProof")
+        if not issuance:
+            return None
+        try:
+            issuance_tx = Transaction.from_dict(issuance["transaction"])
+            block_number = issuance["blockNumber"]
+            inclusion_proof = issuance["proof"]
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        header = self.light_client.get_header(block_number)
+        if (header is None or issuance_tx.transaction_type != "EMISSIONE"
+                or issuance_tx.credential_unique_id != credential_id
+                or not self.light_client.verify_inclusion(issuance_tx, inclusion_proof, block_number)):
+            return None
+
+        issuer = issuance_tx.issuer_id or header.block_proposer
+        issuer_keys = self.mobility_ca.get_registry_snapshot().keys_by_university.get(issuer, ())
+        if not any(issuance_tx.verify_signature(public_key_pem) for public_key_pem in issuer_keys):
+            return None
+
+        revocation_proof = proof.get("revocationProof")
+        return {
+            "merkle_root": issuance_tx.attributes_merkle_root or header.attributes_merkle_root,
+            "revoked": not self.check_revocation_proof(credential_id, revocation_proof),
+            "revocation_error": ("Prova di non revoca assente." if revocation_proof is None else
+                                 "Credenziale revocata o prova di non revoca non valida per l'ultima intestazione."),
+            "issuer": issuer,
+            "wallet_address": issuance_tx.student_wallet_address,
+        }
+
+    def _credential_key(self, proof: dict):
         """
-        for block in reversed(self.blockchain.chain):  # Legge dal più recente
-            tx = block.transaction
-            if tx.credential_unique_id == credential_id:
-                return not tx.revocation_status
-        return False  # Non trovata → trattare come non valida
+        Chiave di condivisione delle letture nel batch: la credenziale per un nodo
+        completo, la credenziale con le prove allegate in modalità light client.
+        """
+        credential_id = proof.get("credentialId")
+        if not self.is_light:
+            return credential_id
+        issuance = proof.get("issuanceProof") or {}
+        revocation = proof.get("revocationProof") or {}
+        return (credential_id, repr(issuance.get("transaction")), issuance.get("blockNumber"),
+                repr(issuance.get("proof")), repr(revocation.get("proof")))
+
+    def _lookup(self, proof: dict):
+        if self.is_light:
+            return self._lookup_light(proof)
+        return self._lookup_credential(proof.get("credentialId"))
+
+    def _accreditation_map(self) -> dict:
+        """
+        Mappa university_id → True se l'università ha un certificato non revocato
+        (dalla fotografia corrente del registro, senza ricostruirla).
+        """
+        return self.mobility_ca.get_registry_snapshot().accreditation
+
+    @staticmethod
+    def _signature_key(proof: dict) -> tuple:
+        return (proof.get("publicKey"), proof.get("signature"), proof.get("merkleRoot"), proof.get("signatureSuite"))
+
+    @staticmethod
+    def _check_signature(signature_key: tuple) -> bool:
+        """
+        Verifica silenziosa della firma dello studente (usata anche dai thread del batch).
+        """
+        public_key_pem, signature_hex, merkle_root, signature_suite = signature_key
+        try:
+            return verify_with_pem(public_key_pem, bytes.fromhex(signature_hex),
+                                   merkle_root.encode(), signature_suite)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _check_attributes(proof: dict) -> dict:
+        """
+        Esito per attributo rivelato (multiproof o una proof per attributo).
+        """
+        revealed = proof.get("revealedAttributes", {})
+        merkle_root = proof.get("merkleRoot")
+        if "merkleMultiproof" in proof:
+            valid = Verifier.verify_merkle_multiproof(revealed, proof["merkleMultiproof"], merkle_root)
+            return {label: valid for label in revealed}
+        proofs = proof.get("merkleProofs", {})
+        return {label: label in proofs and Verifier.verify_merkle_proof(value, proofs[label], merkle_root)
+                for label, value in revealed.items()}
+
+    def _build_verdict(self, proof: dict, signature_valid: bool, credential, accreditation: dict) -> dict:
+        """
+        Compone l'esito strutturato di una presentazione.
+        """
+        errors = []
+        credential_id = proof.get("credentialId")
+        public_key_pem = proof.get("publicKey") or ""
+
+        if not signature_valid:
+            errors.append("Firma dello studente sulla Merkle Root non valida.")
+
+        holder_bound = (proof.get("walletAddress") == hashlib.sha256(public_key_pem.encode()).hexdigest()
+                        and credential is not None
+                        and credential["wallet_address"] == proof.get("walletAddress"))
+        if not holder_bound:
+            errors.append("Il wallet della presentazione non corrisponde al titolare della credenziale.")
+
+        root_on_chain = credential is not None and credential["merkle_root"] == proof.get("merkleRoot")
+        if credential is None and self.is_light:
+            errors.append(f"Prova di emissione della credenziale {credential_id} assente o non valida.")
+        elif credential is None:
+            errors.append(f"Credenziale {credential_id} non trovata on-chain.")
+        elif not root_on_chain:
+            errors.append("Merkle Root non corrispondente a quella ancorata on-chain.")
+
+        not_revoked = credential is not None and not credential["revoked"]
+        if credential is not None and credential["revoked"]:
+            errors.append(credential.get("revocation_error", "Credenziale revocata."))
+
+        issuer = credential["issuer"] if credential else None
+        issuer_accredited = accreditation.get(issuer, False)
+        if credential is not None and not issuer_accredited:
+            errors.append(f"Università emittente {issuer} non accreditata.")
+
+        attributes = self._check_attributes(proof)
+        attributes_valid = all(attributes.values())
+        if not attributes_valid:
+            errors.append("Merkle Proof non valida per uno o più attributi rivelati.")
+
+        checks = {
+            "signature": signature_valid,
+            "holderBinding": holder_bound,
+            "rootOnChain": root_on_chain,
+            "notRevoked": not_revoked,
+            "issuerAccredited": issuer_accredited,
+            "attributes": attributes_valid,
+        }
+        return {
+            "credentialId": credential_id,
+            "valid": all(checks.values()),
+            "checks": checks,
+            "attributes": attributes,
+            "issuer": issuer,
+            "errors": errors,
+        }
+
+    def _cache_key(self, proof: dict) -> tuple:
+        """
+        Chiave di cache: (credenziale con le eventuali prove allegate in modalità light,
+        Merkle Root, hash di firma e chiave del titolare, insieme degli attributi
+        rivelati con i loro valori).
+        """
+        holder = "\x00".join(str(proof.get(field)) for field in
+                              ("signature", "publicKey", "walletAddress", "signatureSuite"))
+        return (self._credential_key(proof),
+                proof.get("merkleRoot"),
+                hashlib.sha256(holder.encode()).hexdigest(),
+                frozenset(proof.get("revealedAttributes", {}).items()))
+
+    def _cache_lookup(self, proof: dict):
+        if self.cache is None:
+            return None
+        verdict = self.cache.get(self._cache_key(proof))
+        return copy.deepcopy(verdict) if verdict is not None else None
+
+    def _cache_store(self, proof: dict, verdict: dict, epoch):
+        if self.cache is not None and verdict["valid"]:
+            self.cache.put(self._cache_key(proof), copy.deepcopy(verdict),
+                           verdict["credentialId"], verdict["issuer"], epoch)
+
+    def verify_presentation(self, proof: dict) -> dict:
+        """
+        Verifica completa di una Presentation Proof: firma dello studente, legame con il
+        titolare, Merkle Root on-chain, stato di revoca, accreditamento dell'emittente
+        e Merkle Proof degli attributi rivelati.
+
+        :param proof: presentazione prodotta da `StudentWallet.generate_presentation_proof`
+        :return: dizionario con `valid`, esito dei singoli `checks`, esito per attributo ed `errors`
+        """
+        cached = self._cache_lookup(proof)
+        if cached is not None:
+            return cached
+
+        epoch = self.cache.epoch if self.cache is not None else None
+        verdict = self._build_verdict(
+            proof,
+            self._check_signature(self._signature_key(proof)),
+            self._lookup(proof),
+            self._accreditation_map()
+        )
+        self._cache_store(proof, verdict, epoch)
+        return verdict
+
+    def verify_batch(self, proofs: list) -> list:
+        """
+        Verifica un insieme di presentazioni (es. le candidature di una scadenza).
+
+        Gli esiti già in cache sono restituiti direttamente; per le altre presentazioni
+        le letture della catena sono eseguite una volta per credenziale, il registro
+        di accreditamento una volta per batch e ogni firma distinta una sola volta;
+        le verifiche di firma sono distribuite su un pool di thread.
+
+        :param proofs: lista di Presentation Proof
+        :return: lista di esiti nello stesso ordine di `proofs`
+        """
+        verdicts = [self._cache_lookup(proof) for proof in proofs]
+        pending = [proof for proof, verdict in zip(proofs, verdicts) if verdict is None]
+        if not pending:
+            return verdicts
+
+        epoch = self.cache.epoch if self.cache is not None else None
+        accreditation = self._accreditation_map()
+        credentials = {}
+        for proof in pending:
+            key = self._credential_key(proof)
+            if key not in credentials:
+                credentials[key] = self._lookup(proof)
+
+        signature_keys = list(dict.fromkeys(self._signature_key(proof) for proof in pending))
+        if len(signature_keys) > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="Verifier")
+            results = self._executor.map(self._check_signature, signature_keys)
+        else:
+            results = map(self._check_signature, signature_keys)
+        signatures = dict(zip(signature_keys, results))
+
+        computed = iter(pending)
+        for position, verdict in enumerate(verdicts):
+            if verdict is not None:
+                continue
+            proof = next(computed)
+            verdict = self._build_verdict(proof, signatures[self._signature_key(proof)],
+                                          credentials[self._credential_key(proof)], accreditation)
+            self._cache_store(proof, verdict, epoch)
+            verdicts[position] = verdict
+        return verdicts
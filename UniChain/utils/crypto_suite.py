@@ -0,0 +1,179 @@
+from abc import ABC, abstractmethod
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+
+from UniChain.utils.key_cache import public_key_cache
+
+
+class CryptoSuite(ABC):
+    """
+    Suite crittografica di firma: generazione chiavi, firma, verifica e
+    serializzazione delle chiavi pubbliche.
+
+    Il nome della suite viene registrato in certificati, transazioni e blocchi,
+    così che firme prodotte con schemi diversi restino verificabili nel tempo.
+    """
+
+    name = None
+
+    @abstractmethod
+    def generate_private_key(self):
+        ...
+
+    @abstractmethod
+    def sign(self, private_key, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        """
+        Solleva InvalidSignature se la firma non è valida.
+        """
+
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        """
+        Verifica la firma; restituisce False se non valida o se la chiave
+        non appartiene a questa suite.
+        """
+        if not self.matches_key(public_key):
+            return False
+        try:
+            self._verify(public_key, signature, data)
+            return True
+        except InvalidSignature:
+            return False
+
+    @abstractmethod
+    def matches_key(self, key) -> bool:
+        ...
+
+    def certificate_hash_algorithm(self):
+        """
+        Algoritmo di hash da passare a `CertificateBuilder.sign` per questa suite.
+        """
+        return hashes.SHA256()
+
+    @staticmethod
+    def serialize_public_key(public_key) -> str:
+        """
+        Serializza la chiave pubblica in formato PEM (SubjectPublicKeyInfo).
+        """
+        return public_key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+
+    @staticmethod
+    def load_public_key(public_key_pem):
+        """
+        Carica una chiave pubblica PEM tramite la cache condivisa.
+        """
+        return public_key_cache.load_pem(public_key_pem)
+
+    def __repr__(self):
+        return f"CryptoSuite({self.name})"
+
+
+class RSASuite(CryptoSuite):
+    """
+    RSA-2048 con padding PKCS#1 v1.5 e SHA-256 (schema storico di UniChain).
+    """
+
+    name = "RSA-2048-PKCS1v15-SHA256"
+
+    def generate_private_key(self):
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        public_key.verify(signature, data, padding.PKCS1v15(), hashes.SHA256())
+
+    def matches_key(self, key) -> bool:
+        return isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey))
+
+
+class Ed25519Suite(CryptoSuite):
+    """
+    Ed25519: generazione chiavi e firma molto più rapide di RSA.
+    """
+
+    name = "Ed25519"
+
+    def generate_private_key(self):
+        return ed25519.Ed25519PrivateKey.generate()
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data)
+
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        public_key.verify(signature, data)
+
+    def matches_key(self, key) -> bool:
+        return isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey))
+
+    def certificate_hash_algorithm(self):
+        # Ed25519 incorpora l'hash: la firma X.509 richiede algorithm=None
+        return None
+
+
+class ECDSAP256Suite(CryptoSuite):
+    """
+    ECDSA su curva P-256 con SHA-256.
+    """
+
+    name = "ECDSA-P256-SHA256"
+
+    def generate_private_key(self):
+        return ec.generate_private_key(ec.SECP256R1())
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data, ec.ECDSA(hashes.SHA256()))
+
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        public_key.verify(signature, data, ec.ECDSA(hashes.SHA256()))
+
+    def matches_key(self, key) -> bool:
+        return (isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey))
+                and isinstance(key.curve, ec.SECP256R1))
+
+
+SUITES = {suite.name: suite for suite in (RSASuite(), Ed25519Suite(), ECDSAP256Suite())}
+DEFAULT_SUITE = RSASuite.name
+
+
+def get_suite(suite=None) -> CryptoSuite:
+    """
+    Restituisce la suite dato il nome (o la suite stessa); None → suite di default.
+    """
+    if isinstance(suite, CryptoSuite):
+        return suite
+    name = suite or DEFAULT_SUITE
+    if name not in SUITES:
+        raise ValueError(f"Suite crittografica non supportata: {name}")
+    return SUITES[name]
+
+
+def suite_for_key(key) -> CryptoSuite:
+    """
+    Individua la suite a cui appartiene una chiave (privata o pubblica).
+    """
+    for suite in SUITES.values():
+        if suite.matches_key(key):
+            return suite
+    raise ValueError(f"Tipo di chiave non supportato: {type(key).__name__}")
+
+
+def verify_with_pem(public_key_pem, signature: bytes, data: bytes, suite_name=None) -> bool:
+    """
+    Verifica una firma con una chiave pubblica PEM secondo la suite `suite_name`,
+    che deve coincidere con quella della chiave. Le firme prive di suite registrata
+    sono quelle storiche e vengono verificate solo con RSA PKCS#1 v1.5.
+    """
+    suite = SUITES.get(suite_name or RSASuite.name)
+    if suite is None:
+        return False
+    return suite.verify(public_key_cache.load_pem(public_key_pem), signature, data)
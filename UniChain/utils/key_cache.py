@@ -0,0 +1,86 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from cryptography.hazmat.primitives import hashes, serialization
+
+
+class PublicKeyCache:
+    """
+    Cache limitata (LRU) delle chiavi pubbliche già decodificate.
+
+    Le chiavi sono indicizzate dall'impronta SHA-256 della loro rappresentazione
+    PEM/DER (o del certificato X.509 da cui provengono), così che le verifiche
+    ripetute con la stessa chiave paghino solo l'operazione di verifica della firma
+    e non il parsing.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: numero massimo di chiavi mantenute in cache
+        """
+        self.maxsize = maxsize
+        self._keys = OrderedDict()   # impronta → oggetto chiave pubblica
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _get_or_load(self, data: bytes, loader):
+        key_id = self.fingerprint(data)
+        with self._lock:
+            public_key = self._keys.get(key_id)
+            if public_key is not None:
+                self._keys.move_to_end(key_id)
+                self.hits += 1
+                return public_key
+            self.misses += 1
+
+        public_key = loader()
+
+        with self._lock:
+            self._keys[key_id] = public_key
+            self._keys.move_to_end(key_id)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return public_key
+
+    def load_pem(self, public_key_pem):
+        """
+        Restituisce la chiave pubblica corrispondente al PEM (str o bytes).
+        """
+        if isinstance(public_key_pem, str):
+            public_key_pem = public_key_pem.encode("utf-8")
+        return self._get_or_load(public_key_pem, lambda: serialization.load_pem_public_key(public_key_pem))
+
+    def load_der(self, public_key_der: bytes):
+        """
+        Restituisce la chiave pubblica corrispondente al DER (SubjectPublicKeyInfo).
+        """
+        return self._get_or_load(public_key_der, lambda: serialization.load_der_public_key(public_key_der))
+
+    def from_certificate(self, certificate):
+        """
+        Restituisce la chiave pubblica di un certificato X.509, indicizzata per impronta del certificato.
+        """
+        return self._get_or_load(certificate.fingerprint(hashes.SHA256()), certificate.public_key)
+
+    def stats(self) -> dict:
+        """
+        Contatori di utilizzo della cache.
+        """
+        with self._lock:
+            return {"size": len(self._keys), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Istanza condivisa da Transaction, Verifier e CertificateManager
+public_key_cache = PublicKeyCache()
@@ -0,0 +1,237 @@
+import hashlib
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.hazmat.primitives import serialization
+
+from UniChain.utils.crypto_suite import get_suite
+
+
+def _serialize_private_key(private_key) -> bytes:
+    return private_key.private_bytes(serialization.Encoding.PEM,
+                                     serialization.PrivateFormat.PKCS8,
+                                     serialization.NoEncryption())
+
+
+def _load_private_key(pem: bytes):
+    """
+    Carica una PEM scritta dal provider senza la costosa validazione RSA
+    (~50 ms per chiave RSA-2048): l'integrità dei file in cache è garantita
+    dall'impronta SHA-256 salvata accanto a ciascuno (vedi `_load_cached`).
+    """
+    return serialization.load_pem_private_key(pem, password=None, unsafe_skip_rsa_key_validation=True)
+
+
+def _generate_key_pem(suite_name: str) -> bytes:
+    """
+    Worker del pool: genera una chiave e la restituisce in PEM
+    (gli oggetti chiave non sono trasferibili tra processi).
+    """
+    return _serialize_private_key(get_suite(suite_name).generate_private_key())
+
+
+class KeyProvider:
+    """
+    Fornisce le chiavi private a MobilityCA, University e StudentWallet.
+
+    Senza opzioni genera ogni chiave al momento, come la suite crittografica.
+    Due meccanismi opzionali riducono il costo di avvio delle simulazioni:
+    - `pool_size`: un pool di processi in background mantiene pronte fino a
+      `pool_size` chiavi per suite (utile soprattutto per RSA-2048);
+    - `cache_dir`: le chiavi richieste con un'etichetta (es. "university:urn:rennes")
+      sono salvate su disco e riusate nelle esecuzioni successive, rendendo
+      ripetibili test e simulazioni.
+
+    Le chiavi in cache sono memorizzate in chiaro: da usare solo per simulazioni e test.
+    Ogni file è accompagnato dall'impronta SHA-256 del suo contenuto: un file alterato
+    o senza impronta è trattato come mancante e la chiave viene rigenerata.
+    """
+
+    def __init__(self, cache_dir=None, pool_size=0, workers=None):
+        """
+        :param cache_dir: directory della cache persistente delle chiavi (None = disattivata)
+        :param pool_size: chiavi pre-generate da tenere pronte per ogni suite (0 = nessun pool)
+        :param workers: processi del pool (default: numero di CPU)
+        """
+        self.cache_dir = cache_dir
+        self.pool_size = pool_size
+        self.workers = workers
+        self._executor = None
+        self._pending = {}        # nome suite → futures di chiavi in generazione
+        self._label_counts = {}   # etichetta → richieste già servite (etichette ripetute)
+        self._lock = threading.Lock()
+
+        self.generated = 0
+        self.from_pool = 0
+        self.from_cache = 0
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # --- Pool di pre-generazione ---
+
+    def _submit(self, suite_name: str, count: int):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        queue = self._pending.setdefault(suite_name, deque())
+        for _ in range(count):
+            queue.append(self._executor.submit(_generate_key_pem, suite_name))
+
+    def prefetch(self, crypto_suite=None, count=None):
+        """
+        Avvia in background la generazione di chiavi per la suite
+        (default: fino a `pool_size` chiavi in attesa).
+        """
+        suite = get_suite(crypto_suite)
+        with self._lock:
+            missing = (count if count is not None else self.pool_size) - len(self._pending.get(suite.name, ()))
+            if missing > 0:
+                self._submit(suite.name, missing)
+
+    def _take_from_pool(self, suite):
+        """
+        Restituisce una chiave già pronta del pool (None se nessuna è completata)
+        e rimpiazza quella consumata.
+        """
+        if not self.pool_size:
+            return None
+        with self._lock:
+            queue = self._pending.get(suite.name)
+            if queue is None:
+                self._submit(suite.name, self.pool_size)
+                return None
+            ready = next((future for future in queue if future.done()), None)
+            if ready is None:
+                return None
+            queue.remove(ready)
+            self._submit(suite.name, 1)
+        try:
+            return _load_private_key(ready.result())
+        except Exception as e:
+            print(f"[KeyProvider] Chiave pre-generata non disponibile: {e}")
+            return None
+
+    # --- Cache persistente ---
+
+    def _cache_path(self, suite, label: str) -> str:
+        digest = hashlib.sha256(f"{suite.name}\x00{label}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest[:32]}.pem")
+
+    @staticmethod
+    def _digest_path(path: str) -> str:
+        return f"{path}.sha256"
+
+    def _load_cached(self, suite, path: str):
+        try:
+            with open(path, "rb") as f:
+                pem = f.read()
+            with open(self._digest_path(path), "r", encoding="ascii") as f:
+                digest = f.read().strip()
+        except FileNotFoundError:
+            return None
+        if hashlib.sha256(pem).hexdigest() != digest:
+            print(f"[KeyProvider] Impronta della chiave in cache non corrispondente ({path}).")
+            return None
+        try:
+            private_key = _load_private_key(pem)
+        except (ValueError, TypeError) as e:
+            print(f"[KeyProvider] Chiave in cache non valida ({path}): {e}")
+            return None
+        return private_key if suite.matches_key(private_key) else None
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes, mode: int):
+        # Scrittura atomica: un'esecuzione interrotta non lascia file parziali
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _store_cached(self, path: str, private_key):
+        pem = _serialize_private_key(private_key)
+        # Un'interruzione tra le due scritture lascia chiave e impronta incoerenti:
+        # alla lettura successiva la chiave viene semplicemente rigenerata
+        self._write_atomic(self._digest_path(path), hashlib.sha256(pem).hexdigest().encode("ascii"), 0o600)
+        self._write_atomic(path, pem, 0o600)
+
+    # --- API ---
+
+    def get_private_key(self, crypto_suite=None, label: str = None):
+        """
+        Restituisce una chiave privata per la suite.
+
+        :param crypto_suite: nome o oggetto CryptoSuite (None = suite di default)
+        :param label: identità del titolare (es. "wallet:Alice"); con la cache attiva
+                      la stessa etichetta restituisce la stessa chiave in ogni esecuzione.
+                      Etichette ripetute ricevono chiavi distinte, in ordine di richiesta.
+        """
+        suite = get_suite(crypto_suite)
+
+        path = None
+        if self.cache_dir is not None and label is not None:
+            with self._lock:
+                occurrence = self._label_counts.get(label, 0)
+                self._label_counts[label] = occurrence + 1
+            path = self._cache_path(suite, f"{label}#{occurrence}" if occurrence else label)
+            private_key = self._load_cached(suite, path)
+            if private_key is not None:
+                self.from_cache += 1
+                return private_key
+
+        private_key = self._take_from_pool(suite)
+        if private_key is not None:
+            self.from_pool += 1
+        else:
+            private_key = suite.generate_private_key()
+            self.generated += 1
+
+        if path is not None:
+            self._store_cached(path, private_key)
+        return private_key
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = sum(len(queue) for queue in self._pending.values())
+        return {"generated": self.generated, "from_pool": self.from_pool,
+                "from_cache": self.from_cache, "pending": pending}
+
+    def close(self):
+        """
+        Arresta il pool di processi, scartando le chiavi non ancora consumate.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"KeyProvider(cache_dir={self.cache_dir!r}, pool_size={self.pool_size})"
+
+
+# Provider usato dai costruttori quando non ne viene passato uno esplicito
+_default_provider = KeyProvider()
+
+
+def get_default_key_provider() -> KeyProvider:
+    return _default_provider
+
+
+def set_default_key_provider(provider: KeyProvider) -> KeyProvider:
+    """
+    Imposta il provider di default (es. con cache su disco per le simulazioni).
+
+    :return: il provider precedente
+    """
+    global _default_provider
+    previous, _default_provider = _default_provider, provider
+    return previous
@@ -0,0 +1,27 @@
+import weakref
+
+
+def weak_callback(callback):
+    """
+    Riferimento debole a una callback: i metodi legati non tengono in vita il loro
+    oggetto, le funzioni libere sono mantenute così come sono.
+    Restituisce None se `callback` è None.
+    """
+    if callback is None:
+        return None
+    return weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+
+
+def run_fallback(on_error, component: str):
+    """
+    Invoca la callback di ripiego di un sottoscrittore la cui notifica è fallita.
+    Serve a chi mantiene stato derivato dagli eventi (es. una cache da invalidare):
+    se la notifica puntuale non va a buon fine, il ripiego lo scarta per intero.
+    """
+    fallback = on_error() if on_error is not None else None
+    if fallback is None:
+        return
+    try:
+        fallback()
+    except Exception as e:
+        print(f"[{component}] Errore nel ripiego della notifica: {e}")
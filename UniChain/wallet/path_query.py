@@ -0,0 +1,257 @@
+"""
+Linguaggio di interrogazione dei percorsi per la divulgazione selettiva.
+
+Le etichette degli attributi appiattiti hanno la forma
+`credential.exams[0].grade`: segmenti-nome separati da punti e indici tra quadre.
+Una query usa la stessa sintassi, con in più:
+- `*`            qualsiasi segmento-nome            (es. `credential.*.email`)
+- `[*]`          qualsiasi indice                   (es. `credential.exams[*].grade`)
+- `[campo OP v]` elementi della lista il cui attributo `campo` soddisfa il confronto,
+                 con OP tra `==`, `=`, `!=`, `>=`, `<=`, `>`, `<`
+                 (es. `credential.exams[credits>=6].courseName`)
+
+Le query che iniziano con il segmento radice (`credential`) sono assolute;
+le altre sono relative e possono iniziare in qualsiasi punto del percorso.
+Il confronto avviene sempre su segmenti interi: un nome semplice (`grade`)
+seleziona gli attributi con un segmento esattamente `grade`, non `finalGrade`.
+Se una query termina su un nodo interno (es. `credential.exams[0]`) viene
+selezionato l'intero sotto-albero.
+
+Le query sono compilate una sola volta (cache LRU) e valutate su un indice a
+trie dei percorsi, costruito una volta per credenziale.
+"""
+import operator
+import re
+from functools import lru_cache
+
+ROOT_SEGMENT = "credential"
+
+_TOKEN = re.compile(r"\.?([^.\[\]]+)|\[([^\]]*)\]")
+_PREDICATE = re.compile(r"^\s*([^\s=!<>]+)\s*(==|=|!=|>=|<=|>|<)\s*(?![=!<>])(.*?)\s*$")
+_OPERATORS = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+# Tipi di passo di una query compilata
+NAME = "name"
+ANY_NAME = "any_name"
+INDEX = "index"
+ANY_INDEX = "any_index"
+PREDICATE = "predicate"
+
+
+def _tokenize(path: str):
+    """
+    Divide un percorso in segmenti: stringhe per i nomi, ("[]", contenuto) per le quadre.
+    """
+    tokens = []
+    position = 0
+    while position < len(path):
+        match = _TOKEN.match(path, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Percorso non valido: '{path}' (posizione {position})")
+        if match.group(1) is not None:
+            tokens.append(match.group(1))
+        else:
+            tokens.append(("[]", match.group(2)))
+        position = match.end()
+    return tokens
+
+
+def _label_segments(label: str):
+    """
+    Segmenti di un'etichetta: nomi come stringhe, indici come interi.
+    """
+    return [int(token[1]) if isinstance(token, tuple) else token for token in _tokenize(label)]
+
+
+def _as_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(value: str, op, literal: str) -> bool:
+    """
+    Confronto numerico se entrambi i valori sono numeri, altrimenti tra stringhe.
+    """
+    left, right = _as_number(value), _as_number(literal)
+    if left is not None and right is not None:
+        return op(left, right)
+    return op(value, literal)
+
+
+class CompiledQuery:
+    """
+    Query compilata: sequenza di passi e indicazione se è assoluta o relativa.
+    """
+
+    __slots__ = ("source", "steps", "absolute")
+
+    def __init__(self, source: str, steps: tuple, absolute: bool):
+        self.source = source
+        self.steps = steps
+        self.absolute = absolute
+
+    def __repr__(self):
+        return f"CompiledQuery({self.source!r}, absolute={self.absolute})"
+
+
+@lru_cache(maxsize=512)
+def compile_query(query: str) -> CompiledQuery:
+    """
+    Compila una query di percorso (con memorizzazione).
+
+    :raises ValueError: se la sintassi non è valida
+    """
+    query = query.strip()
+    if not query:
+        raise ValueError("Query di percorso vuota.")
+
+    steps = []
+    for token in _tokenize(query):
+        if not isinstance(token, tuple):
+            steps.append((ANY_NAME,) if token == "*" else (NAME, token))
+            continue
+        content = token[1].strip()
+        if content == "*":
+            steps.append((ANY_INDEX,))
+        elif content.isdigit():
+            steps.append((INDEX, int(content)))
+        else:
+            match = _PREDICATE.match(content)
+            if match is None:
+                raise ValueError(f"Predicato non valido in '{query}': [{content}]")
+            field, op, literal = match.groups()
+            steps.append((PREDICATE, field, _OPERATORS[op], literal.strip("'\"")))
+
+    absolute = steps[0] == (NAME, ROOT_SEGMENT)
+    return CompiledQuery(query, tuple(steps), absolute)
+
+
+class _TrieNode:
+    __slots__ = ("segment", "children", "position")
+
+    def __init__(self, segment=None):
+        self.segment = segment
+        self.children = {}     # segmento (str o int) → _TrieNode
+        self.position = None   # indice dell'attributo appiattito, se il nodo è una foglia
+
+
+class PathIndex:
+    """
+    Indice a trie dei percorsi degli attributi appiattiti di una credenziale.
+
+    Oltre al trie mantiene, per ogni segmento-nome, l'elenco dei nodi che lo
+    portano: le query relative partono direttamente da quei nodi invece di
+    visitare l'intero albero.
+    """
+
+    def __init__(self, flat_attributes):
+        """
+        :param flat_attributes: lista di coppie (label, valore) nell'ordine del Merkle Tree
+        """
+        self._values = [value for _, value in flat_attributes]
+        self._root = _TrieNode()
+        self._nodes_by_name = {}   # segmento-nome → nodi del trie
+        self._all_nodes = []
+
+        for position, (label, _) in enumerate(flat_attributes):
+            node = self._root
+            for segment in _label_segments(label):
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _TrieNode(segment)
+                    self._all_nodes.append(child)
+                    if isinstance(segment, str):
+                        self._nodes_by_name.setdefault(segment, []).append(child)
+                node = child
+            if node.position is None:
+                node.position = position
+
+    def _match_step(self, node, step):
+        """
+        Figli di `node` che soddisfano un passo della query.
+        """
+        kind = step[0]
+        if kind == NAME:
+            child = node.children.get(step[1])
+            return [child] if child is not None else []
+        if kind == INDEX:
+            child = node.children.get(step[1])
+            return [child] if child is not None else []
+        if kind == ANY_NAME:
+            return [child for segment, child in node.children.items() if isinstance(segment, str)]
+        if kind == ANY_INDEX:
+            return [child for segment, child in node.children.items() if isinstance(segment, int)]
+
+        # PREDICATE: elementi della lista il cui attributo soddisfa il confronto
+        _, field, op, literal = step
+        matches = []
+        for segment, child in node.children.items():
+            if not isinstance(segment, int):
+                continue
+            target = child.children.get(field)
+            if target is not None and target.position is not None \
+                    and _compare(self._values[target.position], op, literal):
+                matches.append(child)
+        return matches
+
+    def _start_nodes(self, query: CompiledQuery):
+        """
+        Nodi da cui valutare il resto della query, con il primo passo già applicato.
+        """
+        first = query.steps[0]
+        if query.absolute:
+            return self._match_step(self._root, first)
+        if first[0] == NAME:
+            return self._nodes_by_name.get(first[1], [])
+        if first[0] == ANY_NAME:
+            return [node for node in self._all_nodes if isinstance(node.segment, str)]
+        # Query relativa che inizia con un indice: si parte dai genitori di ogni lista
+        parents = [self._root] + self._all_nodes
+        return [match for parent in parents for match in self._match_step(parent, first)]
+
+    def _collect_leaves(self, node, positions):
+        """
+        Tutte le foglie sotto `node` (una query che termina su un nodo interno
+        seleziona l'intero sotto-albero, es. `credential.exams[0]`).
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.position is not None:
+                positions.add(current.position)
+            stack.extend(current.children.values())
+
+    def resolve(self, query) -> set:
+        """
+        Posizioni degli attributi selezionati da una singola query.
+        """
+        compiled = query if isinstance(query, CompiledQuery) else compile_query(query)
+        frontier = self._start_nodes(compiled)
+        for step in compiled.steps[1:]:
+            frontier = [match for node in frontier for match in self._match_step(node, step)]
+            if not frontier:
+                break
+
+        positions = set()
+        for node in frontier:
+            self._collect_leaves(node, positions)
+        return positions
+
+    def select(self, queries) -> list:
+        """
+        Posizioni (in ordine di Merkle Tree) degli attributi selezionati da almeno una query.
+        """
+        positions = set()
+        for query in queries:
+            positions |= self.resolve(query)
+        return sorted(positions)
@@ -1,8 +1,9 @@
 import hashlib
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.primitives import hashes, serialization
 from UniChain.credentials.academic_credential import AcademicCredential
 from UniChain.structures.merkle_tree import MerkleTree
+from UniChain.utils.crypto_suite import get_suite
+from UniChain.utils.key_provider import get_default_key_provider
+from UniChain.wallet.path_query import PathIndex
 
 
 class StudentWallet:
@@ -13,41 +14,47 @@ class StudentWallet:
     Supporta anche il Mobility Trust System per autenticazione in sola lettura.
     """
 
-    def __init__(self, student_name="Alice"):
+    def __init__(self, student_name="Alice", crypto_suite=None, key_provider=None):
         self.student_name = student_name
 
-        # Genera una coppia di chiavi RSA (privata/pubblica)
+        # Genera una coppia di chiavi (privata/pubblica) con la suite scelta (default RSA)
+        self._crypto_suite = get_suite(crypto_suite)
+        self._key_provider = key_provider or get_default_key_provider()
         self._private_key = self._generate_private_key()
         self._public_key = self._private_key.public_key()
 
         # Dizionario delle credenziali memorizzate: key = credential_unique_id
         self._credentials = {}
 
+        # Cache per le presentazioni: credential_id → (attributi appiattiti, Merkle Tree, indice dei percorsi)
+        self._presentation_cache = {}
+        self._public_key_pem = None
+        self._wallet_address = None
+
         # Punti di affidabilità (facoltativi)
         self.trust_points = 0
 
-    @staticmethod
-    def _generate_private_key():
+    def _generate_private_key(self):
         """
-        Genera una chiave privata RSA a 2048 bit.
+        Ottiene dal KeyProvider una chiave privata secondo la suite crittografica del wallet.
         """
-        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return self._key_provider.get_private_key(self._crypto_suite, label=f"wallet:{self.student_name}")
 
     def get_wallet_address(self) -> str:
         """
         Restituisce l'indirizzo del wallet come hash SHA-256 della chiave pubblica serializzata.
         """
-        pem = self._public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        return hashlib.sha256(pem).hexdigest()
+        if self._wallet_address is None:
+            self._wallet_address = hashlib.sha256(self.get_public_key_pem().encode()).hexdigest()
+        return self._wallet_address
 
     def store_credential(self, credential_id: str, credential: AcademicCredential):
         """
         Memorizza una credenziale nel wallet, indicizzata per ID.
+        Invalida la cache di presentazione associata all'ID.
         """
         self._credentials[credential_id] = credential
+        self._presentation_cache.pop(credential_id, None)
         print(f"[Wallet] Credenziale {credential_id} memorizzata con successo.")
 
     def get_credential(self, credential_id: str) -> AcademicCredential:
@@ -61,21 +68,16 @@ class StudentWallet:
         Firma un messaggio generico con la chiave privata dello studente.
         Tipico uso: firma di Merkle Root o Presentation Proof.
         """
-        return self._private_key.sign(
-            data,
-            padding.PKCS1v15(),
-            hashes.SHA256()
-        )
+        return self._crypto_suite.sign(self._private_key, data)
 
     def get_public_key_pem(self) -> str:
         """
         Restituisce la chiave pubblica dello studente in formato PEM.
         Necessaria per la verifica da parte di terzi.
         """
-        return self._public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        ).decode()
+        if self._public_key_pem is None:
+            self._public_key_pem = self._crypto_suite.serialize_public_key(self._public_key)
+        return self._public_key_pem
 
     def __repr__(self):
         """
@@ -83,15 +85,15 @@ class StudentWallet:
         """
         return f"StudentWallet({self.student_name}, address={self.get_wallet_address()[:10]}...)"
 
-    def generate_presentation_proof(self, credential_id: str, reveal_fields: list[str]) -> dict:
+    def _get_presentation_material(self, credential_id: str):
         """
-        Genera una Presentation Proof con divulgazione selettiva degli attributi specificati.
-        L'integrità dei dati viene garantita tramite Merkle Root e Merkle Proof.
-
-        :param credential_id: ID della credenziale da presentare
-        :param reveal_fields: lista dei nomi finali degli attributi da rivelare (es. ["name", "grade"])
-        :return: dizionario JSON-serializzabile contenente la proof
+        Restituisce (attributi appiattiti, Merkle Tree, indice dei percorsi) della credenziale, calcolandoli
+        una sola volta per ID: le presentazioni successive calcolano solo le proof
+        degli attributi rivelati e la firma.
         """
+        cached = self._presentation_cache.get(credential_id)
+        if cached is not None:
+            return cached
 
         # 1. Recupera la credenziale dal wallet
         credential = self.get_credential(credential_id)
@@ -116,29 +118,68 @@ class StudentWallet:
 
         flatten("credential", full_data)
 
-        # 4. Costruisce il Merkle Tree con gli attributi
+        # 4. Costruisce il Merkle Tree e l'indice dei percorsi degli attributi
         merkle = MerkleTree(flat_attributes)
+        path_index = PathIndex(flat_attributes)
+
+        self._presentation_cache[credential_id] = (flat_attributes, merkle, path_index)
+        return self._presentation_cache[credential_id]
+
+    def generate_presentation_proof(self, credential_id: str, reveal_fields: list[str],
+                                    proof_format: str = "multiproof", revocation_proof: dict = None,
+                                    issuance_proof: dict = None) -> dict:
+        """
+        Genera una Presentation Proof con divulgazione selettiva degli attributi specificati.
+        L'integrità dei dati viene garantita tramite Merkle Root e Merkle Proof.
+
+        :param credential_id: ID della credenziale da presentare
+        :param reveal_fields: query di percorso degli attributi da rivelare: nomi semplici
+                              (es. ["name", "grade"]), percorsi esatti, caratteri jolly
+                              (`credential.exams[*].grade`) o predicati
+                              (`credential.exams[credits>=6].courseName`); vedi `path_query`
+        :param proof_format: "multiproof" (default) per un'unica multiproof compatta in
+                             `merkleMultiproof`, "paths" per una proof per attributo in `merkleProofs`
+        :param revocation_proof: prova di non revoca ottenuta da un nodo completo
+                                 (`Blockchain.get_revocation_proof`), allegata in `revocationProof`
+        :param issuance_proof: prova di inclusione della transazione di EMISSIONE
+                               (`Blockchain.get_issuance_proof`), allegata in `issuanceProof`
+                               per i verificatori in modalità light client
+        :return: dizionario JSON-serializzabile contenente la proof
+        """
+        if proof_format not in ("multiproof", "paths"):
+            raise ValueError(f"Formato di proof non supportato: {proof_format}")
+
+        # 1-4. Attributi appiattiti, Merkle Tree e indice dei percorsi (memorizzati per ID)
+        flat_attributes, merkle, path_index = self._get_presentation_material(credential_id)
         merkle_root = merkle.get_root()
 
-        # 5. Seleziona gli attributi da rivelare e costruisce le relative proof
+        # 5. Seleziona gli attributi da rivelare risolvendo le query sull'indice
         revealed = {}
-        merkle_proofs = {}
 
-        for label, value in flat_attributes:
-            if any(label.endswith(field) for field in reveal_fields):
-                revealed[label] = value
-                merkle_proofs[label] = merkle.get_proof(label)
+        for position in path_index.select(reveal_fields):
+            label, value = flat_attributes[position]
+            revealed[label] = value
 
         # 6. Firma la Merkle Root con la chiave privata
         signature = self.sign_data(merkle_root.encode("utf-8"))
 
-        # 7. Restituisce la Presentation Proof
-        return {
+        # 7. Restituisce la Presentation Proof con le proof degli attributi rivelati
+        presentation = {
             "credentialId": credential_id,
             "walletAddress": self.get_wallet_address(),
             "revealedAttributes": revealed,
-            "merkleProofs": merkle_proofs,
             "merkleRoot": merkle_root,
             "signature": signature.hex(),
+            "signatureSuite": self._crypto_suite.name,
             "publicKey": self.get_public_key_pem()
         }
+        if proof_format == "multiproof":
+            labels = list(revealed)
+            presentation["merkleMultiproof"] = {"labels": labels, **merkle.get_multiproof(labels)}
+        else:
+            presentation["merkleProofs"] = {label: merkle.get_proof(label) for label in revealed}
+        if revocation_proof is not None:
+            presentation["revocationProof"] = revocation_proof
+        if issuance_proof is not None:
+            presentation["issuanceProof"] = issuance_proof
+        return presentation
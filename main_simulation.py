@@ -68,6 +68,10 @@ print("Alice è ora autenticata e può accedere ai servizi universitari, inclusa
 
 alice_wallet = StudentWallet("Alice")
 
+# La blockchain serve già all'emissione: U_RENNES vi riserva l'indice del CAD nella propria status list
+blockchain = Blockchain(mobility_ca)
+print("Blockchain UniChain inizializzata con blocco di genesi.")
+
 credential_subject = CredentialSubject(
     student_id="8742",
     name="Alice Rossi",
@@ -114,6 +118,8 @@ issuer = Issuer(
     location=u_rennes.location
 )
 
+credential_status = u_rennes.allocate_credential_status(blockchain)
+
 cred = AcademicCredential(
     subject=credential_subject,
     degree=degree,
@@ -121,7 +127,8 @@ cred = AcademicCredential(
     validity=validity,
     issuer=issuer,
     exams=exams,
-    optional_activities=[]
+    optional_activities=[],
+    credential_status=credential_status
 )
 
 
@@ -158,29 +165,27 @@ print("Alice ha ricevuto e memorizzato il CAD nel proprio Wallet Digitale.\n")
 # === [FASE 4] ANCORAGGIO DEL CAD SULLA BLOCKCHAIN ===
 print("\n[Fase 4] ANCORAGGIO DEL CAD SULLA BLOCKCHAIN UniChain\n")
 
-# Step 1 – Inizializza la blockchain
-blockchain = Blockchain(mobility_ca)
-print("Blockchain UniChain inizializzata con blocco di genesi.")
-
-# Step 2 – Calcola CredentialHash del CAD
+# Step 1 – Calcola CredentialHash del CAD
 cred_hash = hashlib.sha256(str(cred.to_dict()).encode()).hexdigest()
 wallet_address = alice_wallet.get_wallet_address()
 print("CredentialHash calcolato per il CAD.")
 print(f"   - CredentialHash: {cred_hash}")
 print(f"   - studentWalletAddress di Alice: {wallet_address}")
 
-# Step 3 – Crea Transaction e firma con sk_UNI
+# Step 2 – Crea Transaction e firma con sk_UNI
 tx = Transaction(
     credential_hash=cred_hash,
     credential_unique_id=credential_id,
-    student_wallet_address=wallet_address
+    student_wallet_address=wallet_address,
+    issuer_id=u_rennes.university_id,
+    status_index=credential_status.status_list_index
 )
 tx.sign_transaction(u_rennes.get_private_key())
 print("TransactionType: EMISSIONE, firmata con sk_UNI.")
 print(f"   - Hash della Transaction: {tx.transaction_hash}")
 print(f"   - Sign (SHA256-RSA): {tx.signature[:64]}...")
 
-# Step 4 – Calcola Merkle Root degli attributi
+# Step 3 – Calcola Merkle Root degli attributi
 print("\nCalcolo della Merkle Root (Merkle Tree degli attributi del CAD)...")
 flat_attrs = []
 def flatten(prefix, val):
@@ -197,7 +202,7 @@ flatten("credential", cred.to_dict())
 merkle_root = MerkleTree(flat_attrs).get_root()
 print(f"   - Merkle Root calcolata: {merkle_root}")
 
-# Step 5 – Aggiunge blocco alla blockchain
+# Step 4 – Aggiunge blocco alla blockchain
 print("\nCreazione del blocco e firma del payload contenente il CAD...")
 blockchain.add_block(
     transaction=tx,
@@ -207,10 +212,10 @@ blockchain.add_block(
     attributes_merkle_root=merkle_root
 )
 
-# Step 6 – Stampa Mobility Trust Ranking aggiornato
+# Step 5 – Stampa Mobility Trust Ranking aggiornato
 mobility_ca.get_mobility_trust_ranking([u_rennes, u_salerno, u_bologna, u_lisboa])
 
-# Step 7 – Verifica integrità
+# Step 6 – Verifica integrità
 if blockchain.is_chain_valid():
     print("La blockchain UniChain è valida e coerente.")
 else:
@@ -250,14 +255,16 @@ print("Step 3 – Verifica dello stato di revoca del CAD...")
 is_not_revoked = verifier.check_revocation_status(credential_id)
 print(f"    -RevocationStatus del CAD: {'NON REVOCATA' if is_not_revoked else 'REVOCATA'}\n")
 
-# === STEP 4: Verifica crittografica Merkle Proof per ciascun attributo ===
-print("Step 4 – Verifica della Merkle Proof per ogni attributo rivelato:\n")
+# === STEP 4: Verifica crittografica della Merkle Multiproof degli attributi rivelati ===
+print("Step 4 – Verifica della Merkle Multiproof per gli attributi rivelati:\n")
+multiproof = presentation_proof["merkleMultiproof"]
 for label, value in presentation_proof["revealedAttributes"].items():
-    proof = presentation_proof["merkleProofs"][label]
     print(f"    Attributo rivelato: {label}")
     print(f"     -Valore dichiarato: {value}")
-    is_valid = verifier.verify_merkle_proof(value, proof, presentation_proof["merkleRoot"])
-    print(f"     -Merkle Proof: {'VALIDA' if is_valid else 'NON VALIDA'}\n")
+is_valid = verifier.verify_merkle_multiproof(
+    presentation_proof["revealedAttributes"], multiproof, presentation_proof["merkleRoot"])
+print(f"\n     -Merkle Multiproof ({len(multiproof['labels'])} attributi, "
+      f"{len(multiproof['hashes'])} hash): {'VALIDA' if is_valid else 'NON VALIDA'}\n")
 
 # === STEP 5: Esito finale ===
 print("[RISULTATO FINALE] Verifica della presentazione selettiva del CAD:")
@@ -344,7 +351,14 @@ print(f"    -Merkle Root sulla blockchain: {'TROVATA' if is_root_on_chain_after_
 # === STEP 3: Verifica che la credenziale non sia stata revocata ===
 print("Step 3 – Verifica RevocationStatus del CAD...")
 is_not_revoked_after_revocation = verifier.check_revocation_status(credential_id)
-print(f"    -RevocationStatus del CAD: {'NON REVOCATA' if is_not_revoked_after_revocation else 'REVOCATA'}\n")
+print(f"    -RevocationStatus del CAD: {'NON REVOCATA' if is_not_revoked_after_revocation else 'REVOCATA'}")
+# Stesso controllo offline, sulla status list firmata pubblicata da U_RENNES
+status_publication = blockchain.publish_status_list(u_rennes)
+is_not_revoked_in_status_list = Verifier.check_status_list(status_publication,
+                                                           credential_status.status_list_index,
+                                                           u_rennes.get_serialized_public_key())
+print(f"    -Status list di U_RENNES (indice {credential_status.status_list_index}): "
+      f"{'NON REVOCATA' if is_not_revoked_in_status_list else 'REVOCATA'}\n")
 
 # === STEP 4: Esito finale ===
 print("[RISULTATO FINALE] Verifica della presentazione del CAD dopo la revoca:")
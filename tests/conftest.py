@@ -0,0 +1,96 @@
+import hashlib
+
+import pytest
+
+from UniChain.blockchain.blockchain import Blockchain
+from UniChain.blockchain.transaction import Transaction
+from UniChain.credentials.academic_credential import AcademicCredential
+from UniChain.moblityCA.mobilityCA import MobilityCA
+from UniChain.structures.credential_subject import CredentialSubject
+from UniChain.structures.degree import Degree
+from UniChain.structures.enrollment import Enrollment
+from UniChain.structures.exam_record import ExamRecord
+from UniChain.structures.issuer import Issuer
+from UniChain.structures.validity_period import ValidityPeriod
+from UniChain.university.university import University
+
+
+@pytest.fixture
+def mobility_ca():
+    # Ed25519: generazione chiavi e firme rapide rispetto a RSA
+    return MobilityCA(crypto_suite="Ed25519")
+
+
+@pytest.fixture
+def universities(mobility_ca):
+    """
+    Quattro università accreditate e collegate tra loro (f = 1, quorum 3).
+    """
+    unis = [University(f"urn:uni:{i}", "Universita " + "ABCD"[i], f"U{i}", "Roma",
+                       mobility_ca, crypto_suite="Ed25519")
+            for i in range(4)]
+    for uni in unis:
+        uni.request_accreditation()
+    for uni in unis:
+        uni.set_peers([peer for peer in unis if peer is not uni])
+    return unis
+
+
+@pytest.fixture
+def blockchain(mobility_ca, universities):
+    return Blockchain(mobility_ca)
+
+
+@pytest.fixture
+def make_transaction(universities):
+    """
+    Costruisce una transazione firmata dall'emittente (default: la prima università).
+    """
+    def make(credential_id, transaction_type="EMISSIONE", issuer=None, status_index=None):
+        issuer = issuer or universities[0]
+        tx = Transaction(hashlib.sha256(credential_id.encode()).hexdigest(), credential_id, "wallet",
+                         revocation_status=transaction_type == "REVOCA",
+                         transaction_type=transaction_type, issuer_id=issuer.university_id,
+                         status_index=status_index)
+        tx.sign_transaction(issuer.get_private_key())
+        return tx
+    return make
+
+
+@pytest.fixture
+def make_credential(mobility_ca, universities):
+    """
+    Costruisce una credenziale accademica dell'emittente (default: la prima università).
+    """
+    def make(issuer=None, exams=None, credential_status=None):
+        issuer = issuer or universities[0]
+        subject = CredentialSubject("8742", "Alice Rossi", "2002-07-11", "Salerno", "+393331234567",
+                                    "alice.rossi@studenti.it", validator=mobility_ca.get_validator())
+        degree = Degree("Laurea in Ingegneria Informatica", "triennale", "2024-09-15", "100",
+                        issuer.official_name, "TESI", "")
+        enrollment = Enrollment(2024, 2023, "2023-10-01", "INGEGNERIA", "CORSO DI LAUREA", "LM-32", "attivo")
+        if exams is None:
+            exams = [ExamRecord("Sicurezza", "0622720", "scritto", "obbligatoria", 30, 9, "2025-01-15", "Ingegneria"),
+                     ExamRecord("Automazione", "0622740", "scritto", "obbligatoria", 18, 6, "2025-03-01", "Ingegneria")]
+        return AcademicCredential(subject, degree, enrollment, ValidityPeriod(issued_at="2025-04-01T10:00:00"),
+                                  Issuer(issuer.university_id, issuer.official_name, issuer.location), exams,
+                                  credential_status=credential_status)
+    return make
+
+
+@pytest.fixture
+def issue_credential(blockchain, universities, make_credential):
+    """
+    Memorizza una credenziale nel wallet e ne ancora l'EMISSIONE sulla catena
+    con la Merkle Root degli attributi calcolata dal wallet.
+    """
+    def issue(wallet, credential_id, issuer=None, credential=None):
+        issuer = issuer or universities[0]
+        credential = credential or make_credential(issuer)
+        wallet.store_credential(credential_id, credential)
+        merkle_root = wallet.generate_presentation_proof(credential_id, [])["merkleRoot"]
+        tx = Transaction(hashlib.sha256(str(credential.to_dict()).encode()).hexdigest(), credential_id,
+                         wallet.get_wallet_address(), issuer_id=issuer.university_id)
+        tx.sign_transaction(issuer.get_private_key())
+        return blockchain.add_next_block(tx, "1.0", issuer, attributes_merkle_root=merkle_root)
+    return issue
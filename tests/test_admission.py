@@ -0,0 +1,73 @@
+import pytest
+
+from UniChain.blockchain.block_producer import BlockProducer
+
+
+def test_direct_blocks_reject_duplicate_issuance(blockchain, universities, make_transaction):
+    proposer = universities[0]
+    blockchain.add_next_block(make_transaction("cred-0", status_index=0), "1.0", proposer)
+
+    with pytest.raises(Exception):
+        blockchain.add_next_block(make_transaction("cred-0", status_index=1), "1.0", proposer)
+    with pytest.raises(Exception):
+        blockchain.add_next_block(make_transaction("cred-1", status_index=0), "1.0", proposer)
+    assert len(blockchain.chain) == 2
+
+
+@pytest.mark.parametrize("batch", [
+    [("cred-a", "EMISSIONE", 1), ("cred-a", "EMISSIONE", 2)],
+    [("cred-a", "EMISSIONE", 1), ("cred-b", "EMISSIONE", 1)],
+    [("cred-a", "EMISSIONE", 1), ("cred-a", "REVOCA", None), ("cred-a", "REVOCA", None)],
+    [("cred-x", "REVOCA", None)],
+])
+def test_inadmissible_batches_are_rejected_whole(blockchain, universities, make_transaction, batch):
+    transactions = [make_transaction(cid, tx_type, status_index=index) for cid, tx_type, index in batch]
+
+    with pytest.raises(Exception):
+        blockchain.add_next_block(transactions, "1.0", universities[0])
+    assert len(blockchain.chain) == 1
+    assert blockchain.get_credential_record("cred-a") is None
+
+
+def test_issue_and_revoke_in_the_same_block(blockchain, universities, make_transaction):
+    blockchain.add_next_block([make_transaction("cred-a", status_index=0),
+                               make_transaction("cred-a", "REVOCA")], "1.0", universities[0])
+
+    assert not blockchain.is_credential_valid("cred-a")
+    assert blockchain.get_status_list(universities[0].university_id).is_revoked(0)
+    with pytest.raises(Exception):
+        blockchain.add_next_block(make_transaction("cred-a", "REVOCA"), "1.0", universities[0])
+
+
+def test_status_slots_are_per_issuer(blockchain, universities, make_transaction):
+    blockchain.add_next_block([make_transaction("cred-a", status_index=0),
+                               make_transaction("cred-b", issuer=universities[1], status_index=0)],
+                              "1.0", universities[0])
+
+    assert blockchain.is_credential_valid("cred-a") and blockchain.is_credential_valid("cred-b")
+
+
+def test_add_transaction_rejects_invalid_signatures(blockchain, universities, make_transaction):
+    forged = make_transaction("cred-f")
+    forged.sign_transaction(universities[1].get_private_key())
+    anonymous = make_transaction("cred-n")
+    anonymous.issuer_id = None
+
+    for transaction in (forged, anonymous):
+        with pytest.raises(ValueError):
+            blockchain.add_transaction(transaction)
+    assert len(blockchain.mempool) == 0
+
+
+def test_producer_drops_transactions_that_would_fail_the_block(blockchain, universities, make_transaction):
+    blockchain.add_transaction(make_transaction("cred-0", status_index=0))
+    blockchain.add_transaction(make_transaction("cred-1", status_index=0))   # stesso slot di cred-0
+    forged = make_transaction("cred-2", status_index=2)
+    forged.sign_transaction(universities[1].get_private_key())
+    blockchain.mempool.add(forged)   # entrata aggirando i controlli di add_transaction
+    blockchain.add_transaction(make_transaction("cred-3", status_index=3))
+
+    block = BlockProducer(blockchain, universities).produce_block(force=True)
+
+    assert [tx.credential_unique_id for tx in block.transactions] == ["cred-0", "cred-3"]
+    assert len(blockchain.mempool) == 0
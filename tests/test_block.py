@@ -0,0 +1,33 @@
+import pytest
+
+from UniChain.blockchain.block import Block
+
+
+def test_frozen_block_is_immutable(blockchain, universities, make_transaction):
+    block = blockchain.add_next_block([make_transaction("cred-a"), make_transaction("cred-b")], "1.0",
+                                      universities[0])
+    block_hash = block.block_hash
+
+    assert block.is_frozen
+    assert isinstance(block.transactions, tuple)
+    with pytest.raises(AttributeError):
+        block.signature = "00"
+    with pytest.raises(AttributeError):
+        block.transactions = []
+    with pytest.raises(AttributeError):
+        block.transactions.append(make_transaction("cred-c"))
+    with pytest.raises(TypeError):
+        block.transactions[0] = make_transaction("cred-c")
+
+    assert block.block_hash == block_hash == block.calculate_hash()
+    assert blockchain.is_chain_valid(full=True)
+
+
+def test_unfrozen_block_keeps_a_list(universities, make_transaction):
+    block = Block(previous_hash="0", transactions=make_transaction("cred-a"), version="1.0", block_number=1,
+                  block_proposer=universities[0].university_id, signature=None)
+
+    assert block.transactions == [block.transaction]
+    block.signature = "00"
+    assert block.block_hash == block.calculate_hash()
+    assert block.freeze().transactions == (block.transaction,)
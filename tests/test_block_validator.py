@@ -0,0 +1,129 @@
+import copy
+import threading
+import time
+
+from UniChain.blockchain.block import Block
+from UniChain.blockchain.block_validator import BlockValidator
+
+
+def _forged(transaction, forger):
+    """
+    Copia della transazione con la firma di un'altra università: stesso transaction_hash.
+    """
+    forged = copy.copy(transaction)
+    forged.sign_transaction(forger.get_private_key())
+    return forged
+
+
+def _signed_block(blockchain, proposer, transactions):
+    previous = blockchain.get_latest_block()
+    block = Block(previous_hash=previous.block_hash, transactions=transactions, version="1.0",
+                  block_number=previous.block_number + 1, block_proposer=proposer.university_id,
+                  signature=None, signature_suite=proposer.get_crypto_suite().name,
+                  revocation_root=blockchain.get_revocation_root())
+    block.signature = proposer.sign_message(block.get_payload_to_sign()).hex()
+    return block.freeze()
+
+
+def test_forged_signature_does_not_inherit_genuine_result(universities, make_transaction):
+    validator = BlockValidator()
+    issuer_pem = universities[0].get_serialized_public_key()
+    genuine = make_transaction("cred-a")
+    forged = _forged(genuine, universities[1])
+
+    assert forged.transaction_hash == genuine.transaction_hash
+    assert validator.verify_transaction_signature(genuine, issuer_pem)
+    assert not validator.verify_transaction_signature(forged, issuer_pem)
+    assert validator.verifications == 2
+
+
+def test_genuine_signature_is_not_poisoned_by_forged_copy(universities, make_transaction):
+    validator = BlockValidator()
+    issuer_pem = universities[0].get_serialized_public_key()
+    genuine = make_transaction("cred-b")
+
+    assert not validator.verify_transaction_signature(_forged(genuine, universities[1]), issuer_pem)
+    assert validator.verify_transaction_signature(genuine, issuer_pem)
+    # Le verifiche ripetute sono servite dalla cache
+    assert validator.verify_transaction_signature(genuine, issuer_pem)
+    assert validator.cache_hits == 1
+
+
+def test_result_is_bound_to_the_public_key(universities, make_transaction):
+    validator = BlockValidator()
+    tx = make_transaction("cred-c")
+
+    assert validator.verify_transaction_signature(tx, universities[0].get_serialized_public_key())
+    assert not validator.verify_transaction_signature(tx, universities[1].get_serialized_public_key())
+
+
+def test_validate_block_rejects_forged_transaction_after_genuine(blockchain, universities, make_transaction):
+    validator = BlockValidator()
+    public_keys = blockchain.mobility_ca.get_registry_snapshot().public_keys
+    proposer = universities[1]
+    genuine = make_transaction("cred-d")
+    previous_hash = blockchain.get_latest_block().block_hash
+
+    assert validator.validate_block(_signed_block(blockchain, proposer, [genuine]), previous_hash, public_keys)
+    forged_block = _signed_block(blockchain, proposer, [_forged(genuine, universities[2])])
+    assert not validator.validate_block(forged_block, previous_hash, public_keys)
+
+
+def test_forged_block_signature_is_rejected(blockchain, universities, make_transaction):
+    validator = BlockValidator()
+    proposer = universities[0]
+    proposer_pem = proposer.get_serialized_public_key()
+    block = _signed_block(blockchain, proposer, [make_transaction("cred-e")])
+    data = block.to_dict()
+    data["signature"] = universities[1].sign_message(block.get_payload_to_sign()).hex()
+    forged = Block.from_dict(data)
+
+    assert validator.verify_block_signature(block, proposer_pem)
+    assert not validator.verify_block_signature(forged, proposer_pem)
+
+
+class _SlowTransaction:
+    """
+    Transazione fittizia con verifica lenta, per far attendere più repliche sulla stessa firma.
+    """
+
+    def __init__(self, valid):
+        self.transaction_hash = "ab" * 32
+        self.signature = "cd" * 64
+        self.valid = valid
+        self.calls = 0
+
+    def verify_signature(self, public_key_pem):
+        self.calls += 1
+        time.sleep(0.05)
+        return self.valid
+
+
+def test_concurrent_waiters_read_the_result_of_the_same_verification():
+    # LRU di dimensione 0: la voce esce subito dalla cache, chi attende legge l'esito dall'evento
+    validator = BlockValidator(cache_size=0)
+    tx = _SlowTransaction(valid=True)
+    results = []
+
+    def replica():
+        results.append(validator.verify_transaction_signature(tx, "pem"))
+
+    threads = [threading.Thread(target=replica) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 8
+    assert tx.calls == 1 and validator.verifications == 1
+    assert validator.cache_hits == 7
+
+
+def test_verification_errors_are_cached_as_invalid(universities):
+    validator = BlockValidator()
+
+    class Broken(_SlowTransaction):
+        def verify_signature(self, public_key_pem):
+            raise ValueError("firma malformata")
+
+    assert not validator.verify_transaction_signature(Broken(valid=True), universities[0].get_serialized_public_key())
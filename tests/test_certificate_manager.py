@@ -0,0 +1,105 @@
+from types import MappingProxyType
+
+import pytest
+
+from UniChain.utils.crypto_suite import get_suite
+
+
+def test_snapshot_is_rebuilt_only_after_changes(mobility_ca, universities):
+    first = mobility_ca.get_registry_snapshot()
+
+    assert mobility_ca.get_registry_snapshot() is first
+    assert len(first.active) == len(universities)
+    assert first.quorum == 3
+
+    mobility_ca.revoke_certificate(universities[3].university_id)
+    second = mobility_ca.get_registry_snapshot()
+
+    assert second is not first
+    assert second.version > first.version
+    assert mobility_ca.get_registry_snapshot() is second
+    assert universities[3].university_id not in second.public_keys
+    assert second.accreditation[universities[3].university_id] is False
+
+
+def test_snapshot_shares_unchanged_entries(mobility_ca, universities):
+    first = mobility_ca.get_registry_snapshot()
+    mobility_ca.revoke_certificate(universities[3].university_id)
+    second = mobility_ca.get_registry_snapshot()
+
+    assert all(isinstance(entry, MappingProxyType) for entry in second.entries)
+    # Le voci non toccate dalla revoca sono le stesse istanze, la voce revocata è nuova
+    assert all(new is old for new, old in zip(second.entries[:3], first.entries[:3]))
+    assert second.entries[3] is not first.entries[3]
+    assert first.entries[3]["revoked"] is None
+    assert second.entries[3]["revoked"]
+
+
+def test_public_registry_is_a_mutable_copy(mobility_ca, universities):
+    registry = mobility_ca.get_public_registry()
+    registry[0]["official_name"] = "Modificata"
+
+    assert mobility_ca.get_registry_snapshot().entries[0]["official_name"] == "Universita A"
+
+
+def _request(university_id, name="Universita Nuova"):
+    key = get_suite("Ed25519").generate_private_key()
+    return {"public_key": key.public_key(), "university_id": university_id,
+            "official_name": name, "university_code": "UN", "location": "Milano"}
+
+
+def test_batch_rejects_duplicates_and_accredited_universities(mobility_ca, universities):
+    requests = [_request("urn:uni:nuova"), _request("urn:uni:nuova"),
+                _request(universities[0].university_id), {"university_id": "urn:uni:incompleta"}]
+
+    results = mobility_ca.issue_certificates_batch(requests, workers=1)
+
+    assert results[0]["certificate"] is not None and results[0]["error"] is None
+    assert "duplicato" in results[1]["error"]
+    assert "già accreditata" in results[2]["error"]
+    assert "Campo mancante" in results[3]["error"]
+    assert [entry["university_id"] for entry in mobility_ca.get_registry_snapshot().active].count(
+        universities[0].university_id) == 1
+
+
+def test_batch_signed_in_worker_processes(mobility_ca):
+    requests = [_request(f"urn:uni:batch:{i}") for i in range(4)]
+
+    results = mobility_ca.issue_certificates_batch(requests, workers=2)
+
+    assert all(result["error"] is None for result in results)
+    for request, result in zip(requests, results):
+        certificate = result["certificate"]
+        assert certificate.public_key() == request["public_key"]
+        certificate.verify_directly_issued_by(mobility_ca.get_root_certificate())
+        assert mobility_ca.get_certificate(request["university_id"]) == certificate
+    assert len(mobility_ca.get_registry_snapshot().active) == 4
+
+
+def test_issue_rejects_accredited_university(mobility_ca, universities):
+    university_id = universities[0].university_id
+    request = _request(university_id)
+    del request["university_id"]
+
+    with pytest.raises(ValueError, match="già accreditata"):
+        mobility_ca.issue_certificate(university_id=university_id, **request)
+    assert len(mobility_ca.get_registry_snapshot().entries) == len(universities)
+
+
+def test_current_certificate_after_reaccreditation(mobility_ca, universities):
+    university_id = universities[0].university_id
+    first = mobility_ca.get_certificate(university_id)
+    mobility_ca.revoke_certificate(university_id)
+    request = _request(university_id)
+    del request["university_id"]
+
+    second, _ = mobility_ca.issue_certificate(university_id=university_id, **request)
+
+    assert second != first
+    # get_certificate e le chiavi della fotografia seguono lo stesso certificato
+    assert mobility_ca.get_certificate(university_id) == second
+    snapshot = mobility_ca.get_registry_snapshot()
+    assert snapshot.public_keys[university_id] == snapshot.entries[-1]["public_key"]
+    assert snapshot.public_keys[university_id] != snapshot.entries[0]["public_key"]
+    assert snapshot.keys_by_university[university_id] == (snapshot.entries[0]["public_key"],
+                                                          snapshot.entries[-1]["public_key"])
@@ -0,0 +1,61 @@
+import os
+import time
+
+from UniChain.blockchain.blockchain import Blockchain
+from UniChain.blockchain.chain_store import ChainStore
+from UniChain.university.university import University
+
+
+def _reaccredit(mobility_ca, universities, index):
+    """
+    Revoca il certificato dell'università e la riaccredita con una nuova chiave.
+    """
+    old = universities[index]
+    time.sleep(0.01)
+    mobility_ca.revoke_certificate(old.university_id)
+    time.sleep(0.01)
+    new = University(old.university_id, "Universita " + "ABCD"[index], f"U{index}", "Roma",
+                     mobility_ca, crypto_suite="Ed25519")
+    new.request_accreditation()
+    universities[index] = new
+    for uni in universities:
+        uni.set_peers([peer for peer in universities if peer is not uni])
+    return new
+
+
+def test_audit_accepts_blocks_signed_before_reaccreditation(tmp_path, mobility_ca, universities,
+                                                             make_transaction):
+    chain = Blockchain(mobility_ca, store=ChainStore(str(tmp_path)))
+    for i in range(3):
+        chain.add_next_block(make_transaction(f"cred-{i}"), "1.0", universities[0])
+
+    new = _reaccredit(mobility_ca, universities, 0)
+    for i in range(3, 6):
+        chain.add_next_block(make_transaction(f"cred-{i}", issuer=new), "1.0", new)
+
+    report = chain.audit(workers=2, chunk_size=2)
+
+    assert report["valid"], report["errors"]
+    assert report["blocks"] == len(chain.chain)
+    chain.store.close()
+
+
+def test_audit_reports_corrupt_block_once(tmp_path, mobility_ca, universities, make_transaction):
+    chain = Blockchain(mobility_ca, store=ChainStore(str(tmp_path)))
+    for i in range(4):
+        chain.add_next_block(make_transaction(f"cred-{i}"), "1.0", universities[0])
+    chain.store.close()
+
+    path = os.path.join(str(tmp_path), "segment-000000.dat")
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    data[data.find(b"cred-2") + 5] = ord("X")
+    with open(path, "wb") as f:
+        f.write(data)
+
+    reopened = Blockchain(mobility_ca, store=ChainStore(str(tmp_path)))
+    report = reopened.audit(workers=2, chunk_size=2)
+
+    assert not report["valid"]
+    assert [number for number, _ in report["errors"]] == [3]
+    reopened.store.close()
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from UniChain.blockchain.blockchain import Blockchain
+from UniChain.blockchain.chain_store import ChainStore
+
+
+@pytest.fixture
+def stored_chain(tmp_path, mobility_ca, universities, make_transaction):
+    """
+    Catena persistita con tre emissioni (in due blocchi) e una revoca; l'archivio viene chiuso.
+    """
+    store = ChainStore(str(tmp_path))
+    blockchain = Blockchain(mobility_ca, store=store)
+    proposer = universities[0]
+    blockchain.add_next_block([make_transaction("cred-0", status_index=0),
+                               make_transaction("cred-1", status_index=1)], "1.0", proposer)
+    blockchain.add_next_block(make_transaction("cred-2", status_index=2), "1.0", proposer)
+    blockchain.add_next_block(make_transaction("cred-1", "REVOCA"), "1.0", proposer)
+    state = {
+        "length": len(blockchain.chain),
+        "head": blockchain.get_latest_block().block_hash,
+        "revocation_root": blockchain.get_revocation_root(),
+        "issuance": blockchain.get_issuance_block("cred-2").block_hash,
+    }
+    store.close()
+    return str(tmp_path), state
+
+
+def _reopen(directory, mobility_ca, **options):
+    return Blockchain(mobility_ca, store=ChainStore(directory, **options))
+
+
+def _assert_same_state(blockchain, state, issuer_id):
+    assert len(blockchain.chain) == state["length"]
+    assert blockchain.get_latest_block().block_hash == state["head"]
+    assert blockchain.get_revocation_root() == state["revocation_root"]
+    assert blockchain.get_issuance_block("cred-2").block_hash == state["issuance"]
+    assert blockchain.is_credential_valid("cred-0")
+    assert not blockchain.is_credential_valid("cred-1")
+    status_list = blockchain.get_status_list(issuer_id)
+    assert status_list.is_revoked(1) and not status_list.is_revoked(0)
+
+
+def test_reopen_restores_chain_and_index(stored_chain, mobility_ca, universities):
+    directory, state = stored_chain
+    blockchain = _reopen(directory, mobility_ca)
+
+    _assert_same_state(blockchain, state, universities[0].university_id)
+    assert blockchain.is_chain_valid(full=True)
+    blockchain.store.close()
+
+
+def test_reopen_keeps_admission_rules(stored_chain, mobility_ca, universities, make_transaction):
+    directory, _ = stored_chain
+    blockchain = _reopen(directory, mobility_ca)
+
+    with pytest.raises(Exception):
+        blockchain.add_next_block(make_transaction("cred-0", status_index=9), "1.0", universities[0])
+    with pytest.raises(Exception):
+        blockchain.add_next_block(make_transaction("cred-9", status_index=2), "1.0", universities[0])
+    assert blockchain.allocate_status_index(universities[0].university_id) == 3
+
+    block = blockchain.add_next_block(make_transaction("cred-3", status_index=3), "1.0", universities[0])
+    assert block.block_number == len(blockchain.chain) - 1
+    blockchain.store.close()
+
+
+def test_reopen_without_journal_rebuilds_index(stored_chain, mobility_ca, universities):
+    directory, state = stored_chain
+    os.remove(os.path.join(directory, ChainStore.JOURNAL_FILE))
+
+    blockchain = _reopen(directory, mobility_ca)
+    _assert_same_state(blockchain, state, universities[0].university_id)
+    blockchain.store.close()
+
+    # Il giornale è stato riscritto: una seconda riapertura lo usa
+    blockchain = _reopen(directory, mobility_ca)
+    assert len(blockchain.store.read_index_journal()) == state["length"]
+    _assert_same_state(blockchain, state, universities[0].university_id)
+    blockchain.store.close()
+
+
+def test_reopen_discards_interrupted_append(stored_chain, mobility_ca, universities):
+    directory, state = stored_chain
+    # Append interrotta: dati del segmento, record di indice e voce del giornale incompleti
+    with open(os.path.join(directory, "segment-000000.dat"), "ab") as f:
+        f.write(b"\x02partial block")
+    with open(os.path.join(directory, ChainStore.INDEX_FILE), "ab") as f:
+        f.write(b"\x00" * (ChainStore.INDEX_RECORD.size - 1))
+    with open(os.path.join(directory, ChainStore.JOURNAL_FILE), "ab") as f:
+        f.write(ChainStore.JOURNAL_LENGTH.pack(100) + b"\x00")
+
+    blockchain = _reopen(directory, mobility_ca)
+    _assert_same_state(blockchain, state, universities[0].university_id)
+    assert blockchain.is_chain_valid(full=True)
+    blockchain.store.close()
+
+
+def test_read_only_store_reads_the_same_blocks(stored_chain):
+    directory, state = stored_chain
+    store = ChainStore(directory, read_only=True)
+
+    assert len(store) == state["length"]
+    assert store.get_block(len(store) - 1).block_hash == state["head"]
+    with pytest.raises(IOError):
+        store.append(b"")
+    store.close()
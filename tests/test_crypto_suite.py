@@ -0,0 +1,54 @@
+import pytest
+
+from UniChain.utils.crypto_suite import SUITES, CryptoSuite, RSASuite, get_suite, verify_with_pem
+
+DATA = b"payload"
+
+
+@pytest.mark.parametrize("name", sorted(SUITES))
+def test_suite_signs_and_verifies(name):
+    suite = get_suite(name)
+    key = suite.generate_private_key()
+    pem = suite.serialize_public_key(key.public_key())
+    signature = suite.sign(key, DATA)
+
+    assert verify_with_pem(pem, signature, DATA, name)
+    assert not verify_with_pem(pem, signature, b"altro", name)
+
+
+def test_unlabelled_signature_is_verified_as_rsa_only():
+    ed25519 = get_suite("Ed25519")
+    key = ed25519.generate_private_key()
+    pem = ed25519.serialize_public_key(key.public_key())
+    signature = ed25519.sign(key, DATA)
+
+    # Firma senza suite registrata: vale solo lo schema storico RSA
+    assert not verify_with_pem(pem, signature, DATA)
+
+    rsa = get_suite(RSASuite.name)
+    rsa_key = rsa.generate_private_key()
+    assert verify_with_pem(rsa.serialize_public_key(rsa_key.public_key()), rsa.sign(rsa_key, DATA), DATA)
+
+
+def test_suite_must_match_key_type():
+    ed25519 = get_suite("Ed25519")
+    key = ed25519.generate_private_key()
+    pem = ed25519.serialize_public_key(key.public_key())
+    signature = ed25519.sign(key, DATA)
+
+    assert not verify_with_pem(pem, signature, DATA, "ECDSA-P256-SHA256")
+    assert not verify_with_pem(pem, signature, DATA, "suite-sconosciuta")
+
+
+def test_incomplete_suite_cannot_be_instantiated():
+    class Incomplete(CryptoSuite):
+        name = "incompleta"
+
+        def sign(self, private_key, data):
+            return b""
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+    with pytest.raises(ValueError):
+        get_suite("suite-sconosciuta")
@@ -0,0 +1,99 @@
+import pytest
+
+from UniChain.blockchain.block import Block
+from UniChain.blockchain.block_header import BlockHeader
+from UniChain.blockchain.chain_store import decode_block, encode_block
+from UniChain.blockchain.encoding import decode_transaction, encode_transaction
+from UniChain.blockchain.transaction import Transaction
+
+TIMESTAMP = "2025-01-01T00:00:00+00:00"
+
+# Blocco di versione 1 come serializzato dalla prima codifica binaria (foglia di
+# tx_root = solo transaction_hash): hash e tx_root non devono cambiare
+LEGACY_BLOCK = {
+    "attributes_merkle_root": None,
+    "block_number": 1,
+    "block_proposer": "urn:uni:0",
+    "hash_algorithm": "SHA-256",
+    "previous_hash": "33" * 32,
+    "signature": "cd" * 64,
+    "timestamp": TIMESTAMP,
+    "transaction_type": "EMISSIONE",
+    "transactions": [{
+        "attributes_merkle_root": None,
+        "credential_hash": "11" * 32,
+        "credential_unique_id": "cred-0001",
+        "issuer_id": "urn:uni:0",
+        "revocation_status": False,
+        "signature": "ab" * 64,
+        "student_wallet_address": "22" * 32,
+        "transaction_hash": "f73c9e53d1256e538f07d500618a8c3048922765514b0747850bd6bd13499573",
+        "transaction_type": "EMISSIONE",
+    }],
+    "tx_root": "cc5e412cb2d16f5b14564d679518166c6f088e746265b8be197e3f8f3c373191",
+    "validator_info": "Validator Info",
+    "version": "1.0",
+}
+LEGACY_BLOCK_HASH = "4165d0bc56781e99872463a6c1c381c150f3035cbcf3b481fab0545cdbf7a8a1"
+
+
+def _header_block():
+    tx = Transaction("11" * 32, "cred-0002", "22" * 32, issuer_id="urn:uni:0", status_index=7)
+    tx.signature = "ab" * 64
+    tx.signature_suite = "Ed25519"
+    return Block(previous_hash="33" * 32, transactions=tx, version="1.0", block_number=2,
+                 block_proposer="urn:uni:0", signature="cd" * 64, timestamp=TIMESTAMP,
+                 signature_suite="Ed25519", revocation_root="44" * 32).freeze()
+
+
+def test_transaction_roundtrip(make_transaction):
+    tx = make_transaction("cred-rt", status_index=3)
+    values, offset = decode_transaction(encode_transaction(tx))
+    decoded = Transaction.from_dict(values)
+
+    assert offset == len(encode_transaction(tx))
+    assert decoded.to_dict() == tx.to_dict()
+    assert decoded.calculate_signed_hash() == tx.calculate_signed_hash()
+
+
+def test_block_roundtrip(blockchain, universities, make_transaction):
+    transactions = [make_transaction(f"cred-{i}", status_index=i) for i in range(3)]
+    block = blockchain.add_next_block(transactions, "1.0", universities[0])
+
+    decoded = decode_block(encode_block(block))
+
+    assert decoded.block_hash == block.block_hash
+    assert decoded.to_dict() == block.to_dict()
+    assert decoded.has_valid_tx_root()
+
+
+def test_header_roundtrip_keeps_block_hash(blockchain, universities, make_transaction):
+    block = blockchain.add_next_block(make_transaction("cred-h"), "1.0", universities[0])
+    header = BlockHeader.from_bytes(block.get_header().to_bytes())
+
+    assert header.block_hash == block.block_hash
+    assert header.get_payload_to_sign() == block.get_payload_to_sign()
+
+
+def test_version1_block_keeps_its_hash():
+    block = Block.from_dict(LEGACY_BLOCK)
+
+    assert block.tx_root == LEGACY_BLOCK["tx_root"]
+    assert block.block_hash == LEGACY_BLOCK_HASH
+    assert decode_block(encode_block(block)).block_hash == LEGACY_BLOCK_HASH
+
+
+def test_version2_block_hash_is_stable():
+    block = _header_block()
+
+    assert block.transaction.transaction_hash == "75175a46921cf91790800bea47fbae282b6a0081a6a8f32a66d45b2d271f34aa"
+    assert block.tx_root == "7b03e8363b807a0b3cf2f8ea7238f7f2fd54299db96b38ae9757723703b82c6e"
+    assert block.block_hash == "5b8e6d956591481e9b758c82fef309b574e647d8bd4fca94755a03e0b2fc8ffe"
+
+
+def test_version2_block_rejects_tampered_transaction_signature():
+    data = _header_block().to_dict()
+    data["transactions"][0]["signature"] = "ef" * 64
+
+    with pytest.raises(ValueError):
+        Block.from_dict(data)
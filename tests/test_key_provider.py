@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import wait
+
+from cryptography.hazmat.primitives import serialization
+
+from UniChain.utils.crypto_suite import RSASuite
+from UniChain.utils.key_provider import KeyProvider
+
+
+def _public_pem(private_key):
+    return private_key.public_key().public_bytes(serialization.Encoding.PEM,
+                                                 serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+def _cached_files(directory):
+    return [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".pem")]
+
+
+def test_labelled_keys_are_reused_across_runs(tmp_path):
+    first = KeyProvider(cache_dir=str(tmp_path))
+    alice = first.get_private_key("Ed25519", label="wallet:Alice")
+    alice_again = first.get_private_key("Ed25519", label="wallet:Alice")
+
+    second = KeyProvider(cache_dir=str(tmp_path))
+
+    assert _public_pem(alice) != _public_pem(alice_again)
+    assert _public_pem(second.get_private_key("Ed25519", label="wallet:Alice")) == _public_pem(alice)
+    assert _public_pem(second.get_private_key("Ed25519", label="wallet:Alice")) == _public_pem(alice_again)
+    assert second.stats()["from_cache"] == 2
+
+
+def test_corrupt_cache_file_is_regenerated(tmp_path):
+    KeyProvider(cache_dir=str(tmp_path)).get_private_key("Ed25519", label="uni")
+    (path,) = _cached_files(str(tmp_path))
+    with open(path, "wb") as f:
+        f.write(b"non una chiave")
+
+    provider = KeyProvider(cache_dir=str(tmp_path))
+    key = provider.get_private_key("Ed25519", label="uni")
+
+    assert provider.stats() == {"generated": 1, "from_pool": 0, "from_cache": 0, "pending": 0}
+    assert _public_pem(KeyProvider(cache_dir=str(tmp_path)).get_private_key("Ed25519", label="uni")) == \
+        _public_pem(key)
+
+
+def test_cache_file_without_digest_is_regenerated(tmp_path):
+    original = KeyProvider(cache_dir=str(tmp_path)).get_private_key("Ed25519", label="uni")
+    (path,) = _cached_files(str(tmp_path))
+    os.remove(path + ".sha256")
+
+    provider = KeyProvider(cache_dir=str(tmp_path))
+    key = provider.get_private_key("Ed25519", label="uni")
+
+    assert provider.stats()["generated"] == 1
+    assert _public_pem(key) != _public_pem(original)
+
+
+def test_inconsistent_rsa_cache_file_is_rejected(tmp_path):
+    original = KeyProvider(cache_dir=str(tmp_path)).get_private_key(RSASuite.name, label="ca")
+    (path,) = _cached_files(str(tmp_path))
+
+    # Esponente privato alterato: il file resta decodificabile ma la chiave non è coerente
+    der = bytearray(original.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                                           serialization.NoEncryption()))
+    d = original.private_numbers().d.to_bytes(256, "big")
+    der[der.find(d) + 100] ^= 1
+    tampered = serialization.load_der_private_key(bytes(der), None, unsafe_skip_rsa_key_validation=True)
+    with open(path, "wb") as f:
+        f.write(tampered.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                       serialization.NoEncryption()))
+
+    provider = KeyProvider(cache_dir=str(tmp_path))
+    key = provider.get_private_key(RSASuite.name, label="ca")
+
+    assert provider.stats()["generated"] == 1
+    assert _public_pem(key) != _public_pem(original)
+
+
+def test_pool_serves_ready_keys_and_refills():
+    with KeyProvider(pool_size=2, workers=1) as provider:
+        # Nessuna chiave pronta: generazione immediata, il pool parte in background
+        provider.get_private_key("Ed25519")
+        assert provider.stats() == {"generated": 1, "from_pool": 0, "from_cache": 0, "pending": 2}
+
+        wait(provider._pending["Ed25519"])
+        key = provider.get_private_key("Ed25519")
+        signature = key.sign(b"messaggio")
+        key.public_key().verify(signature, b"messaggio")
+
+        stats = provider.stats()
+        assert stats["from_pool"] == 1 and stats["generated"] == 1
+        # La chiave consumata è rimpiazzata
+        assert stats["pending"] == 2
+
+
+def test_pool_keys_go_to_the_cache(tmp_path):
+    with KeyProvider(cache_dir=str(tmp_path), pool_size=1, workers=1) as provider:
+        provider.prefetch("Ed25519")
+        wait(provider._pending["Ed25519"])
+        key = provider.get_private_key("Ed25519", label="wallet:Bob")
+        assert provider.stats()["from_pool"] == 1
+
+    cached = KeyProvider(cache_dir=str(tmp_path))
+    assert _public_pem(cached.get_private_key("Ed25519", label="wallet:Bob")) == _public_pem(key)
+    assert cached.stats()["from_cache"] == 1
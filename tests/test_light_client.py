@@ -0,0 +1,112 @@
+import pytest
+
+from UniChain.blockchain.block_header import BlockHeader, HEADER_FIELDS
+from UniChain.blockchain.transaction import Transaction
+from UniChain.university.light_client import LightClient
+from UniChain.university.verifier import Verifier
+from UniChain.wallet.student_wallet import StudentWallet
+
+
+def rebuild(data, **changes):
+    header = BlockHeader.from_bytes(data)
+    fields = {field: getattr(header, field) for field in HEADER_FIELDS}
+    fields.update(changes)
+    return BlockHeader(**fields).to_bytes()
+
+
+@pytest.fixture
+def chain(blockchain, universities, make_transaction):
+    blockchain.add_next_block(make_transaction("cred-a"), "1.0", universities[0])
+    blockchain.add_next_block(make_transaction("cred-b", issuer=universities[1]), "1.0", universities[1])
+    return blockchain
+
+
+def test_sync_and_incremental_sync(chain, mobility_ca, universities, make_transaction):
+    client = LightClient(mobility_ca, trusted_genesis_hash=chain.chain[0].block_hash)
+
+    assert client.sync(chain) == 3
+    assert client.height == 2
+    assert client.get_latest_header().block_hash == chain.get_latest_block().block_hash
+
+    chain.add_next_block(make_transaction("cred-c"), "1.0", universities[0])
+    assert client.sync(chain) == 1
+    assert client.sync(chain) == 0
+    assert [h.block_hash for h in client.headers] == [b.block_hash for b in chain.chain]
+
+
+def test_out_of_sequence_header(chain, mobility_ca):
+    headers = chain.get_headers()
+    client = LightClient(mobility_ca)
+
+    with pytest.raises(ValueError, match="fuori sequenza"):
+        client.append_headers([headers[0], headers[2]])
+    # Le intestazioni precedenti a quella non valida restano accettate
+    assert client.height == 0
+
+
+def test_wrong_previous_hash(chain, mobility_ca):
+    headers = chain.get_headers()
+    client = LightClient(mobility_ca)
+    client.append_headers(headers[:1])
+
+    with pytest.raises(ValueError, match="previous_hash"):
+        client.append_headers([rebuild(headers[1], previous_hash="ab" * 32)])
+    assert client.height == 0
+
+
+def test_forged_proposer_signature(chain, mobility_ca, universities):
+    headers = chain.get_headers()
+    client = LightClient(mobility_ca)
+    client.append_headers(headers[:1])
+
+    # Intestazione firmata da un'altra università a nome del proponente
+    header = BlockHeader.from_bytes(headers[1])
+    forged = universities[2].sign_message(header.get_payload_to_sign()).hex()
+    with pytest.raises(ValueError, match="firma del proponente"):
+        client.append_headers([rebuild(headers[1], signature=forged)])
+    with pytest.raises(ValueError, match="firma del proponente"):
+        client.append_headers([rebuild(headers[1], signature="not-hex")])
+    assert client.height == 0
+
+
+def test_trusted_genesis_mismatch(chain, mobility_ca):
+    client = LightClient(mobility_ca, trusted_genesis_hash="00" * 32)
+
+    with pytest.raises(ValueError, match="genesi"):
+        client.sync(chain)
+    assert client.get_latest_header() is None
+
+
+def test_verify_inclusion(chain, mobility_ca, make_transaction):
+    client = LightClient(mobility_ca)
+    client.sync(chain)
+    issuance = chain.get_issuance_proof("cred-a")
+    tx = Transaction.from_dict(issuance["transaction"])
+
+    assert client.verify_inclusion(tx, issuance["proof"], issuance["blockNumber"])
+    # Blocco sbagliato, blocco inesistente, transazione diversa, prova malformata
+    assert not client.verify_inclusion(tx, issuance["proof"], 2)
+    assert not client.verify_inclusion(tx, issuance["proof"], 99)
+    assert not client.verify_inclusion(make_transaction("cred-x"), issuance["proof"], issuance["blockNumber"])
+    assert not client.verify_inclusion(tx, "proof", issuance["blockNumber"])
+
+
+def test_light_verifier_checks_use_attached_proofs(blockchain, mobility_ca, universities,
+                                                   issue_credential, make_transaction):
+    alice = StudentWallet("Alice", crypto_suite="Ed25519")
+    issue_credential(alice, "cred-1")
+    client = LightClient(mobility_ca)
+    client.sync(blockchain)
+    verifier = Verifier(light_client=client)
+    merkle_root = alice.generate_presentation_proof("cred-1", [])["merkleRoot"]
+    issuance_proof = blockchain.get_issuance_proof("cred-1")
+
+    assert verifier.check_merkle_root_on_chain("cred-1", merkle_root, issuance_proof)
+    assert not verifier.check_merkle_root_on_chain("cred-1", "00" * 32, issuance_proof)
+    assert not verifier.check_merkle_root_on_chain("cred-1", merkle_root)
+    assert verifier.check_revocation_status("cred-1", blockchain.get_revocation_proof("cred-1"))
+    assert not verifier.check_revocation_status("cred-1")
+
+    blockchain.add_next_block(make_transaction("cred-1", "REVOCA"), "1.0", universities[0])
+    client.sync(blockchain)
+    assert not verifier.check_revocation_status("cred-1", blockchain.get_revocation_proof("cred-1"))
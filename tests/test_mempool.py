@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from UniChain.blockchain.block_producer import BlockProducer
+from UniChain.blockchain.mempool import Mempool
+
+
+def test_revocations_are_served_first(make_transaction):
+    mempool = Mempool()
+    for i in range(3):
+        mempool.add(make_transaction(f"cred-{i}"))
+    mempool.add(make_transaction("cred-r", "REVOCA"))
+
+    assert [tx.credential_unique_id for tx in mempool.pop_batch(10)] == ["cred-r", "cred-0", "cred-1", "cred-2"]
+
+
+def test_one_pending_transaction_per_credential(make_transaction):
+    mempool = Mempool()
+    tx = make_transaction("cred-0")
+
+    assert mempool.add(tx)
+    assert not mempool.add(tx)
+    assert not mempool.add(make_transaction("cred-0", "REVOCA"))
+    assert len(mempool) == 1
+
+
+def test_full_pool_evicts_newest_issuance_for_a_revocation(make_transaction):
+    mempool = Mempool(max_size=2)
+    mempool.add(make_transaction("cred-0"))
+    mempool.add(make_transaction("cred-1"))
+
+    with pytest.raises(ValueError):
+        mempool.add(make_transaction("cred-2"))
+    assert mempool.add(make_transaction("cred-r", "REVOCA"))
+    assert [tx.credential_unique_id for tx in mempool.snapshot()] == ["cred-r", "cred-0"]
+
+
+def test_requeue_keeps_the_original_arrival(make_transaction):
+    mempool = Mempool(max_age=0.2)
+    mempool.add(make_transaction("cred-0"))
+    time.sleep(0.1)
+
+    mempool.requeue(mempool.pop_batch(10))
+
+    assert mempool.oldest_age() >= 0.1
+    time.sleep(0.15)
+    assert mempool.pop_batch(10) == []
+
+
+def test_expired_arrival_is_not_requeued(make_transaction):
+    mempool = Mempool(max_age=1.0)
+
+    assert not mempool.add(make_transaction("cred-0"), received_at=time.monotonic() - 2)
+    assert len(mempool) == 0
+
+
+def test_failed_block_requeues_only_valid_transactions(blockchain, universities, make_transaction, monkeypatch):
+    blockchain.add_transaction(make_transaction("cred-0"))
+    blockchain.add_transaction(make_transaction("cred-1"))
+    producer = BlockProducer(blockchain, universities)
+
+    def failing_consensus(*args, **kwargs):
+        # Emittente di cred-1 revocato durante il consenso: la sua firma non è più accettata
+        monkeypatch.setattr(blockchain, "is_transaction_signature_valid",
+                            lambda tx: tx.credential_unique_id != "cred-1")
+        raise Exception("[PBFT] Consenso fallito.")
+
+    monkeypatch.setattr(blockchain.consensus, "run", failing_consensus)
+    with pytest.raises(Exception):
+        producer.produce_block(force=True)
+
+    assert [tx.credential_unique_id for tx in blockchain.mempool.snapshot()] == ["cred-0"]
+
+
+@pytest.mark.parametrize("block_number", [0, 2, 5])
+def test_add_block_rejects_wrong_block_number(blockchain, universities, make_transaction, block_number):
+    with pytest.raises(ValueError, match="Numero di blocco"):
+        blockchain.add_block(make_transaction("cred-0"), "1.0", block_number, universities[0])
+    assert len(blockchain.chain) == 1
+
+    block = blockchain.add_block(make_transaction("cred-0"), "1.0", blockchain.next_block_number(), universities[0])
+    assert block.block_number == 1
@@ -0,0 +1,166 @@
+import itertools
+
+import pytest
+
+from UniChain.structures.merkle_tree import MerkleTree
+from UniChain.university.verifier import Verifier
+
+
+def _tree(size, legacy=False):
+    leaves = [(f"campo{i}", f"valore{i}") for i in range(size)]
+    return MerkleTree(leaves, legacy=legacy), dict(leaves)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13])
+def test_multiproof_accepts_every_subset(size):
+    tree, values = _tree(size)
+    root = tree.get_root()
+    labels = list(values)
+    for count in range(1, size + 1):
+        for subset in itertools.combinations(labels, count):
+            proof = tree.get_multiproof(list(subset))
+            assert MerkleTree.verify_multiproof([values[label] for label in subset], proof, root)
+
+
+def test_multiproof_accepts_unordered_and_repeated_labels():
+    tree, values = _tree(11)
+    labels = ["campo9", "campo2", "campo9", "campo0"]
+    proof = tree.get_multiproof(labels)
+
+    assert MerkleTree.verify_multiproof([values[label] for label in labels], proof, tree.get_root())
+
+
+def test_multiproof_is_smaller_than_single_proofs():
+    tree, values = _tree(64)
+    labels = [f"campo{i}" for i in range(0, 64, 4)]
+    proof = tree.get_multiproof(labels)
+
+    assert len(proof["hashes"]) < sum(len(tree.get_proof(label)) for label in labels)
+    for label in labels:
+        assert MerkleTree.verify_proof(values[label], tree.get_proof(label), tree.get_root())
+
+
+def test_multiproof_legacy_scheme():
+    tree, values = _tree(7, legacy=True)
+    labels = ["campo1", "campo6"]
+    proof = tree.get_multiproof(labels)
+    values_in_order = [values[label] for label in labels]
+
+    assert MerkleTree.verify_multiproof(values_in_order, proof, tree.get_root(), legacy=True)
+    assert not MerkleTree.verify_multiproof(values_in_order, proof, tree.get_root())
+
+
+@pytest.fixture
+def revealed():
+    tree, values = _tree(10)
+    labels = ["campo1", "campo4", "campo7"]
+    return tree.get_root(), tree.get_multiproof(labels), [values[label] for label in labels]
+
+
+def _mutations(proof, leaf_values):
+    """
+    Varianti non valide di una multiproof corretta: (descrizione, valori, proof).
+    """
+    yield "valore alterato", ["falso"] + leaf_values[1:], proof
+    yield "valori scambiati", [leaf_values[1], leaf_values[0]] + leaf_values[2:], proof
+    yield "valore mancante", leaf_values[:-1], proof
+    yield "nessuna foglia", [], dict(proof, leafIndices=[])
+    yield "hash alterato", leaf_values, dict(proof, hashes=["00" * 32] + proof["hashes"][1:])
+    yield "hash mancante", leaf_values, dict(proof, hashes=proof["hashes"][:-1])
+    yield "hash in eccesso", leaf_values, dict(proof, hashes=proof["hashes"] + ["00" * 32])
+    yield "hash non esadecimale", leaf_values, dict(proof, hashes=["zz"] + proof["hashes"][1:])
+    yield "indice fuori intervallo", leaf_values, dict(proof, leafIndices=[1, 4, 10])
+    yield "indice negativo", leaf_values, dict(proof, leafIndices=[-1, 4, 7])
+    yield "indice spostato", leaf_values, dict(proof, leafIndices=[0, 4, 7])
+    yield "numero di foglie errato", leaf_values, dict(proof, leafCount=8)
+    yield "numero di foglie insufficiente", leaf_values, dict(proof, leafCount=5)
+    yield "stessa foglia con valori diversi", leaf_values, dict(proof, leafIndices=[1, 1, 7])
+    yield "campo mancante", leaf_values, {k: v for k, v in proof.items() if k != "hashes"}
+
+
+def test_multiproof_rejects_tampering(revealed):
+    root, proof, leaf_values = revealed
+    assert MerkleTree.verify_multiproof(leaf_values, proof, root)
+
+    for description, values, mutated in _mutations(proof, leaf_values):
+        assert not MerkleTree.verify_multiproof(values, mutated, root), description
+
+
+def test_multiproof_rejects_other_root(revealed):
+    _, proof, leaf_values = revealed
+
+    assert not MerkleTree.verify_multiproof(leaf_values, proof, "00" * 32)
+    assert not MerkleTree.verify_multiproof(leaf_values, proof, _tree(11)[0].get_root())
+
+
+def test_multiproof_unknown_label():
+    tree, _ = _tree(4)
+    with pytest.raises(ValueError):
+        tree.get_multiproof(["campo9"])
+
+
+def test_verifier_requires_multiproof_to_cover_revealed_attributes():
+    tree, values = _tree(6)
+    labels = ["campo1", "campo3"]
+    multiproof = dict(tree.get_multiproof(labels), labels=labels)
+    revealed = {label: values[label] for label in labels}
+
+    assert Verifier.verify_merkle_multiproof(revealed, multiproof, tree.get_root())
+    assert not Verifier.verify_merkle_multiproof(dict(revealed, campo5=values["campo5"]), multiproof,
+                                                 tree.get_root())
+    assert not Verifier.verify_merkle_multiproof(dict(revealed, campo3="falso"), multiproof, tree.get_root())
+
+
+# --- Albero indicizzato e proof singole ---
+
+# Root dei cinque attributi di `_tree(5)` calcolata dall'implementazione storica
+# (nodi interni sulla concatenazione esadecimale): le root già ancorate restano verificabili
+LEGACY_ROOT_5 = "f2358ff40f43f870354782913e97f79659dad62973ec16eb6627d4037099a90f"
+
+
+def test_legacy_root_matches_historical_implementation():
+    tree, values = _tree(5, legacy=True)
+
+    assert tree.get_root() == LEGACY_ROOT_5
+    for label, value in values.items():
+        assert MerkleTree.verify_legacy_proof(value, tree.get_proof(label), LEGACY_ROOT_5)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 9, 16, 17])
+def test_single_proofs(size):
+    tree, values = _tree(size)
+    root = tree.get_root()
+
+    for label, value in values.items():
+        proof = tree.get_proof(label)
+        assert MerkleTree.verify_proof(value, proof, root)
+        assert not MerkleTree.verify_proof(value + "x", proof, root)
+        if size > 1:
+            # Con più foglie lo schema storico produce una root diversa
+            assert not MerkleTree.verify_legacy_proof(value, proof, root)
+
+
+def test_tampered_single_proof_is_rejected():
+    tree, values = _tree(6)
+    root = tree.get_root()
+    proof = tree.get_proof("campo2")
+    flipped = [("right" if direction == "left" else "left", sibling) for direction, sibling in proof]
+
+    assert not MerkleTree.verify_proof(values["campo2"], flipped, root)
+    assert not MerkleTree.verify_proof(values["campo2"], proof[:-1], root)
+    assert not MerkleTree.verify_proof(values["campo2"], [("left", "zz")] + proof[1:], root)
+
+
+def test_index_and_leaves():
+    tree = MerkleTree([("a", "1"), ("b", "2"), ("a", "3")])
+
+    assert len(tree) == 3
+    assert tree.index_of("b") == 1
+    assert tree.index_of("a") == 0   # etichette ripetute: vale la prima foglia
+    assert [label for label, _ in tree.leaves] == ["a", "b", "a"]
+    with pytest.raises(ValueError):
+        tree.get_proof("c")
+
+
+def test_empty_tree_has_no_root():
+    assert MerkleTree([]).get_root() is None
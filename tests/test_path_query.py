@@ -0,0 +1,101 @@
+import pytest
+
+from UniChain.structures.exam_record import ExamRecord
+from UniChain.wallet.path_query import PathIndex, compile_query
+from UniChain.wallet.student_wallet import StudentWallet
+
+FLAT = [
+    ("credential.credentialSubject.name", "Alice"),
+    ("credential.credentialSubject.email", "alice@example.org"),
+    ("credential.degree.finalGrade", "110"),
+    ("credential.exams[0].courseName", "Sicurezza"),
+    ("credential.exams[0].grade", "30"),
+    ("credential.exams[0].credits", "9"),
+    ("credential.exams[1].courseName", "Automazione"),
+    ("credential.exams[1].grade", "18"),
+    ("credential.exams[1].credits", "6"),
+    ("credential.exams[10].courseName", "Reti"),
+    ("credential.exams[10].grade", "27"),
+    ("credential.exams[10].credits", "12"),
+]
+
+
+@pytest.fixture
+def index():
+    return PathIndex(FLAT)
+
+
+def labels(index, *queries):
+    return [FLAT[position][0] for position in index.select(queries)]
+
+
+def test_exact_segments(index):
+    assert labels(index, "credential.exams[1].grade") == ["credential.exams[1].grade"]
+    # Il confronto è su segmenti interi: `grade` non seleziona `finalGrade`
+    assert labels(index, "grade") == ["credential.exams[0].grade", "credential.exams[1].grade",
+                                      "credential.exams[10].grade"]
+    # `exams[1]` non deve selezionare `exams[10]`
+    assert labels(index, "exams[1].courseName") == ["credential.exams[1].courseName"]
+    assert labels(index, "credential.exams[2].grade") == []
+    assert labels(index, "credential.name") == []
+
+
+def test_wildcards(index):
+    assert labels(index, "credential.exams[*].credits") == ["credential.exams[0].credits",
+                                                            "credential.exams[1].credits",
+                                                            "credential.exams[10].credits"]
+    assert labels(index, "credential.*.name") == ["credential.credentialSubject.name"]
+    assert labels(index, "[*].courseName") == ["credential.exams[0].courseName",
+                                               "credential.exams[1].courseName",
+                                               "credential.exams[10].courseName"]
+
+
+def test_predicates(index):
+    # Confronto numerico: "9" >= "6" ma anche "12" >= "6"
+    assert labels(index, "credential.exams[credits>=9].courseName") == ["credential.exams[0].courseName",
+                                                                        "credential.exams[10].courseName"]
+    assert labels(index, "exams[courseName='Automazione'].grade") == ["credential.exams[1].grade"]
+    assert labels(index, "exams[courseName != Automazione].grade") == ["credential.exams[0].grade",
+                                                                       "credential.exams[10].grade"]
+    assert labels(index, "exams[grade<18].grade") == []
+    assert labels(index, "exams[missing=1].grade") == []
+
+
+def test_internal_node_selects_subtree(index):
+    assert labels(index, "credential.exams[1]") == ["credential.exams[1].courseName",
+                                                    "credential.exams[1].grade",
+                                                    "credential.exams[1].credits"]
+    assert labels(index, "credentialSubject") == ["credential.credentialSubject.name",
+                                                  "credential.credentialSubject.email"]
+
+
+def test_union_keeps_merkle_order(index):
+    assert index.select(["credential.exams[1].grade", "name", "credential.exams[1].grade"]) == [0, 7]
+
+
+@pytest.mark.parametrize("query", ["", "   ", "credential..name", "exams[credits>>6]",
+                                   "exams[credits]", "exams[", "exams[0]]"])
+def test_syntax_errors(query):
+    with pytest.raises(ValueError):
+        compile_query(query)
+
+
+def test_compiled_queries_are_memoized():
+    assert compile_query("credential.exams[*].grade") is compile_query("credential.exams[*].grade")
+    assert compile_query("credential.exams[*].grade").absolute
+    assert not compile_query("exams[*].grade").absolute
+
+
+def test_store_credential_invalidates_path_index(make_credential):
+    wallet = StudentWallet("Alice", crypto_suite="Ed25519")
+    wallet.store_credential("cred-1", make_credential())
+
+    first = wallet.generate_presentation_proof("cred-1", ["exams[credits>=9].courseName"])
+    assert first["revealedAttributes"] == {"credential.exams[0].courseName": "Sicurezza"}
+
+    exams = [ExamRecord("Reti", "0622750", "orale", "obbligatoria", 28, 12, "2025-06-01", "Ingegneria")]
+    wallet.store_credential("cred-1", make_credential(exams=exams))
+
+    second = wallet.generate_presentation_proof("cred-1", ["exams[credits>=9].courseName"])
+    assert second["revealedAttributes"] == {"credential.exams[0].courseName": "Reti"}
+    assert second["merkleRoot"] != first["merkleRoot"]
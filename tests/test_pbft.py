@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from UniChain.blockchain.pbft import PBFTEngine, PBFTMessage, PBFTReplica
+
+
+def _replicas(n):
+    return [(f"replica-{i}", f"Replica {i}") for i in range(n)]
+
+
+def _run(engine, n, validate=None, proposals=None):
+    replicas = _replicas(n)
+    return engine.run(replicas, replicas[0][0], proposals or [("blocco", "digest")], validate)
+
+
+@pytest.fixture
+def crashed(monkeypatch):
+    """
+    Repliche che non rispondono: scartano ogni messaggio ricevuto.
+    """
+    ids = set()
+    handle = PBFTReplica.handle
+
+    async def silent_handle(self, message):
+        if self.replica_id not in ids:
+            await handle(self, message)
+
+    monkeypatch.setattr(PBFTReplica, "handle", silent_handle)
+    return ids
+
+
+@pytest.fixture
+def equivocating(monkeypatch):
+    """
+    Repliche bizantine: alla proposta rispondono con PREPARE e COMMIT per un altro digest.
+    """
+    ids = set()
+    handle = PBFTReplica.handle
+
+    async def byzantine_handle(self, message):
+        if self.replica_id not in ids:
+            await handle(self, message)
+        elif message.phase == "PRE-PREPARE":
+            for phase in ("PREPARE", "COMMIT"):
+                self.engine.broadcast(PBFTMessage(phase, message.sequence, "digest-falso", self.replica_id))
+
+    monkeypatch.setattr(PBFTReplica, "handle", byzantine_handle)
+    return ids
+
+
+@pytest.mark.parametrize("n, expected", [(1, (0, 1)), (4, (1, 3)), (7, (2, 5)), (10, (3, 7)), (100, (33, 67))])
+def test_quorum_size(n, expected):
+    assert PBFTEngine.quorum_size(n) == expected
+
+
+def test_all_honest_replicas_commit():
+    result = _run(PBFTEngine(), 4)[0]
+
+    assert result["committed"]
+    assert result["commit_votes"] == {replica_id for replica_id, _ in _replicas(4)}
+    assert all(latency is not None for latency in result["phase_latency_ms"].values())
+
+
+@pytest.mark.parametrize("n", [4, 7, 10])
+def test_commits_with_f_rejecting_replicas(n):
+    faulty, _ = PBFTEngine.quorum_size(n)
+    rejecting = {f"replica-{n - 1 - i}" for i in range(faulty)}
+
+    result = _run(PBFTEngine(), n, validate=lambda replica_id, _: replica_id not in rejecting)[0]
+
+    assert result["committed"]
+    assert result["rejected"] == rejecting
+    assert not result["commit_votes"] & rejecting
+
+
+@pytest.mark.parametrize("n", [4, 7, 10])
+def test_fails_with_f_plus_one_rejecting_replicas(n):
+    faulty, _ = PBFTEngine.quorum_size(n)
+    rejecting = {f"replica-{n - 1 - i}" for i in range(faulty + 1)}
+
+    result = _run(PBFTEngine(timeout=5), n, validate=lambda replica_id, _: replica_id not in rejecting)[0]
+
+    assert not result["committed"]
+
+
+def test_validation_errors_count_as_rejections():
+    def validate(replica_id, _):
+        if replica_id == "replica-3":
+            raise ValueError("proposta non decodificabile")
+        return True
+
+    result = _run(PBFTEngine(), 4, validate=validate)[0]
+
+    assert result["committed"] and result["rejected"] == {"replica-3"}
+
+
+@pytest.mark.parametrize("n", [4, 7])
+def test_commits_with_f_crashed_replicas(crashed, n):
+    faulty, _ = PBFTEngine.quorum_size(n)
+    crashed.update(f"replica-{n - 1 - i}" for i in range(faulty))
+
+    result = _run(PBFTEngine(link_latency=0.001), n)[0]
+
+    assert result["committed"]
+    assert not result["commit_votes"] & crashed
+
+
+def test_stalls_with_f_plus_one_crashed_replicas(crashed):
+    crashed.update({"replica-2", "replica-3"})
+
+    result = _run(PBFTEngine(timeout=0.3), 4)[0]
+
+    assert not result["committed"]
+
+
+def test_equivocating_replicas_cannot_commit_another_digest(equivocating):
+    equivocating.add("replica-3")
+
+    result = _run(PBFTEngine(link_latency=0.001), 4)[0]
+
+    assert result["committed"] and result["digest"] == "digest"
+    assert result["commit_votes"] == {"replica-0", "replica-1", "replica-2"}
+
+
+def test_equivocation_beyond_f_prevents_commit(equivocating):
+    equivocating.update({"replica-2", "replica-3"})
+
+    result = _run(PBFTEngine(timeout=0.3), 4)[0]
+
+    assert not result["committed"]
+
+
+def test_pipelined_sequences_commit_in_order():
+    proposals = [(f"blocco-{i}", f"digest-{i}") for i in range(6)]
+    replicas = _replicas(4)
+
+    results = PBFTEngine(link_latency=0.001, max_in_flight=3).run(replicas, replicas[0][0], proposals,
+                                                                   first_sequence=10)
+
+    assert [r["sequence"] for r in results] == list(range(10, 16))
+    assert [r["digest"] for r in results] == [digest for _, digest in proposals]
+    assert all(r["committed"] for r in results)
+
+
+def test_unknown_primary_is_rejected():
+    with pytest.raises(ValueError):
+        PBFTEngine().run(_replicas(4), "replica-x", [("blocco", "digest")])
+
+
+def test_run_inside_a_running_event_loop():
+    engine = PBFTEngine()
+
+    async def caller():
+        # Es. Blockchain.add_block invocato da codice asyncio
+        return engine.run(_replicas(4), "replica-0", [("blocco", "digest")])[0]["committed"]
+
+    assert asyncio.run(caller())
+
+
+def test_blockchain_survives_a_rejecting_replica(blockchain, universities, make_transaction, monkeypatch):
+    validate_block = blockchain.validator.validate_block
+    calls = []
+
+    def faulty_validate(block, previous_hash, public_keys):
+        calls.append(block.block_hash)
+        # La quarta replica a validare rifiuta ogni blocco
+        return len(calls) % 4 != 0 and validate_block(block, previous_hash, public_keys)
+
+    monkeypatch.setattr(blockchain.validator, "validate_block", faulty_validate)
+    block = blockchain.add_next_block(make_transaction("cred-pbft"), "1.0", universities[0])
+
+    assert blockchain.get_latest_block() is block
+    assert blockchain.get_issuance_block("cred-pbft") is block
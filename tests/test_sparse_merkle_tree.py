@@ -0,0 +1,120 @@
+import pytest
+
+from UniChain.structures.sparse_merkle_tree import EMPTY_ROOT, SparseMerkleTree, key_for
+from UniChain.university.verifier import Verifier
+
+REVOKED = [key_for(f"revocata-{i}") for i in range(20)]
+VALID = key_for("valida")
+
+
+@pytest.fixture
+def tree():
+    smt = SparseMerkleTree()
+    for key in REVOKED:
+        smt.insert(key)
+    return smt
+
+
+def test_empty_tree_proves_non_membership():
+    smt = SparseMerkleTree()
+    proof = smt.get_proof(VALID)
+
+    assert smt.get_root() == EMPTY_ROOT
+    assert proof["siblings"] == []
+    assert SparseMerkleTree.verify_non_membership(VALID, proof, EMPTY_ROOT)
+
+
+def test_membership_proofs(tree):
+    root = tree.get_root()
+    for key in REVOKED:
+        proof = tree.get_proof(key)
+        assert proof["member"] and tree.contains(key)
+        assert SparseMerkleTree.verify_proof(key, proof, root)
+        assert not SparseMerkleTree.verify_non_membership(key, proof, root)
+
+
+def test_non_membership_proof(tree):
+    root = tree.get_root()
+    proof = tree.get_proof(VALID)
+
+    assert not proof["member"] and not tree.contains(VALID)
+    assert SparseMerkleTree.verify_non_membership(VALID, proof, root)
+    # La stessa proof non dimostra l'appartenenza
+    assert not SparseMerkleTree.verify_proof(VALID, dict(proof, member=True), root)
+
+
+def test_non_membership_cannot_be_claimed_for_a_member(tree):
+    key = REVOKED[0]
+    forged = dict(tree.get_proof(key), member=False)
+
+    assert not SparseMerkleTree.verify_non_membership(key, forged, tree.get_root())
+
+
+def test_proof_is_bound_to_key_and_root(tree):
+    root = tree.get_root()
+    proof = tree.get_proof(VALID)
+
+    assert not SparseMerkleTree.verify_non_membership(key_for("altra"), proof, root)
+    assert not SparseMerkleTree.verify_non_membership(VALID, proof, EMPTY_ROOT)
+
+    # Dopo la revoca la vecchia prova di non appartenenza non vale per la nuova root
+    tree.insert(VALID)
+    assert not SparseMerkleTree.verify_non_membership(VALID, proof, tree.get_root())
+    assert SparseMerkleTree.verify_proof(VALID, tree.get_proof(VALID), tree.get_root())
+
+
+def test_tampered_proofs_are_rejected(tree):
+    root = tree.get_root()
+    proof = tree.get_proof(VALID)
+    siblings = proof["siblings"]
+    bitmap = bytearray.fromhex(proof["bitmap"])
+    bitmap[-1] ^= 1
+
+    mutations = {
+        "fratello alterato": dict(proof, siblings=["00" * 32] + siblings[1:]),
+        "fratello mancante": dict(proof, siblings=siblings[:-1]),
+        "fratello in eccesso": dict(proof, siblings=siblings + ["00" * 32]),
+        "bitmap alterata": dict(proof, bitmap=bitmap.hex()),
+        "bitmap non esadecimale": dict(proof, bitmap="zz"),
+        "campo mancante": {k: v for k, v in proof.items() if k != "siblings"},
+    }
+    for description, mutated in mutations.items():
+        assert not SparseMerkleTree.verify_non_membership(VALID, mutated, root), description
+
+
+def test_root_is_independent_of_insertion_order(tree):
+    reordered = SparseMerkleTree()
+    for key in reversed(REVOKED):
+        reordered.insert(key)
+
+    assert reordered.get_root() == tree.get_root()
+
+
+def test_root_with_does_not_modify_the_tree(tree):
+    root = tree.get_root()
+    expected = tree.root_with([VALID, REVOKED[0]])
+
+    assert tree.get_root() == root and len(tree) == len(REVOKED)
+    tree.insert(VALID)
+    assert tree.get_root() == expected
+
+
+def test_duplicate_insert_is_a_no_op(tree):
+    root = tree.get_root()
+    tree.insert(REVOKED[3])
+
+    assert tree.get_root() == root and len(tree) == len(REVOKED)
+
+
+def test_chain_revocation_proofs(blockchain, universities, make_transaction):
+    blockchain.add_next_block([make_transaction("cred-ok"), make_transaction("cred-ko")], "1.0", universities[0])
+    blockchain.add_next_block(make_transaction("cred-ko", "REVOCA"), "1.0", universities[0])
+    verifier = Verifier(blockchain)
+    head = blockchain.get_latest_block()
+
+    assert head.revocation_root == blockchain.get_revocation_root()
+    assert verifier.check_revocation_proof("cred-ok", blockchain.get_revocation_proof("cred-ok"))
+    assert not verifier.check_revocation_proof("cred-ko", blockchain.get_revocation_proof("cred-ko"))
+    # Una prova ottenuta prima della revoca non vale rispetto all'intestazione corrente
+    stale = {"proof": SparseMerkleTree().get_proof(key_for("cred-ko"))}
+    assert not verifier.check_revocation_proof("cred-ko", stale)
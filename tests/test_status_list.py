@@ -0,0 +1,108 @@
+import pytest
+
+from UniChain.blockchain.status_list import StatusList, DEFAULT_SIZE
+from UniChain.university.verifier import Verifier
+
+
+def test_encode_decode_roundtrip():
+    status_list = StatusList("urn:uni:0", size=64)
+    for index in (0, 7, 8, 63):
+        status_list.set_revoked(index)
+
+    decoded = StatusList.decode("urn:uni:0", status_list.encode())
+
+    assert decoded.size == 64
+    assert [i for i in range(64) if decoded.is_revoked(i)] == [0, 7, 8, 63]
+    # Il bit 0 è il più significativo del primo byte
+    assert bytes(decoded._bits[:2]) == b"\x81\x80"
+
+
+def test_default_list_compresses_well():
+    status_list = StatusList("urn:uni:0")
+    status_list.set_revoked(DEFAULT_SIZE - 1)
+
+    encoded = status_list.encode()
+
+    assert len(encoded) < 1024
+    assert StatusList.decode("urn:uni:0", encoded).is_revoked(DEFAULT_SIZE - 1)
+
+
+def test_empty_list_roundtrip_and_growth():
+    empty = StatusList.decode("urn:uni:0", StatusList("urn:uni:0", size=0).encode())
+
+    assert empty.size == 0
+    assert not empty.is_revoked(5)
+    empty.set_revoked(20)
+    assert empty.size == 24
+    assert empty.is_revoked(20) and not empty.is_revoked(19)
+
+
+def test_list_grows_past_its_size():
+    status_list = StatusList("urn:uni:0", size=8)
+    status_list.set_revoked(100)
+
+    assert status_list.size >= 101
+    assert status_list.is_revoked(100)
+    status_list.set_revoked(100, revoked=False)
+    assert not status_list.is_revoked(100)
+
+
+@pytest.mark.parametrize("size", [-8, 12])
+def test_invalid_size_is_rejected(size):
+    with pytest.raises(ValueError):
+        StatusList("urn:uni:0", size=size)
+
+
+def test_publish_and_verify_publication(universities):
+    issuer, other = universities[0], universities[1]
+    status_list = StatusList(issuer.university_id, size=64)
+    status_list.set_revoked(3)
+
+    publication = status_list.publish(issuer, block_number=5)
+
+    assert StatusList.verify_publication(publication, issuer.get_serialized_public_key())
+    assert not StatusList.verify_publication(publication, other.get_serialized_public_key())
+    assert StatusList.from_publication(publication).is_revoked(3)
+
+    tampered = dict(publication, encodedList=StatusList(issuer.university_id, size=64).encode())
+    assert not StatusList.verify_publication(tampered, issuer.get_serialized_public_key())
+    assert not StatusList.verify_publication({k: v for k, v in publication.items() if k != "signature"},
+                                             issuer.get_serialized_public_key())
+    with pytest.raises(ValueError):
+        status_list.publish(other, block_number=5)
+
+
+def test_verifier_checks_status_list(universities):
+    issuer = universities[0]
+    status_list = StatusList(issuer.university_id, size=64)
+    status_list.set_revoked(1)
+    publication = status_list.publish(issuer, block_number=1)
+    issuer_pem = issuer.get_serialized_public_key()
+
+    assert Verifier.check_status_list(publication, 0, issuer_pem)
+    assert not Verifier.check_status_list(publication, 1, issuer_pem)
+    # L'indice arriva come stringa da credentialStatus.statusListIndex
+    assert Verifier.check_status_list(publication, "2", issuer_pem)
+    # Firma di un'altra università: la lista non è attendibile
+    assert not Verifier.check_status_list(publication, 0, universities[1].get_serialized_public_key())
+
+
+def test_issuance_allocates_status_index(blockchain, universities, make_transaction):
+    issuer = universities[0]
+    first = issuer.allocate_credential_status(blockchain)
+    second = issuer.allocate_credential_status(blockchain)
+
+    assert (first.status_list_index, second.status_list_index) == (0, 1)
+    assert first.to_dict() == {"type": "StatusListEntry", "statusPurpose": "revocation",
+                               "statusListIndex": "0", "statusListCredential": issuer.university_id}
+
+    blockchain.add_next_block(make_transaction("cred-a", status_index=first.status_list_index), "1.0", issuer)
+    blockchain.add_next_block(make_transaction("cred-b", status_index=second.status_list_index), "1.0", issuer)
+    blockchain.add_next_block(make_transaction("cred-a", "REVOCA"), "1.0", issuer)
+
+    publication = blockchain.publish_status_list(issuer)
+    issuer_pem = issuer.get_serialized_public_key()
+    assert not Verifier.check_status_list(publication, first.status_list_index, issuer_pem)
+    assert Verifier.check_status_list(publication, second.status_list_index, issuer_pem)
+    # Gli indici di un'altra università sono indipendenti
+    assert universities[1].allocate_credential_status(blockchain).status_list_index == 0
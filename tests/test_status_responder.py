@@ -0,0 +1,73 @@
+from cryptography import x509
+
+from UniChain.moblityCA.status_responder import StatusResponder, verify_status_response
+from UniChain.university.university import University
+
+
+def test_response_is_signed_once_and_served_from_cache(mobility_ca, universities):
+    responder = StatusResponder(mobility_ca)
+    root = mobility_ca.get_root_certificate()
+
+    first = responder.get_university_status(universities[0].university_id)
+    second = responder.get_university_status(universities[0].university_id)
+
+    assert first["status"] == "good"
+    assert second is first
+    assert responder.signed == 1
+    assert verify_status_response(first, root)
+
+    tampered = dict(first, status="revoked")
+    assert not verify_status_response(tampered, root)
+
+
+def test_revocation_invalidates_cached_response(mobility_ca, universities):
+    responder = StatusResponder(mobility_ca)
+    university_id = universities[0].university_id
+    serial = mobility_ca.get_certificate(university_id).serial_number
+
+    assert responder.get_status(serial)["status"] == "good"
+    mobility_ca.revoke_certificate(university_id)
+    revoked = responder.get_status(serial)
+
+    assert revoked["status"] == "revoked"
+    assert revoked["crlNumber"] == mobility_ca.get_crl().extensions.get_extension_for_class(
+        x509.CRLNumber).value.crl_number
+    assert mobility_ca.get_crl().get_revoked_certificate_by_serial_number(serial) is not None
+
+
+def test_revocation_during_signing_is_not_cached_as_good(mobility_ca, universities, monkeypatch):
+    responder = StatusResponder(mobility_ca)
+    university_id = universities[0].university_id
+    serial = mobility_ca.get_certificate(university_id).serial_number
+    build = mobility_ca.build_status_response
+    calls = []
+
+    def build_then_revoke(serial_number, validity=None):
+        response = build(serial_number, validity)
+        if not calls:
+            # Revoca concorrente tra la firma e l'inserimento in cache
+            mobility_ca.revoke_certificate(university_id)
+        calls.append(response["status"])
+        return response
+
+    monkeypatch.setattr(mobility_ca, "build_status_response", build_then_revoke)
+
+    assert responder.get_status(serial)["status"] == "revoked"
+    assert calls == ["good", "revoked"]
+    assert responder.get_status(serial)["status"] == "revoked"
+
+
+def test_unknown_response_is_discarded_after_issuance(mobility_ca, universities):
+    responder = StatusResponder(mobility_ca)
+
+    assert responder.get_status(0x1234)["status"] == "unknown"
+    assert responder.get_status(0x1234)["status"] == "unknown"
+    assert responder.signed == 1
+
+    newcomer = University("urn:uni:nuova", "Universita Nuova", "UN", "Milano", mobility_ca, crypto_suite="Ed25519")
+    newcomer.request_accreditation()
+
+    # Il registro è cambiato: la risposta "unknown" in cache viene rifirmata
+    assert responder.get_status(0x1234)["status"] == "unknown"
+    assert responder.signed == 2
+    assert responder.get_university_status(newcomer.university_id)["status"] == "good"
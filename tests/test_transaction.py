@@ -0,0 +1,124 @@
+import hashlib
+
+import pytest
+
+from UniChain.blockchain.encoding import decode_transaction, encode_transaction
+from UniChain.blockchain.transaction import Transaction
+from UniChain.utils.crypto_suite import SUITES, CryptoSuite, get_suite
+
+# Hash fissato dalla codifica binaria canonica (versione 1): non deve cambiare
+PINNED_HASH = "f73c9e53d1256e538f07d500618a8c3048922765514b0747850bd6bd13499573"
+
+
+def _transaction(**overrides):
+    fields = dict(credential_hash="11" * 32, credential_unique_id="cred-0001",
+                  student_wallet_address="22" * 32, issuer_id="urn:uni:0")
+    fields.update(overrides)
+    return Transaction(**fields)
+
+
+@pytest.fixture(params=list(SUITES))
+def key_pair(request):
+    suite = get_suite(request.param)
+    private_key = suite.generate_private_key()
+    return suite, private_key, CryptoSuite.serialize_public_key(private_key.public_key())
+
+
+def test_hash_is_pinned_and_deterministic():
+    assert _transaction().transaction_hash == PINNED_HASH
+    assert _transaction().transaction_hash == _transaction().transaction_hash
+    assert encode_transaction(_transaction()) == encode_transaction(_transaction())
+
+    payload = encode_transaction(_transaction(), include_hash=False, include_signature=False)
+    assert hashlib.sha256(payload).hexdigest() == PINNED_HASH
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"status_index": 0},
+    {"status_index": 2 ** 40, "attributes_merkle_root": "33" * 32},
+    {"transaction_type": "REVOCA", "revocation_status": True, "issuer_id": None},
+    # Testo non esadecimale o esadecimale non canonico (maiuscolo) resta testo
+    {"credential_hash": "AB" * 32, "student_wallet_address": "indirizzo-è"},
+    {"credential_hash": "abc", "credential_unique_id": ""},
+])
+def test_roundtrip(overrides):
+    tx = _transaction(**overrides)
+    tx.signature = "ab" * 64
+    tx.signature_suite = "Ed25519"
+    encoded = encode_transaction(tx)
+
+    values, offset = decode_transaction(encoded)
+    decoded = Transaction.from_dict(values)
+
+    assert offset == len(encoded)
+    assert decoded.to_dict() == tx.to_dict()
+    assert encode_transaction(decoded) == encoded
+    # Versione 2 solo per le transazioni con indice nella status list
+    assert encoded[0] == (2 if tx.status_index is not None else 1)
+
+
+def test_roundtrip_of_unsigned_transaction():
+    tx = _transaction(status_index=5)
+    values, _ = decode_transaction(encode_transaction(tx))
+
+    assert values["signature"] is None and values["signature_suite"] is None
+    assert Transaction.from_dict(values).transaction_hash == tx.transaction_hash
+
+
+def test_hash_covers_every_field_but_not_the_signature():
+    base = _transaction(status_index=1).transaction_hash
+    for overrides in ({"credential_hash": "12" * 32}, {"credential_unique_id": "cred-0002"},
+                      {"student_wallet_address": "23" * 32}, {"issuer_id": "urn:uni:1"},
+                      {"status_index": 2}, {"attributes_merkle_root": "33" * 32},
+                      {"transaction_type": "REVOCA", "revocation_status": True}):
+        assert _transaction(**{"status_index": 1, **overrides}).transaction_hash != base
+
+    signed = _transaction(status_index=1)
+    signed.signature = "ab" * 64
+    assert signed.transaction_hash == base
+    assert signed.calculate_signed_hash() != _transaction(status_index=1).calculate_signed_hash()
+
+
+def test_signature_is_over_the_raw_digest(key_pair):
+    suite, private_key, public_pem = key_pair
+    tx = _transaction()
+    tx.sign_transaction(private_key)
+
+    assert tx.signature_suite == suite.name
+    assert tx.verify_signature(public_pem)
+    public_key = private_key.public_key()
+    assert suite.verify(public_key, bytes.fromhex(tx.signature), bytes.fromhex(tx.transaction_hash))
+    assert not suite.verify(public_key, bytes.fromhex(tx.signature), tx.transaction_hash.encode())
+
+
+def test_tampering_is_detected(key_pair):
+    suite, private_key, public_pem = key_pair
+    tx = _transaction(status_index=3)
+    tx.sign_transaction(private_key)
+
+    tx.status_index = 4
+    tx.calculate_transaction_hash()
+    assert not tx.verify_signature(public_pem)
+
+    tx = _transaction(status_index=3)
+    tx.sign_transaction(private_key)
+    signature = bytearray.fromhex(tx.signature)
+    signature[-1] ^= 1
+    tx.signature = signature.hex()
+    assert not tx.verify_signature(public_pem)
+
+    tx.sign_transaction(private_key)
+    other_pem = CryptoSuite.serialize_public_key(suite.generate_private_key().public_key())
+    assert not tx.verify_signature(other_pem)
+    # La suite dichiarata deve coincidere con quella della chiave
+    tx.signature_suite = next(name for name in SUITES if name != suite.name)
+    assert not tx.verify_signature(public_pem)
+
+
+def test_from_dict_rejects_inconsistent_hash():
+    data = _transaction().to_dict()
+    data["credential_unique_id"] = "cred-altra"
+
+    with pytest.raises(ValueError):
+        Transaction.from_dict(data)
@@ -0,0 +1,108 @@
+import UniChain.university.verifier as verifier_module
+import UniChain.university.verification_cache as verification_cache_module
+from UniChain.university.verification_cache import VerificationCache
+from UniChain.university.verifier import Verifier
+
+VERDICT = {"valid": True, "checks": {}}
+
+
+def store(cache, key, credential_id, issuer):
+    cache.put(key, VERDICT, credential_id, issuer, cache.epoch)
+
+
+def test_revocation_on_chain_invalidates_the_credential(blockchain, universities, make_transaction):
+    issuer = universities[0]
+    verifier = Verifier(blockchain)
+    store(verifier.cache, "k-a", "cred-a", issuer.university_id)
+    store(verifier.cache, "k-b", "cred-b", issuer.university_id)
+
+    blockchain.add_next_block(make_transaction("cred-a"), "1.0", issuer)
+    assert verifier.cache.get("k-a") == VERDICT
+
+    blockchain.add_next_block(make_transaction("cred-a", "REVOCA"), "1.0", issuer)
+
+    assert verifier.cache.get("k-a") is None
+    assert verifier.cache.get("k-b") == VERDICT
+    assert verifier.cache.stats()["invalidations"] == 1
+
+
+def test_issuer_revocation_invalidates_its_credentials(blockchain, mobility_ca, universities):
+    verifier = Verifier(blockchain)
+    store(verifier.cache, "k-a", "cred-a", universities[0].university_id)
+    store(verifier.cache, "k-b", "cred-b", universities[0].university_id)
+    store(verifier.cache, "k-c", "cred-c", universities[1].university_id)
+
+    mobility_ca.revoke_certificate(universities[0].university_id)
+
+    assert verifier.cache.get("k-a") is None and verifier.cache.get("k-b") is None
+    assert verifier.cache.get("k-c") == VERDICT
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(verification_cache_module.time, "monotonic", lambda: now[0])
+    cache = VerificationCache(maxsize=8, ttl=10.0)
+    store(cache, "k", "cred", "urn:uni:0")
+
+    now[0] += 9.0
+    assert cache.get("k") == VERDICT
+    now[0] += 2.0
+    assert cache.get("k") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 1, "invalidations": 0}
+
+
+def test_lru_eviction():
+    cache = VerificationCache(maxsize=2)
+    store(cache, "k1", "c1", "urn:uni:0")
+    store(cache, "k2", "c2", "urn:uni:0")
+    cache.get("k1")
+    store(cache, "k3", "c3", "urn:uni:0")
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") == VERDICT and cache.get("k3") == VERDICT
+
+
+def test_result_in_flight_during_revocation_is_not_stored(blockchain, universities, make_transaction):
+    issuer = universities[0]
+    verifier = Verifier(blockchain)
+    blockchain.add_next_block(make_transaction("cred-a"), "1.0", issuer)
+
+    # La verifica legge l'epoca, poi la REVOCA arriva prima che l'esito sia memorizzato
+    epoch = verifier.cache.epoch
+    blockchain.add_next_block(make_transaction("cred-a", "REVOCA"), "1.0", issuer)
+    verifier.cache.put("k-a", VERDICT, "cred-a", issuer.university_id, epoch)
+
+    assert verifier.cache.get("k-a") is None
+    # Anche un'invalidazione non correlata scarta gli esiti in volo
+    epoch = verifier.cache.epoch
+    verifier.cache.invalidate_credential("cred-other")
+    verifier.cache.put("k-b", VERDICT, "cred-b", issuer.university_id, epoch)
+    assert verifier.cache.get("k-b") is None
+
+
+class FailingCache(VerificationCache):
+    def invalidate_credential(self, credential_id, *_):
+        raise RuntimeError("invalidazione non riuscita")
+
+    def invalidate_issuer(self, university_id):
+        raise RuntimeError("invalidazione non riuscita")
+
+
+def test_failed_invalidation_clears_the_whole_cache(monkeypatch, blockchain, mobility_ca,
+                                                    universities, make_transaction):
+    monkeypatch.setattr(verifier_module, "VerificationCache", FailingCache)
+    issuer = universities[0]
+    verifier = Verifier(blockchain)
+    blockchain.add_next_block(make_transaction("cred-a"), "1.0", issuer)
+    store(verifier.cache, "k-a", "cred-a", issuer.university_id)
+    store(verifier.cache, "k-b", "cred-b", universities[1].university_id)
+    epoch = verifier.cache.epoch
+
+    blockchain.add_next_block(make_transaction("cred-a", "REVOCA"), "1.0", issuer)
+
+    assert verifier.cache.stats()["size"] == 0
+    assert verifier.cache.epoch > epoch
+
+    store(verifier.cache, "k-c", "cred-c", universities[1].university_id)
+    mobility_ca.revoke_certificate(universities[2].university_id)
+    assert verifier.cache.get("k-c") is None
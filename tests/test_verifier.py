@@ -0,0 +1,121 @@
+import copy
+
+import pytest
+
+from UniChain.university.verifier import Verifier
+from UniChain.wallet.student_wallet import StudentWallet
+
+REVEAL = ["credentialSubject.name", "exams[*].grade"]
+
+
+@pytest.fixture
+def alice():
+    return StudentWallet("Alice", crypto_suite="Ed25519")
+
+
+@pytest.fixture
+def verifier(blockchain):
+    # Senza cache: ogni chiamata ripete tutti i controlli
+    return Verifier(blockchain, max_workers=2, cache_size=0)
+
+
+def test_valid_presentation(verifier, alice, issue_credential):
+    issue_credential(alice, "cred-1")
+
+    for proof_format in ("multiproof", "paths"):
+        proof = alice.generate_presentation_proof("cred-1", REVEAL, proof_format=proof_format)
+        verdict = verifier.verify_presentation(proof)
+
+        assert verdict["valid"], verdict["errors"]
+        assert all(verdict["checks"].values())
+        assert verdict["issuer"] == "urn:uni:0"
+        assert sorted(verdict["attributes"]) == ["credential.credentialSubject.name",
+                                                 "credential.exams[0].grade", "credential.exams[1].grade"]
+
+
+def test_tampered_multiproof(verifier, alice, issue_credential):
+    issue_credential(alice, "cred-1")
+    proof = alice.generate_presentation_proof("cred-1", REVEAL)
+
+    tampered = copy.deepcopy(proof)
+    tampered["merkleMultiproof"]["hashes"][0] = "00" * 32
+    verdict = verifier.verify_presentation(tampered)
+    assert not verdict["valid"]
+    assert not verdict["checks"]["attributes"]
+    assert verdict["checks"]["signature"] and verdict["checks"]["rootOnChain"]
+
+    forged_value = copy.deepcopy(proof)
+    forged_value["revealedAttributes"]["credential.exams[1].grade"] = "30"
+    assert not verifier.verify_presentation(forged_value)["checks"]["attributes"]
+
+
+def test_revealed_labels_must_match_multiproof(verifier, alice, issue_credential):
+    issue_credential(alice, "cred-1")
+    proof = alice.generate_presentation_proof("cred-1", REVEAL)
+
+    extra = copy.deepcopy(proof)
+    extra["revealedAttributes"]["credential.degree.finalGrade"] = "100"
+    verdict = verifier.verify_presentation(extra)
+    assert not verdict["valid"]
+    assert not any(verdict["attributes"].values())
+
+    missing = copy.deepcopy(proof)
+    del missing["revealedAttributes"]["credential.credentialSubject.name"]
+    assert not verifier.verify_presentation(missing)["checks"]["attributes"]
+
+    # Stesse etichette in ordine diverso: la multiproof resta valida
+    reordered = copy.deepcopy(proof)
+    reordered["revealedAttributes"] = dict(reversed(list(proof["revealedAttributes"].items())))
+    assert verifier.verify_presentation(reordered)["valid"]
+
+
+def test_presentation_from_another_wallet(verifier, alice, issue_credential):
+    issue_credential(alice, "cred-1")
+    mallory = StudentWallet("Mallory", crypto_suite="Ed25519")
+    mallory.store_credential("cred-1", alice.get_credential("cred-1"))
+
+    verdict = verifier.verify_presentation(mallory.generate_presentation_proof("cred-1", REVEAL))
+
+    assert not verdict["valid"]
+    assert verdict["checks"]["signature"] and not verdict["checks"]["holderBinding"]
+
+
+def test_batch_with_valid_and_invalid_items(blockchain, verifier, alice, universities,
+                                            issue_credential, make_transaction):
+    bob = StudentWallet("Bob", crypto_suite="Ed25519")
+    issue_credential(alice, "cred-alice")
+    issue_credential(bob, "cred-bob", issuer=universities[1])
+    issue_credential(alice, "cred-revoked")
+    blockchain.add_next_block(make_transaction("cred-revoked", "REVOCA"), "1.0", universities[0])
+
+    valid_alice = alice.generate_presentation_proof("cred-alice", REVEAL)
+    valid_bob = bob.generate_presentation_proof("cred-bob", ["name"], proof_format="paths")
+    tampered = copy.deepcopy(valid_alice)
+    tampered["merkleMultiproof"]["hashes"][-1] = "11" * 32
+    bad_signature = dict(valid_bob, signature=valid_alice["signature"])
+    revoked = alice.generate_presentation_proof("cred-revoked", REVEAL)
+    unknown = dict(valid_alice, credentialId="cred-unknown")
+
+    proofs = [valid_alice, tampered, valid_bob, bad_signature, revoked, unknown, valid_alice]
+    verdicts = verifier.verify_batch(proofs)
+
+    assert [v["valid"] for v in verdicts] == [True, False, True, False, False, False, True]
+    assert [v["credentialId"] for v in verdicts] == [p["credentialId"] for p in proofs]
+    assert not verdicts[1]["checks"]["attributes"]
+    assert not verdicts[3]["checks"]["signature"]
+    assert not verdicts[4]["checks"]["notRevoked"] and verdicts[4]["checks"]["rootOnChain"]
+    assert not verdicts[5]["checks"]["rootOnChain"] and verdicts[5]["issuer"] is None
+    # Il batch dà gli stessi esiti delle verifiche singole
+    assert verdicts == [verifier.verify_presentation(proof) for proof in proofs]
+
+
+def test_batch_uses_cached_verdicts(blockchain, alice, issue_credential):
+    verifier = Verifier(blockchain)
+    issue_credential(alice, "cred-1")
+    proof = alice.generate_presentation_proof("cred-1", REVEAL)
+
+    assert verifier.verify_presentation(proof)["valid"]
+    verdicts = verifier.verify_batch([proof, proof])
+
+    assert all(v["valid"] for v in verdicts)
+    assert verifier.cache.stats()["hits"] == 2